@@ -0,0 +1,5 @@
+# benchmarks/__main__.py
+
+from .suite import main
+
+main()
@@ -0,0 +1,249 @@
+# benchmarks/suite.py
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Callable
+
+import argparse
+import datetime
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from tic_tac_toe.logic.algorithms import find_best_move_alpha_beta, find_best_move_minimax
+from tic_tac_toe.logic.entities import Mark
+from tic_tac_toe.logic.evaluation import heuristic_score
+from tic_tac_toe.logic.models import BitboardGrid, GameState
+from tic_tac_toe.logic.stats import SearchStats
+
+@dataclass(frozen=True)
+class BenchmarkConfiguration:
+  """
+  A board configuration of the suite, with the search depths that keep a move under a few seconds.
+
+  Attributes:
+  dimension (int): The dimension of the board.
+  required_marks_for_win (int): The number of marks in a row required to win.
+  alpha_beta_depth (int): The depth `find_best_move_alpha_beta` is measured at.
+  minimax_depth (int): The depth `find_best_move_minimax` is measured at.
+  """
+  dimension: int
+  required_marks_for_win: int
+  alpha_beta_depth: int
+  minimax_depth: int
+
+  @property
+  def name(self) -> str:
+    return f"{self.dimension}x{self.dimension}_{self.required_marks_for_win}"
+
+CONFIGURATIONS = (
+  BenchmarkConfiguration(3, 3, 9, 9),
+  BenchmarkConfiguration(4, 3, 5, 3),
+  BenchmarkConfiguration(4, 4, 5, 3),
+  BenchmarkConfiguration(5, 4, 4, 2),
+  BenchmarkConfiguration(6, 4, 3, 2),
+  BenchmarkConfiguration(7, 5, 3, 2),
+  BenchmarkConfiguration(9, 5, 2, 2),
+  BenchmarkConfiguration(11, 5, 2, 1),
+  BenchmarkConfiguration(15, 5, 2, 1),
+)
+
+def generate_positions(configuration: BenchmarkConfiguration, count: int, seed: int) -> list[GameState]:
+  """
+  Plays random games to build a fixed set of unfinished positions. The same seed always gives the same positions.
+
+  Parameters:
+  configuration (BenchmarkConfiguration): The board configuration.
+  count (int): The number of positions.
+  seed (int): The seed of the random number generator.
+
+  Returns:
+  list[GameState]: The positions, with between 1 and half the board of marks.
+  """
+  rng = random.Random(f"{seed}-{configuration.name}")
+  dimension = configuration.dimension
+  positions = []
+  while len(positions) < count:
+    game_state = GameState(BitboardGrid(dimension), Mark.CROSS, configuration.required_marks_for_win)
+    game_state = game_state.generate_move_to(rng.randrange(dimension ** 2)).next_state
+    for _ in range(rng.randrange(dimension ** 2 // 2)):
+      if game_state.has_game_ended:
+        break
+      game_state = rng.choice(game_state.get_valid_moves).next_state
+    if not game_state.has_game_ended:
+      positions.append(game_state)
+  return positions
+
+def measure_peak_memory(function: Callable[[], Any]) -> int:
+  tracemalloc.start()
+  try:
+    function()
+    return tracemalloc.get_traced_memory()[1]
+  finally:
+    tracemalloc.stop()
+
+def benchmark_search(name: str, search: Callable[[GameState, SearchStats | None], Any], positions: list[GameState]) -> dict[str, Any]:
+  """
+  Measures a search function on a set of positions.
+
+  Parameters:
+  name (str): The name of the search in the results.
+  search (Callable[[GameState, SearchStats | None], Any]): The search, called with a fresh state and the stats to fill in, if any.
+  positions (list[GameState]): The positions to search.
+
+  Returns:
+  dict[str, Any]: The time to move, node count, nodes per second, beta cutoffs, table hits and peak traced memory.
+  """
+  # States cache their moves and winners, so every run gets states that were never searched
+  def copy(game_state: GameState) -> GameState:
+    return GameState(BitboardGrid(game_state.grid.dimension, game_state.grid.cells), game_state.initial_player_mark, game_state.required_marks_for_win)
+
+  times = []
+  for game_state in positions:
+    game_state = copy(game_state)
+    start = time.perf_counter()
+    search(game_state, None)
+    times.append(time.perf_counter() - start)
+  # The counters run apart from the timed run, so that the times are those of a search without them
+  stats = SearchStats()
+  for game_state in positions:
+    search(copy(game_state), stats)
+  peak_memory = max(measure_peak_memory(lambda: search(copy(game_state), None)) for game_state in positions)
+  total_time = sum(times)
+  return {
+    "search": name,
+    "positions": len(positions),
+    "time_to_move_mean": total_time / len(times),
+    "time_to_move_max": max(times),
+    "nodes": stats.nodes,
+    "nodes_per_second": stats.nodes / total_time if total_time > 0 else None,
+    "beta_cutoffs": stats.beta_cutoffs,
+    "table_hits": stats.table_hits,
+    "peak_memory_bytes": peak_memory,
+  }
+
+def benchmark_call(function: Callable[[], Any], minimum_time: float) -> float:
+  """
+  Returns the mean number of seconds of a call, over enough calls to run for `minimum_time` seconds.
+  """
+  calls = 1
+  while True:
+    start = time.perf_counter()
+    for _ in range(calls):
+      function()
+    elapsed = time.perf_counter() - start
+    if elapsed >= minimum_time:
+      return elapsed / calls
+    calls *= 2 if elapsed <= 0 else max(2, int(minimum_time / elapsed) + 1)
+
+def benchmark_models(positions: list[GameState], minimum_time: float) -> dict[str, float]:
+  """
+  Measures the model hot paths on a set of positions.
+
+  Parameters:
+  positions (list[GameState]): The positions to measure on.
+  minimum_time (float): The number of seconds each measure runs for at least.
+
+  Returns:
+  dict[str, float]: The mean seconds per position of each operation.
+  """
+  cells = [(game_state.grid.dimension, game_state.grid.cells, game_state.initial_player_mark, game_state.required_marks_for_win) for game_state in positions]
+  get_winning_sequence = GameState.get_winning_sequence.func
+
+  def construct() -> None:
+    for dimension, grid_cells, mark, required_marks_for_win in cells:
+      GameState(BitboardGrid(dimension, grid_cells), mark, required_marks_for_win)
+
+  def winning_sequence() -> None:
+    for game_state in positions:
+      get_winning_sequence(game_state)
+
+  def possible_moves() -> None:
+    for game_state in positions:
+      game_state.grid.generate_possible_moves()
+
+  def heuristic() -> None:
+    for game_state in positions:
+      heuristic_score(game_state, Mark.CROSS)
+
+  return {
+    name: benchmark_call(function, minimum_time) / len(positions)
+    for name, function in (
+      ("game_state_construction", construct),
+      ("get_winning_sequence", winning_sequence),
+      ("generate_possible_moves", possible_moves),
+      ("heuristic_score", heuristic),
+    )
+  }
+
+def get_commit() -> str | None:
+  try:
+    return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+  except (OSError, subprocess.CalledProcessError):
+    return None
+
+def run_suite(configurations: tuple[BenchmarkConfiguration, ...], positions_count: int, seed: int, minimum_time: float) -> dict[str, Any]:
+  """
+  Runs every benchmark of the suite on every configuration.
+
+  Parameters:
+  configurations (tuple[BenchmarkConfiguration, ...]): The board configurations to run.
+  positions_count (int): The number of positions per configuration.
+  seed (int): The seed the positions are built from.
+  minimum_time (float): The number of seconds each model measure runs for at least.
+
+  Returns:
+  dict[str, Any]: The results, ready to be written as JSON.
+  """
+  results = []
+  for configuration in configurations:
+    print(f"Benchmarking {configuration.name}...", file=sys.stderr)
+    positions = generate_positions(configuration, positions_count, seed)
+    results.append({
+      "configuration": configuration.name,
+      "dimension": configuration.dimension,
+      "required_marks_for_win": configuration.required_marks_for_win,
+      "searches": [
+        benchmark_search(f"alpha_beta_depth_{configuration.alpha_beta_depth}", lambda game_state, stats: find_best_move_alpha_beta(game_state, configuration.alpha_beta_depth, stats=stats), positions),
+        benchmark_search(f"minimax_depth_{configuration.minimax_depth}", lambda game_state, stats: find_best_move_minimax(game_state, configuration.minimax_depth, stats=stats), positions),
+      ],
+      "models": benchmark_models(positions, minimum_time),
+    })
+  return {
+    "commit": get_commit(),
+    "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+    "python": platform.python_version(),
+    "platform": platform.platform(),
+    "seed": seed,
+    "positions": positions_count,
+    "results": results,
+  }
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description="Benchmark the searches and the model hot paths on fixed, seeded positions.")
+  parser.add_argument("--output", default="-", help="The JSON file to write the results to. Defaults to the standard output.")
+  parser.add_argument("--positions", type=int, default=10, help="The number of positions per configuration.")
+  parser.add_argument("--seed", type=int, default=0, help="The seed the positions are built from.")
+  parser.add_argument("--minimum-time", type=float, default=0.2, help="The number of seconds each model measure runs for at least.")
+  parser.add_argument(
+    "--configuration",
+    dest="configurations",
+    action="append",
+    choices=[configuration.name for configuration in CONFIGURATIONS],
+    help="A configuration to run. Defaults to all of them.",
+  )
+  args = parser.parse_args()
+
+  configurations = tuple(configuration for configuration in CONFIGURATIONS if args.configurations is None or configuration.name in args.configurations)
+  results = run_suite(configurations, args.positions, args.seed, args.minimum_time)
+  if args.output == "-":
+    json.dump(results, sys.stdout, indent=2)
+    print()
+  else:
+    with open(args.output, "w") as file:
+      json.dump(results, file, indent=2)
@@ -3,7 +3,7 @@
 import argparse
 from typing import NamedTuple
 
-from tic_tac_toe.game.players import Player, RandomComputerPlayer, MinimaxComputerPlayer, AlphaBetaComputerPlayer
+from tic_tac_toe.game.players import Player, RandomComputerPlayer, MinimaxComputerPlayer, AlphaBetaComputerPlayer, MCTSComputerPlayer, SearchComputerPlayer
 from tic_tac_toe.logic.entities import Mark
 
 from .players import ConsolePlayer
@@ -13,6 +13,7 @@ PLAYER_CLASSES = {
   "random": RandomComputerPlayer,
   "minimax": MinimaxComputerPlayer,
   "alpha_beta": AlphaBetaComputerPlayer,
+  "mcts": MCTSComputerPlayer,
 }
 
 class Args(NamedTuple):
@@ -21,9 +22,16 @@ class Args(NamedTuple):
   starting_mark: str
   required_marks_for_win: int
   dimension: int
+  telemetry_path: str | None
+  incremental: bool
 
-def create_player(player_type: str, mark: Mark) -> Player:
-  return PLAYER_CLASSES[player_type](mark)
+def create_player(player_type: str, mark: Mark, endgame_directory: str | None = None, book_directory: str | None = None, ponder: bool = False) -> Player:
+  player_class = PLAYER_CLASSES[player_type]
+  if issubclass(player_class, AlphaBetaComputerPlayer):
+    return player_class(mark, endgame_directory=endgame_directory, book_directory=book_directory, ponder=ponder)
+  if issubclass(player_class, SearchComputerPlayer):
+    return player_class(mark, endgame_directory=endgame_directory, book_directory=book_directory)
+  return player_class(mark)
 
 def parse_args() -> Args:
   parser = argparse.ArgumentParser()
@@ -57,12 +65,40 @@ def parse_args() -> Args:
     type=int,
     default=3,
   )
+  parser.add_argument(
+    "--endgame",
+    dest="endgame_directory",
+    type=str,
+    default=None,
+  )
+  parser.add_argument(
+    "--book",
+    dest="book_directory",
+    type=str,
+    default=None,
+  )
+  parser.add_argument(
+    "--ponder",
+    dest="ponder",
+    action="store_true",
+  )
+  parser.add_argument(
+    "--telemetry",
+    dest="telemetry_path",
+    type=str,
+    default=None,
+  )
+  parser.add_argument(
+    "--incremental",
+    dest="incremental",
+    action="store_true",
+  )
   args = parser.parse_args()
 
-  player1 = create_player(args.player_x, Mark.CROSS)
-  player2 = create_player(args.player_o, Mark.NAUGHT)
+  player1 = create_player(args.player_x, Mark.CROSS, args.endgame_directory, args.book_directory, args.ponder)
+  player2 = create_player(args.player_o, Mark.NAUGHT, args.endgame_directory, args.book_directory, args.ponder)
 
   if args.starting_mark == Mark.NAUGHT:
     player1, player2 = player2, player1
   
-  return Args(player1, player2, args.starting_mark, args.required_marks_for_win, args.dimension)
\ No newline at end of file
+  return Args(player1, player2, args.starting_mark, args.required_marks_for_win, args.dimension, args.telemetry_path, args.incremental)
\ No newline at end of file
@@ -1,10 +1,24 @@
 # frontend/console/cli.py
 
 from tic_tac_toe.game.engine import TicTacToe
+from tic_tac_toe.game.telemetry import Telemetry
 
 from .args import parse_args
-from .renderers import ConsoleRenderer
+from .renderers import ConsoleRenderer, IncrementalConsoleRenderer
 
 def main() -> None:
-  player1, player2, starting_mark, required_marks_for_win, dimension = parse_args()
-  TicTacToe(player1, player2, ConsoleRenderer()).play(starting_mark, dimension, required_marks_for_win)
+  player1, player2, starting_mark, required_marks_for_win, dimension, telemetry_path, incremental = parse_args()
+  renderer = IncrementalConsoleRenderer() if incremental else ConsoleRenderer()
+  try:
+    if telemetry_path is None:
+      TicTacToe(player1, player2, renderer).play(starting_mark, dimension, required_marks_for_win)
+      return
+    with open(telemetry_path, "a") as output:
+      telemetry = Telemetry(output, record_moves=True)
+      TicTacToe(player1, player2, renderer, telemetry=telemetry).play(starting_mark, dimension, required_marks_for_win)
+      telemetry.close()
+  finally:
+    # Stops the pondering threads and worker processes
+    for player in (player1, player2):
+      if hasattr(player, "close"):
+        player.close()
@@ -1,13 +1,20 @@
 # frontend/console/renderers.py
 
 import math
+import os
+import shutil
+import sys
 import textwrap
-from typing import Iterable
+from typing import Iterable, TextIO
 
 from tic_tac_toe.game.renderer import Renderer
 from tic_tac_toe.logic.entities import Mark
 from tic_tac_toe.logic.models import GameState
 
+CLEAR_SCREEN = "\033[2J"
+CLEAR_LINE = "\033[2K"
+CLEAR_TO_END = "\033[J"
+
 class ConsoleRenderer(Renderer):
   def render(self, game_state: GameState) -> None:
     clear_screen()
@@ -21,10 +28,101 @@ class ConsoleRenderer(Renderer):
       if game_state.is_draw:
         print("It's a tie! \N{neutral face}")
 
+class IncrementalConsoleRenderer(Renderer):
+  """
+  A console renderer for large boards. It draws the board once, then only rewrites the cells that changed since the
+  previous frame, usually the last move and the winning line, with cursor positioning. Each frame is written to the
+  terminal at once. The board is drawn in full again when the terminal is resized or when the frame does not fit in it.
+
+  Attributes:
+  output (TextIO): The stream the frames are written to.
+  """
+  def __init__(self, output: TextIO | None = None) -> None:
+    self.output = output if output is not None else sys.stdout
+    self.cells: str | None = None
+    self.highlighted: frozenset[int] = frozenset()
+    self.terminal_size: os.terminal_size | None = None
+
+  def render(self, game_state: GameState) -> None:
+    cells = game_state.grid.cells
+    highlighted = frozenset(game_state.get_winning_sequence) if game_state.get_winner else frozenset()
+    status, result = get_status_lines(game_state)
+    terminal_size = shutil.get_terminal_size()
+    if self.can_update(cells, terminal_size, status, result):
+      frame = self.format_update(cells, highlighted, status, result)
+    else:
+      frame = format_frame(cells, highlighted, status, result)
+    self.output.write(frame)
+    self.output.flush()
+    self.cells, self.highlighted, self.terminal_size = cells, highlighted, terminal_size
+
+  def can_update(self, cells: str, terminal_size: os.terminal_size, status: str, result: str) -> bool:
+    # Cursor positions only hold while no line of the frame wraps or scrolls
+    if self.cells is None or len(self.cells) != len(cells) or terminal_size != self.terminal_size:
+      return False
+    dimension = int(math.sqrt(len(cells)))
+    width = max(get_board_width(dimension), len(status), len(result) + 1)
+    return terminal_size.columns >= width and terminal_size.lines >= get_prompt_row(dimension)
+
+  def format_update(self, cells: str, highlighted: frozenset[int], status: str, result: str) -> str:
+    """
+    Formats the escape sequences that turn the previous frame into the new one.
+
+    Parameters:
+    cells (str): The cells of the new frame.
+    highlighted (frozenset[int]): The positions of the winning line, or none.
+    status (str): The line above the board.
+    result (str): The line below the board.
+
+    Returns:
+    str: The frame.
+    """
+    dimension = int(math.sqrt(len(cells)))
+    width = len(str(dimension))
+    parts = []
+    for position in range(len(cells)):
+      if cells[position] != self.cells[position] or (position in highlighted) != (position in self.highlighted):
+        row, column = divmod(position, dimension)
+        parts.append(move_cursor(get_cell_row(row), width + 5 + 4 * column) + format_cell(cells[position], position in highlighted))
+    parts.append(move_cursor(1, 1) + CLEAR_LINE + status)
+    parts.append(move_cursor(get_result_row(dimension), 1) + CLEAR_LINE + result)
+    # Clears the previous prompt and the errors printed under it
+    parts.append(move_cursor(get_prompt_row(dimension), 1) + CLEAR_TO_END)
+    return "".join(parts)
 
 def clear_screen() -> None:
   print("\033c", end="")
 
+def move_cursor(row: int, column: int) -> str:
+  return f"\033[{row};{column}H"
+
+def get_status_lines(game_state: GameState) -> tuple[str, str]:
+  status = f"Player ` {game_state.get_current_player_mark.other.value} ` has chosen to play in position {game_state.get_last_move}." if game_state.has_game_started else ""
+  if game_state.get_winner:
+    return status, f"{game_state.get_winner.value} wins! \N{party popper}"
+  return status, "It's a tie! \N{neutral face}" if game_state.is_draw else ""
+
+# The frame is the status line, then the board as `format_board` lays it out, then the result line and the prompt
+def get_cell_row(row: int) -> int:
+  return 5 + 2 * row
+
+def get_result_row(dimension: int) -> int:
+  return 7 + 2 * dimension
+
+def get_prompt_row(dimension: int) -> int:
+  return 8 + 2 * dimension
+
+def get_board_width(dimension: int) -> int:
+  return len(str(dimension)) + 2 + 4 * dimension
+
+def format_frame(cells: str, highlighted: Iterable[int], status: str, result: str) -> str:
+  highlighted = set(highlighted)
+  board = format_board([blink(cell) if position in highlighted else cell for position, cell in enumerate(cells)])
+  return f"{move_cursor(1, 1)}{CLEAR_SCREEN}{status}\n{board}\n{result}\n"
+
+def format_cell(cell: str, highlighted: bool) -> str:
+  return blink(cell) if highlighted else color_cell(cell)
+
 def blink(text: str) -> str:
   return f"\033[33;5m{text}\033[0m"
 
@@ -35,16 +133,24 @@ def print_blinking(cells: Iterable[str], positions: Iterable[int]) -> None:
     print_solid(mutable_cells)
 
 def print_solid(cells: Iterable[str]) -> None:
+  print(format_board(cells))
+
+def format_board(cells: Iterable[str]) -> str:
   n = int(math.sqrt(len(cells)))
   cells = iter(cells)
   max_width = len(str(n))
-  print(textwrap.dedent(
+  separator = " " * (max_width + 1) + "┆ " + "───┼" * (n-1) + "───"
+  rows = "".join(
+    f"{i+1}".rjust(max_width) + " ┆  " + " | ".join(color_cell(next(cells)) for _ in range(n)) + "\n" + separator + "\n"
+    for i in range(n)
+  )
+  return textwrap.dedent(
 f"""
 {" " * (max_width + 4) + "   ".join(chr(i + 65).rjust(max_width - 1) for i in range(n))}
 {" " * (max_width + 2) + "----" * n}
-{"".join(f"{i+1}".rjust(max_width) + " ┆  " + " | ".join(color_cell(next(cells)) for _ in range(n)) + "\n" + " " * (max_width + 1) + "┆ " + "───┼" * (n-1) + "───\n" for i in range(n))}
+{rows}
 """
-  ))
+  )
 
 def color_cell(cell: str) -> str:
   if cell == Mark.CROSS:
@@ -53,4 +159,3 @@ def color_cell(cell: str) -> str:
     return '\033[31m' + cell + '\033[0m'  # Red
   else:
     return cell
-
@@ -0,0 +1,5 @@
+# frontend/server/__main__.py
+
+from .server import main
+
+main()
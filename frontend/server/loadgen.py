@@ -0,0 +1,118 @@
+# frontend/server/loadgen.py
+
+from __future__ import annotations
+
+from http.client import HTTPConnection
+from typing import Any
+from urllib.parse import urlparse
+
+import argparse
+import json
+import random
+import threading
+import time
+
+def request(connection: HTTPConnection, method: str, path: str, body: dict[str, Any] | None = None) -> dict[str, Any]:
+  data = json.dumps(body).encode() if body is not None else None
+  connection.request(method, path, data, {"Content-Type": "application/json"} if data is not None else {})
+  response = connection.getresponse()
+  result = json.loads(response.read() or b"{}")
+  if response.status >= 400:
+    raise RuntimeError(result.get("error", f"Error: The server answered {response.status}."))
+  return result
+
+def get_percentile(sorted_values: list[float], percentile: float) -> float | None:
+  if not sorted_values:
+    return None
+  return sorted_values[min(len(sorted_values) - 1, int(percentile / 100 * len(sorted_values)))]
+
+def play_games(url: str, games: list[int], config: dict[str, Any], seed: int, latencies: list[float], lock: threading.Lock) -> None:
+  """
+  Plays games against the server with random moves, one request at a time, over a kept-alive connection.
+
+  Parameters:
+  url (str): The address of the server.
+  games (list[int]): The shared count of games left to start.
+  config (dict[str, Any]): The body of the session requests.
+  seed (int): The seed of the random number generator of this client.
+  latencies (list[float]): The list the number of seconds of each request is added to.
+  lock (threading.Lock): The lock of `games` and `latencies`.
+  """
+  rng = random.Random(seed)
+  address = urlparse(url)
+  connection = HTTPConnection(address.hostname, address.port)
+  try:
+    while True:
+      with lock:
+        if games[0] <= 0:
+          return
+        games[0] -= 1
+      start = time.perf_counter()
+      state = request(connection, "POST", "/sessions", config)
+      elapsed = [time.perf_counter() - start]
+      while not state["ended"]:
+        start = time.perf_counter()
+        state = request(connection, "POST", f"/sessions/{state['session']}/moves", {"position": rng.choice(state["valid_moves"])})
+        elapsed.append(time.perf_counter() - start)
+      request(connection, "DELETE", f"/sessions/{state['session']}")
+      with lock:
+        latencies.extend(elapsed)
+  finally:
+    connection.close()
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description="Play random games against a game server from several clients at once and measure its requests per second and move latency.")
+  parser.add_argument("--url", default="http://127.0.0.1:8765")
+  parser.add_argument("--games", type=int, default=100, help="The number of games to play in total.")
+  parser.add_argument("--concurrency", type=int, default=8, help="The number of clients playing at the same time.")
+  parser.add_argument("--dimension", type=int, default=5)
+  parser.add_argument("--required", dest="required_marks_for_win", type=int, default=4)
+  parser.add_argument("--starting", dest="starting_mark", choices=["X", "O"], default="X")
+  parser.add_argument("--computer", dest="computer_mark", choices=["X", "O"], default="O")
+  parser.add_argument("--seed", type=int, default=0)
+  args = parser.parse_args()
+
+  config = {
+    "dimension": args.dimension,
+    "required_marks_for_win": args.required_marks_for_win,
+    "starting_mark": args.starting_mark,
+    "computer_mark": args.computer_mark,
+  }
+  games = [args.games]
+  latencies: list[float] = []
+  lock = threading.Lock()
+  clients = [
+    threading.Thread(target=play_games, args=(args.url, games, config, args.seed + client, latencies, lock))
+    for client in range(args.concurrency)
+  ]
+  start = time.perf_counter()
+  for client in clients:
+    client.start()
+  for client in clients:
+    client.join()
+  elapsed = time.perf_counter() - start
+
+  latencies.sort()
+  address = urlparse(args.url)
+  connection = HTTPConnection(address.hostname, address.port)
+  try:
+    server_stats = request(connection, "GET", "/stats")
+  finally:
+    connection.close()
+  print(json.dumps({
+    "games": args.games,
+    "concurrency": args.concurrency,
+    "requests": len(latencies),
+    "seconds": elapsed,
+    "requests_per_second": len(latencies) / elapsed if elapsed > 0 else None,
+    "latency_p50": get_percentile(latencies, 50),
+    "latency_p90": get_percentile(latencies, 90),
+    "latency_p99": get_percentile(latencies, 99),
+    "latency_max": latencies[-1] if latencies else None,
+    "server": server_stats,
+    # The server searches on the threads of one process, so its computer moves use one CPU core however many clients play
+    "note": "The server's computer moves share one CPU core, so more concurrency raises latency rather than throughput.",
+  }, indent=2))
+
+if __name__ == "__main__":
+  main()
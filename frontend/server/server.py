@@ -0,0 +1,325 @@
+# frontend/server/server.py
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable
+
+import argparse
+import json
+import threading
+import time
+import traceback
+import uuid
+
+from tic_tac_toe.game.players import AlphaBetaComputerPlayer, MinimaxComputerPlayer, SearchComputerPlayer
+from tic_tac_toe.logic.entities import Mark
+from tic_tac_toe.logic.exceptions import InvalidMoveError
+from tic_tac_toe.logic.models import BitboardGrid, GameState
+from tic_tac_toe.logic.transposition import SharedTranspositionTable
+from tic_tac_toe.logic.validators import validate_starting_mark
+
+PLAYER_CLASSES: dict[str, type[SearchComputerPlayer]] = {
+  "minimax": MinimaxComputerPlayer,
+  "alpha_beta": AlphaBetaComputerPlayer,
+}
+
+class RequestError(Exception):
+  """Exception raised for a request with missing or invalid fields."""
+
+class SessionNotFoundError(Exception):
+  """Exception raised for a session the server does not hold."""
+
+@dataclass
+class Session:
+  """
+  A game between a client and a computer player of the server.
+
+  Attributes:
+  session_id (str): The identifier of the session.
+  game_state (GameState): The current state of the game.
+  computer (SearchComputerPlayer): The computer player.
+  lock (threading.Lock): The lock that keeps the moves of the session in order.
+  """
+  session_id: str
+  game_state: GameState
+  computer: SearchComputerPlayer
+  lock: threading.Lock = field(default_factory=threading.Lock)
+
+  def to_dict(self, computer_move: int | None = None) -> dict[str, Any]:
+    game_state = self.game_state
+    winner = game_state.get_winner
+    if game_state.has_game_ended:
+      valid_moves = []
+    elif not game_state.has_game_started:
+      # The first mark may go anywhere
+      valid_moves = list(range(game_state.grid.count))
+    else:
+      valid_moves = [move.position for move in game_state.get_valid_moves]
+    return {
+      "session": self.session_id,
+      "dimension": game_state.grid.dimension,
+      "required_marks_for_win": game_state.required_marks_for_win,
+      "cells": game_state.grid.cells,
+      "computer_mark": self.computer.mark.value,
+      "current_mark": game_state.get_current_player_mark.value,
+      "computer_move": computer_move,
+      "valid_moves": valid_moves,
+      "ended": game_state.has_game_ended,
+      "winner": winner.value if winner is not None else None,
+    }
+
+class GameServer:
+  """
+  The sessions of the server and the caches they share. The computer players of all the sessions of the same board
+  configuration and mark search with one bounded transposition table, so that each search starts from the positions
+  the other games already searched. The searches run on the threads of the HTTP server, in one process, so the GIL
+  lets only one of them run at a time: the computer moves of all the sessions share a single CPU core.
+
+  Attributes:
+  player_class (type[SearchComputerPlayer]): The class of the computer players.
+  time_budget (float | None): The number of seconds each computer move may be searched, for the Alpha-Beta players.
+  max_table_entries (int): The maximum number of entries of each shared table.
+  max_sessions (int): The maximum number of sessions kept. The least recently used session is dropped beyond it.
+  max_dimension (int): The largest board dimension a session may ask for, as the tables of a board take time to build.
+  """
+  def __init__(self, player_class: type[SearchComputerPlayer] = AlphaBetaComputerPlayer, time_budget: float | None = 0.2, max_table_entries: int = 1_000_000, max_sessions: int = 10_000, max_dimension: int = 20) -> None:
+    self.player_class = player_class
+    self.time_budget = time_budget
+    self.max_table_entries = max_table_entries
+    self.max_sessions = max_sessions
+    self.max_dimension = max_dimension
+    self.sessions: OrderedDict[str, Session] = OrderedDict()
+    self.tables: dict[tuple[int, int, Mark], SharedTranspositionTable] = {}
+    self.lock = threading.Lock()
+    self.moves = 0
+
+  def get_table(self, dimension: int, required_marks_for_win: int, mark: Mark) -> SharedTranspositionTable:
+    with self.lock:
+      key = (dimension, required_marks_for_win, mark)
+      if key not in self.tables:
+        self.tables[key] = SharedTranspositionTable(self.max_table_entries)
+      return self.tables[key]
+
+  def create_player(self, game_state: GameState, mark: Mark) -> SearchComputerPlayer:
+    table = self.get_table(game_state.grid.dimension, game_state.required_marks_for_win, mark)
+    if issubclass(self.player_class, AlphaBetaComputerPlayer):
+      player = self.player_class(mark, time_budget=self.time_budget, table=table)
+    else:
+      player = self.player_class(mark, table=table)
+    player.delay = 0
+    return player
+
+  def create_session(self, dimension: int, required_marks_for_win: int, starting_mark: str, computer_mark: str) -> dict[str, Any]:
+    """
+    Starts a game. The computer makes its first move at once if it starts.
+
+    Parameters:
+    dimension (int): The dimension of the game grid.
+    required_marks_for_win (int): The number of marks in a row required to win.
+    starting_mark (str): The mark of the starting player.
+    computer_mark (str): The mark of the computer player.
+
+    Returns:
+    dict[str, Any]: The state of the session.
+    """
+    if not 3 <= dimension <= self.max_dimension:
+      raise RequestError(f"Error: Invalid dimension. The dimension must be between 3 and {self.max_dimension}.")
+    if not 1 <= required_marks_for_win <= dimension:
+      raise RequestError("Error: Invalid number of marks required for a win. It must be between 1 and the dimension.")
+    try:
+      validate_starting_mark(starting_mark)
+      validate_starting_mark(computer_mark)
+    except ValueError as error:
+      raise RequestError(str(error)) from None
+    game_state = GameState(BitboardGrid(dimension), Mark(starting_mark), required_marks_for_win)
+    session = Session(uuid.uuid4().hex, game_state, self.create_player(game_state, Mark(computer_mark)))
+    with self.lock:
+      self.sessions[session.session_id] = session
+      while len(self.sessions) > self.max_sessions:
+        self.sessions.popitem(last=False)
+    with session.lock:
+      computer_move = self.play_computer_move(session)
+      return session.to_dict(computer_move)
+
+  def get_session(self, session_id: str) -> Session:
+    with self.lock:
+      session = self.sessions.get(session_id)
+      if session is None:
+        raise SessionNotFoundError(f"Error: Unknown session ` {session_id} `.")
+      self.sessions.move_to_end(session_id)
+      return session
+
+  def delete_session(self, session_id: str) -> None:
+    with self.lock:
+      if self.sessions.pop(session_id, None) is None:
+        raise SessionNotFoundError(f"Error: Unknown session ` {session_id} `.")
+
+  def make_move(self, session_id: str, position: int) -> dict[str, Any]:
+    """
+    Plays the move of the client, then the reply of the computer.
+
+    Parameters:
+    session_id (str): The identifier of the session.
+    position (int): The position of the client's move.
+
+    Returns:
+    dict[str, Any]: The state of the session after the computer's reply.
+    """
+    session = self.get_session(session_id)
+    with session.lock:
+      game_state = session.game_state
+      if game_state.has_game_ended:
+        raise InvalidMoveError("Error: The game has already ended.")
+      if game_state.get_current_player_mark is session.computer.mark:
+        raise InvalidMoveError("Error: It's the computer's turn.")
+      if not 0 <= position < game_state.grid.count:
+        raise InvalidMoveError("Error: Invalid move. The position is outside the grid.")
+      session.game_state = game_state.make_move_to(position).next_state
+      computer_move = self.play_computer_move(session)
+      return session.to_dict(computer_move)
+
+  def play_computer_move(self, session: Session) -> int | None:
+    game_state = session.game_state
+    if game_state.has_game_ended or game_state.get_current_player_mark is not session.computer.mark:
+      return None
+    session.game_state = session.computer.make_move(game_state)
+    with self.lock:
+      self.moves += 1
+    return session.game_state.last_move_position
+
+  def get_stats(self) -> dict[str, Any]:
+    with self.lock:
+      return {
+        "sessions": len(self.sessions),
+        "computer_moves": self.moves,
+        "tables": [
+          {"dimension": dimension, "required_marks_for_win": required_marks_for_win, "mark": mark.value, "entries": len(table)}
+          for (dimension, required_marks_for_win, mark), table in self.tables.items()
+        ],
+      }
+
+def get_int(body: dict[str, Any], name: str, default: int | None = None) -> int:
+  value = body.get(name, default)
+  if value is None:
+    raise RequestError(f"Error: Missing `{name}`.")
+  try:
+    return int(value)
+  except (TypeError, ValueError):
+    raise RequestError(f"Error: Invalid `{name}`. It must be an integer.") from None
+
+class RequestHandler(BaseHTTPRequestHandler):
+  """
+  The JSON API of the server:
+
+  POST /sessions: Starts a game from `{"dimension", "required_marks_for_win", "starting_mark", "computer_mark"}`.
+  GET /sessions/<id>: Returns the state of a game.
+  POST /sessions/<id>/moves: Plays `{"position"}` and the reply of the computer.
+  DELETE /sessions/<id>: Ends a game.
+  GET /stats: Returns the number of sessions and the size of the shared tables.
+  """
+  protocol_version = "HTTP/1.1"
+  server: GameHTTPServer
+
+  def do_GET(self) -> None:
+    parts = self.get_path_parts()
+    if parts == ["stats"]:
+      self.respond(lambda: self.server.game_server.get_stats())
+    elif len(parts) == 2 and parts[0] == "sessions":
+      self.respond(lambda: self.server.game_server.get_session(parts[1]).to_dict())
+    else:
+      self.send_json(HTTPStatus.NOT_FOUND, {"error": "Error: Not found."})
+
+  def do_POST(self) -> None:
+    parts = self.get_path_parts()
+    game_server = self.server.game_server
+    body = self.read_json()
+    if parts == ["sessions"]:
+      self.respond(lambda: game_server.create_session(
+        get_int(body, "dimension", 3),
+        get_int(body, "required_marks_for_win", 3),
+        body.get("starting_mark", Mark.CROSS.value),
+        body.get("computer_mark", Mark.NAUGHT.value),
+      ), HTTPStatus.CREATED)
+    elif len(parts) == 3 and parts[0] == "sessions" and parts[2] == "moves":
+      self.respond(lambda: game_server.make_move(parts[1], get_int(body, "position")))
+    else:
+      self.send_json(HTTPStatus.NOT_FOUND, {"error": "Error: Not found."})
+
+  def do_DELETE(self) -> None:
+    parts = self.get_path_parts()
+    if len(parts) == 2 and parts[0] == "sessions":
+      self.respond(lambda: self.server.game_server.delete_session(parts[1]) or {})
+    else:
+      self.send_json(HTTPStatus.NOT_FOUND, {"error": "Error: Not found."})
+
+  def get_path_parts(self) -> list[str]:
+    return [part for part in self.path.split("?")[0].split("/") if part]
+
+  def read_json(self) -> dict[str, Any]:
+    length = int(self.headers.get("Content-Length", 0))
+    if length == 0:
+      return {}
+    try:
+      body = json.loads(self.rfile.read(length))
+    except ValueError:
+      return {}
+    return body if isinstance(body, dict) else {}
+
+  def respond(self, handler: Callable[[], dict[str, Any]], status: HTTPStatus = HTTPStatus.OK) -> None:
+    try:
+      self.send_json(status, handler())
+    except SessionNotFoundError as error:
+      self.send_json(HTTPStatus.NOT_FOUND, {"error": str(error)})
+    except (RequestError, InvalidMoveError) as error:
+      self.send_json(HTTPStatus.BAD_REQUEST, {"error": str(error)})
+    except Exception:
+      # Any other error is a failure of the server, not of the request
+      traceback.print_exc()
+      self.send_json(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "Error: Internal server error."})
+
+  def send_json(self, status: HTTPStatus, body: dict[str, Any]) -> None:
+    data = json.dumps(body).encode()
+    self.send_response(status)
+    self.send_header("Content-Type", "application/json")
+    self.send_header("Content-Length", str(len(data)))
+    self.end_headers()
+    self.wfile.write(data)
+
+  def log_message(self, format: str, *args: Any) -> None:
+    if self.server.verbose:
+      super().log_message(format, *args)
+
+class GameHTTPServer(ThreadingHTTPServer):
+  daemon_threads = True
+
+  def __init__(self, address: tuple[str, int], game_server: GameServer, verbose: bool = False) -> None:
+    super().__init__(address, RequestHandler)
+    self.game_server = game_server
+    self.verbose = verbose
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description="Serve games against the computer over HTTP on a local port, with one search cache per board configuration and mark shared by all the sessions.")
+  parser.add_argument("--host", default="127.0.0.1")
+  parser.add_argument("--port", type=int, default=8765)
+  parser.add_argument("--player", choices=PLAYER_CLASSES.keys(), default="alpha_beta")
+  parser.add_argument("--time-budget", type=float, default=0.2, help="The number of seconds each move of the Alpha-Beta player may be searched, or 0 to search at its fixed depth.")
+  parser.add_argument("--max-table-entries", type=int, default=1_000_000, help="The maximum number of entries of each shared search cache.")
+  parser.add_argument("--max-sessions", type=int, default=10_000)
+  parser.add_argument("--max-dimension", type=int, default=20, help="The largest board dimension a session may ask for.")
+  parser.add_argument("--verbose", action="store_true", help="Log every request.")
+  args = parser.parse_args()
+
+  time_budget = args.time_budget if args.time_budget > 0 else None
+  game_server = GameServer(PLAYER_CLASSES[args.player], time_budget, args.max_table_entries, args.max_sessions, args.max_dimension)
+  with GameHTTPServer((args.host, args.port), game_server, args.verbose) as server:
+    print(f"Serving on http://{args.host}:{server.server_address[1]}", flush=True)
+    start = time.perf_counter()
+    try:
+      server.serve_forever()
+    except KeyboardInterrupt:
+      pass
+    print(f"Served {game_server.moves} computer moves in {time.perf_counter() - start:.1f} seconds.")
@@ -0,0 +1,171 @@
+# tic_tac_toe/game/async_engine.py
+
+from __future__ import annotations
+
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from typing import Awaitable, Callable, TypeAlias
+
+import abc
+import asyncio
+
+from tic_tac_toe.game.players import ComputerPlayer, Player
+from tic_tac_toe.game.renderer import Renderer
+from tic_tac_toe.logic.entities import Mark
+from tic_tac_toe.logic.exceptions import InvalidMoveError
+from tic_tac_toe.logic.models import BitboardGrid, GameState, Move
+from tic_tac_toe.logic.validators import validate_players, validate_starting_mark
+
+AsyncErrorHandler: TypeAlias = Callable[[Exception], Awaitable[None] | None]
+
+class AsyncPlayer(metaclass=abc.ABCMeta):
+  """
+  Abstract base class for a player of the asyncio engine.
+
+  Attributes:
+  mark (Mark): The mark of the player (X or O).
+  """
+  def __init__(self, mark: Mark) -> None:
+    self.mark = mark
+
+  async def make_move(self, game_state: GameState) -> GameState:
+    """
+    Makes a move in the game.
+
+    Parameters:
+    game_state (GameState): The current state of the game.
+
+    Returns:
+    GameState: The state of the game after the move.
+    """
+    if self.mark is game_state.get_current_player_mark:
+      if move := await self.get_move(game_state):
+        return move.next_state
+      raise InvalidMoveError("Info: No more moves available.")
+    else:
+      raise InvalidMoveError(f"It's not player ` {self.mark} `'s turn.")
+
+  @abc.abstractmethod
+  async def get_move(self, game_state: GameState) -> Move | None:
+    """
+    Abstract method to get a move from the player, without blocking the event loop.
+
+    Parameters:
+    game_state (GameState): The current state of the game.
+
+    Returns:
+    Move | None: The move chosen by the player, or None if no move is available.
+    """
+    pass
+
+  def close(self) -> None:
+    pass
+
+class AsyncRenderer(metaclass=abc.ABCMeta):
+  @abc.abstractmethod
+  async def render(self, game_state: GameState) -> None:
+    pass
+
+class PlayerAdapter(AsyncPlayer):
+  """
+  Lets a synchronous `Player` play in the asyncio engine. Its moves are computed in an executor, so that a long search
+  or a blocking `input()` does not stop the other games of the event loop.
+
+  Attributes:
+  player (Player): The adapted player.
+  executor (Executor | None): The executor the moves are computed in. The default executor of the loop, a thread pool, is used if None.
+  """
+  def __init__(self, player: Player, executor: Executor | None = None) -> None:
+    super().__init__(player.mark)
+    self.player = player
+    self.executor = executor
+
+  async def get_move(self, game_state: GameState) -> Move | None:
+    loop = asyncio.get_running_loop()
+    if isinstance(self.player, ComputerPlayer):
+      # The delay only paces the game, so it is awaited instead of holding a thread of the executor
+      if self.player.delay > 0:
+        await asyncio.sleep(self.player.delay)
+      return await loop.run_in_executor(self.executor, self.player.get_computer_move, game_state)
+    return await loop.run_in_executor(self.executor, self.player.get_move, game_state)
+
+  def close(self) -> None:
+    if hasattr(self.player, "close"):
+      self.player.close()
+
+class RendererAdapter(AsyncRenderer):
+  """
+  Lets a synchronous `Renderer` draw the games of the asyncio engine. Rendering is expected to be quick, so it runs in the event loop.
+
+  Attributes:
+  renderer (Renderer): The adapted renderer.
+  """
+  def __init__(self, renderer: Renderer) -> None:
+    self.renderer = renderer
+
+  async def render(self, game_state: GameState) -> None:
+    self.renderer.render(game_state)
+
+async def default_error_handler(e: Exception) -> None:
+  print(f"\nAn error occurred:\n{str(e)}")
+
+@dataclass(frozen=True)
+class AsyncTicTacToe:
+  """
+  The game engine for asyncio, so that one process can drive many games at once. Synchronous players and renderers are
+  wrapped in `PlayerAdapter` and `RendererAdapter`.
+
+  Attributes:
+  player1 (AsyncPlayer | Player): The first player.
+  player2 (AsyncPlayer | Player): The second player.
+  renderer (AsyncRenderer | Renderer): The renderer the states are drawn with.
+  error_handler (AsyncErrorHandler | None): The handler of the errors raised during the game, which may be a coroutine function.
+  executor (Executor | None): The executor the moves of adapted players are computed in. The default executor of the loop is used if None.
+  """
+  player1: AsyncPlayer | Player
+  player2: AsyncPlayer | Player
+  renderer: AsyncRenderer | Renderer
+  error_handler: AsyncErrorHandler | None = default_error_handler
+  executor: Executor | None = None
+
+  def __post_init__(self):
+    validate_players([self.player1, self.player2])
+    if isinstance(self.player1, Player):
+      object.__setattr__(self, "player1", PlayerAdapter(self.player1, self.executor))
+    if isinstance(self.player2, Player):
+      object.__setattr__(self, "player2", PlayerAdapter(self.player2, self.executor))
+    if isinstance(self.renderer, Renderer):
+      object.__setattr__(self, "renderer", RendererAdapter(self.renderer))
+
+  async def play(self, starting_mark: str, dimension: int, required_marks_for_win: int) -> GameState | None:
+    """
+    Plays a game until it ends.
+
+    Parameters:
+    starting_mark (str): The mark of the starting player.
+    dimension (int): The dimension of the game grid.
+    required_marks_for_win (int): The number of marks in a row required to win.
+
+    Returns:
+    GameState | None: The final state of the game, or None if an error ended it.
+    """
+    try:
+      validate_starting_mark(starting_mark)
+      game_state = GameState(BitboardGrid(dimension), Mark(starting_mark), required_marks_for_win)
+      while True:
+        await self.renderer.render(game_state)
+        if game_state.has_game_ended:
+          return game_state
+        player = self.get_current_player(game_state)
+        previous_state = game_state
+        game_state = await player.make_move(game_state)
+        previous_state.drop_caches()
+    except Exception as e:
+      if self.error_handler is not None:
+        result = self.error_handler(e)
+        if asyncio.iscoroutine(result):
+          await result
+      return None
+
+  def get_current_player(self, game_state: GameState) -> AsyncPlayer:
+    return self.player1 if game_state.get_current_player_mark is self.player1.mark else self.player2
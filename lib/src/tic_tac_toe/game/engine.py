@@ -5,9 +5,10 @@ from typing import Callable, TypeAlias
 
 from tic_tac_toe.game.players import Player
 from tic_tac_toe.game.renderer import Renderer
+from tic_tac_toe.game.telemetry import Telemetry
 from tic_tac_toe.logic.entities import Mark
 from tic_tac_toe.logic.exceptions import InvalidMoveError
-from tic_tac_toe.logic.models import GameState, Grid
+from tic_tac_toe.logic.models import BitboardGrid, GameState
 from tic_tac_toe.logic.validators import validate_players, validate_starting_mark
 
 ErrorHandler: TypeAlias = Callable[[Exception], None]
@@ -21,6 +22,7 @@ class TicTacToe:
   player2: Player
   renderer: Renderer
   error_handler: ErrorHandler | None = default_error_handler
+  telemetry: Telemetry | None = None
 
   def __post_init__(self):
     validate_players([self.player1, self.player2])
@@ -28,17 +30,30 @@ class TicTacToe:
   def play(self, starting_mark: str, dimension: int, required_marks_for_win: int) -> None:
     try:
       validate_starting_mark(starting_mark)
-      game_state = GameState(Grid(dimension), Mark(starting_mark), required_marks_for_win)
+      game_state = GameState(BitboardGrid(dimension), Mark(starting_mark), required_marks_for_win)
+      if self.telemetry is not None:
+        self.telemetry.start_game(game_state)
       while True:
         self.renderer.render(game_state)
         if game_state.has_game_ended:
+          if self.telemetry is not None:
+            self.telemetry.end_game(game_state)
           break
         player = self.get_current_player(game_state)
-        game_state = player.make_move(game_state)
+        previous_state = game_state
+        if self.telemetry is None:
+          game_state = player.make_move(game_state)
+        else:
+          game_state = self.telemetry.measure_move(player, game_state)
+        # Frees the moves the players expanded from the previous position
+        previous_state.drop_caches()
     except KeyboardInterrupt as _:
       self.error_handler(Exception("Error: The game was interrupted by the user."))
     except Exception as e:
       self.error_handler(e)
+    finally:
+      if self.telemetry is not None:
+        self.telemetry.stop_tracing()
   
   def get_current_player(self, game_state: GameState) -> Player:
     return self.player1 if game_state.get_current_player_mark is self.player1.mark else self.player2
@@ -1,13 +1,22 @@
 # tic_tac_toe/game/players.py 
 
 import abc
+import threading
 import time
 import random
 
 from tic_tac_toe.logic.entities import Mark
-from tic_tac_toe.logic.exceptions import InvalidMoveError
-from tic_tac_toe.logic.algorithms import find_best_move_minimax, find_best_move_alpha_beta
+from tic_tac_toe.logic.exceptions import InvalidMoveError, SearchTimeoutError
+from tic_tac_toe.logic.algorithms import find_best_move_minimax, find_best_move_alpha_beta, find_best_move_iterative_deepening, get_principal_variation, has_exact_root_score
+from tic_tac_toe.logic.book import open_opening_book
+from tic_tac_toe.logic.endgame import EndgameTable, open_endgame_table
+from tic_tac_toe.logic.evaluation import heuristic_score
+from tic_tac_toe.logic.mcts import ParallelMCTS, find_best_move_mcts
 from tic_tac_toe.logic.models import GameState, Move
+from tic_tac_toe.logic.ordering import KillerHistoryOrdering, MoveOrdering
+from tic_tac_toe.logic.parallel import ParallelSearch
+from tic_tac_toe.logic.threats import find_threat_defense, find_threat_move
+from tic_tac_toe.logic.transposition import TranspositionTable
 
 class Player(metaclass=abc.ABCMeta):
   """
@@ -98,15 +107,73 @@ class RandomComputerPlayer(ComputerPlayer):
   def get_computer_move(self, game_state: GameState) -> Move | None:
     return game_state.make_random_move()
 
-class MinimaxComputerPlayer(ComputerPlayer):
+class SearchComputerPlayer(ComputerPlayer, metaclass=abc.ABCMeta):
   """
-  A computer player that uses the Minimax algorithm to choose moves.
+  Abstract base class for a computer player that searches the game tree.
   
   Attributes:
   mark (Mark): The mark of the player (X or O).
+  transposition_table (TranspositionTable): The search cache kept for the lifetime of the player, or the table given to share between players of the same mark.
+  workers (int): The number of worker processes searching the root moves. With 1, the search runs in the game's process.
+  endgame_directory (str | None): The directory of the endgame tables to answer solved positions from, if any.
+  book_directory (str | None): The directory of the opening books to answer the first moves from, if any.
   """
-  def __init__(self, mark: Mark) -> None:
+  def __init__(self, mark: Mark, max_table_entries: int = 1_000_000, workers: int = 1, endgame_directory: str | None = None, book_directory: str | None = None, table: TranspositionTable | None = None) -> None:
     super().__init__(mark)
+    self.max_table_entries = max_table_entries
+    # Tables only hold scores for one maximizer, so a shared table must only be shared between players of the same mark
+    self.transposition_table = table if table is not None else TranspositionTable(max_table_entries)
+    self.workers = workers
+    self.parallel_search: ParallelSearch | None = None
+    self.endgame_directory = endgame_directory
+    self.book_directory = book_directory
+
+  @property
+  def pool(self) -> ParallelSearch | None:
+    """
+    The worker pool of the player, created on first use and kept for all the following moves.
+    """
+    if self.workers <= 1:
+      return None
+    if self.parallel_search is None:
+      self.parallel_search = ParallelSearch(self.workers, self.max_table_entries, self.get_ordering_class())
+    return self.parallel_search
+
+  def get_ordering_class(self) -> type[MoveOrdering] | None:
+    return None
+
+  def get_endgame_table(self, game_state: GameState) -> EndgameTable | None:
+    if self.endgame_directory is None:
+      return None
+    return open_endgame_table(self.endgame_directory, game_state.grid.dimension, game_state.required_marks_for_win)
+
+  def get_book_move(self, game_state: GameState) -> Move | None:
+    if self.book_directory is None:
+      return None
+    book = open_opening_book(self.book_directory, game_state.grid.dimension, game_state.required_marks_for_win)
+    return book.lookup(game_state) if book is not None else None
+
+  def close(self) -> None:
+    """
+    Stops the worker processes of the player, if any.
+    """
+    if self.parallel_search is not None:
+      self.parallel_search.close()
+      self.parallel_search = None
+
+class MinimaxComputerPlayer(SearchComputerPlayer):
+  """
+  A computer player that uses the Minimax algorithm to choose moves.
+  
+  Attributes:
+  mark (Mark): The mark of the player (X or O).
+  transposition_table (TranspositionTable): The search cache kept for the lifetime of the player, or the table given to share between players of the same mark.
+  workers (int): The number of worker processes searching the root moves.
+  endgame_directory (str | None): The directory of the endgame tables to answer solved positions from, if any.
+  book_directory (str | None): The directory of the opening books to answer the first moves from, if any.
+  """
+  def __init__(self, mark: Mark, max_table_entries: int = 1_000_000, workers: int = 1, endgame_directory: str | None = None, book_directory: str | None = None, table: TranspositionTable | None = None) -> None:
+    super().__init__(mark, max_table_entries, workers, endgame_directory, book_directory, table)
 
   def get_computer_move(self, game_state: GameState) -> Move | None:
     """
@@ -118,20 +185,41 @@ class MinimaxComputerPlayer(ComputerPlayer):
     Returns:
     Move | None: The move chosen by the Minimax algorithm, or None if no move is available.
     """
+    if (book_move := self.get_book_move(game_state)) is not None:
+      return book_move
     if game_state.has_game_started:
       depth = 1 if game_state.grid.dimension > 4 else 3
-      return find_best_move_minimax(game_state, depth)
+      return find_best_move_minimax(game_state, depth, table=self.transposition_table, pool=self.pool, endgame=self.get_endgame_table(game_state))
     return game_state.make_random_move()
 
-class AlphaBetaComputerPlayer(ComputerPlayer):
+class AlphaBetaComputerPlayer(SearchComputerPlayer):
   """
   A computer player that uses the Alpha-Beta pruning algorithm to choose moves.
   
   Attributes:
   mark (Mark): The mark of the player (X or O).
+  transposition_table (TranspositionTable): The search cache kept for the lifetime of the player, or the table given to share between players of the same mark.
+  workers (int): The number of worker processes searching the root moves.
+  time_budget (float | None): The number of seconds each move may be searched with iterative deepening, or None to search at a fixed depth.
+  ordering (MoveOrdering): The move ordering policy used by the search.
+  endgame_directory (str | None): The directory of the endgame tables to answer solved positions from, if any.
+  book_directory (str | None): The directory of the opening books to answer the first moves from, if any.
+  threat_search (bool | None): If True, forcing sequences are searched before the full-width search. Sequences of fours are played at once, and the first move of a sequence with threes is searched first. The searched move is checked against the opponent's sequences, unless the search found the value of the position. If None, the threat search is used when at least 4 marks in a row are required to win. With 3, the forcing sequences are short enough for the full-width search, which solves the small boards outright.
+  ponder (bool): If True, the likely replies are searched in a background thread during the opponent's turn. Meant for human opponents, whose time would otherwise be idle.
+  pondered_moves (dict[str, Move]): The moves found while pondering, by the cells of the position after the reply.
   """
-  def __init__(self, mark: Mark) -> None:
-    super().__init__(mark)
+  def __init__(self, mark: Mark, max_table_entries: int = 1_000_000, time_budget: float | None = 1.0, ordering: MoveOrdering | None = None, workers: int = 1, endgame_directory: str | None = None, book_directory: str | None = None, threat_search: bool | None = None, ponder: bool = False, table: TranspositionTable | None = None) -> None:
+    super().__init__(mark, max_table_entries, workers, endgame_directory, book_directory, table)
+    self.time_budget = time_budget
+    self.ordering = ordering if ordering is not None else KillerHistoryOrdering()
+    self.threat_search = threat_search
+    self.ponder = ponder
+    self.pondered_moves: dict[str, Move] = {}
+    self.ponder_thread: threading.Thread | None = None
+    self.ponder_stop = threading.Event()
+
+  def get_ordering_class(self) -> type[MoveOrdering] | None:
+    return type(self.ordering)
   
   def get_computer_move(self, game_state: GameState) -> Move | None:
     """
@@ -143,7 +231,173 @@ class AlphaBetaComputerPlayer(ComputerPlayer):
     Returns:
     Move | None: The move chosen by the Alpha-Beta pruning algorithm, or None if no move is available.
     """
+    self.stop_pondering()
+    move = self.choose_move(game_state)
+    if self.ponder and move is not None and not move.next_state.has_game_ended:
+      self.start_pondering(move.next_state)
+    return move
+
+  def uses_threat_search(self, game_state: GameState) -> bool:
+    if self.threat_search is not None:
+      return self.threat_search
+    return game_state.required_marks_for_win >= 4
+
+  def has_exact_move(self, game_state: GameState, move: Move) -> bool:
+    endgame = self.get_endgame_table(game_state)
+    if endgame is not None and endgame.lookup(game_state) is not None:
+      return True
+    return has_exact_root_score(game_state, move, self.transposition_table)
+
+  def choose_move(self, game_state: GameState) -> Move | None:
+    if (book_move := self.get_book_move(game_state)) is not None:
+      return book_move
     if game_state.has_game_started:
-      depth = 1 if game_state.grid.dimension > 5 else 3
-      return find_best_move_alpha_beta(game_state, depth)
-    return game_state.make_random_move()
\ No newline at end of file
+      threat_search = self.uses_threat_search(game_state)
+      # Every answer to a four is forced, so a sequence of fours is played without searching
+      if threat_search and (forced_move := find_threat_move(game_state, threes=False)) is not None:
+        return forced_move
+      # A pondered move was searched with the same budget or depth and the same first move, so it is as good as
+      # searching again
+      move = self.pondered_moves.get(game_state.grid.cells)
+      if move is None:
+        move = self.search(game_state, self.pool, first_position=self.get_threat_position(game_state))
+      # The defense check is a heuristic, so it must not replace a move whose value the search proved
+      if threat_search and move is not None and not self.has_exact_move(game_state, move):
+        move = find_threat_defense(game_state, move)
+      return move
+    return game_state.make_random_move()
+
+  def get_threat_position(self, game_state: GameState) -> int | None:
+    """
+    Finds the first move of a forcing sequence with threes, for the search to confirm by searching it first. A
+    sequence with threes may be refuted by a quiet move, so it is not played without searching.
+
+    Parameters:
+    game_state (GameState): The position to search, with the player to move.
+
+    Returns:
+    int | None: The position of the first move of the sequence, or None if the threat search is not used or finds none.
+    """
+    if not self.uses_threat_search(game_state) or game_state.required_marks_for_win < 4:
+      return None
+    threat_move = find_threat_move(game_state)
+    return threat_move.position if threat_move is not None else None
+
+  def search(self, game_state: GameState, pool: ParallelSearch | None = None, stop: threading.Event | None = None, first_position: int | None = None) -> Move | None:
+    """
+    Searches a position with the time budget or depth of the player.
+    
+    Parameters:
+    game_state (GameState): The position to search, with the player to move.
+    pool (ParallelSearch | None): The worker processes to search the root moves in. The search runs in this process if None.
+    stop (threading.Event | None): The event that stops the search once set.
+    first_position (int | None): The position of the root move to search first, such as the first move of a threat sequence.
+    
+    Returns:
+    Move | None: The best move found.
+    """
+    if self.time_budget is not None:
+      return find_best_move_iterative_deepening(game_state, self.time_budget, table=self.transposition_table, ordering=self.ordering, pool=pool, endgame=self.get_endgame_table(game_state), stop=stop, first_position=first_position)
+    depth = 1 if game_state.grid.dimension > 5 else 3
+    self.ordering.new_search()
+    if pool is not None:
+      pool.new_search()
+    return find_best_move_alpha_beta(game_state, depth, table=self.transposition_table, first_position=first_position, ordering=self.ordering, pool=pool, endgame=self.get_endgame_table(game_state), stop=stop)
+
+  def start_pondering(self, game_state: GameState) -> None:
+    """
+    Starts searching the replies of the opponent in a background thread. The searches fill the transposition table,
+    and the moves they complete are kept for when the reply is played.
+    
+    Parameters:
+    game_state (GameState): The position after the player's move, with the opponent to move.
+    """
+    self.stop_pondering()
+    self.pondered_moves = {}
+    self.ponder_stop = threading.Event()
+    self.ponder_thread = threading.Thread(target=self.ponder_replies, args=(game_state, self.ponder_stop), daemon=True)
+    self.ponder_thread.start()
+
+  def stop_pondering(self) -> None:
+    """
+    Stops the background search, if any, and waits for it so that nothing else writes to the transposition table.
+    """
+    if self.ponder_thread is not None:
+      self.ponder_stop.set()
+      self.ponder_thread.join()
+      self.ponder_thread = None
+
+  def ponder_replies(self, game_state: GameState, stop: threading.Event) -> None:
+    # The reply the last search expected comes first, then the others by how good they look to the opponent
+    opponent = game_state.get_current_player_mark
+    expected = get_principal_variation(game_state, self.transposition_table, 1)
+    replies = [move for move in game_state.get_valid_moves if not move.next_state.has_game_ended]
+    replies.sort(key=lambda move: (move.position not in expected, -heuristic_score(move.next_state, opponent)))
+    for reply in replies:
+      try:
+        move = self.search(reply.next_state, stop=stop, first_position=self.get_threat_position(reply.next_state))
+      except SearchTimeoutError:
+        return
+      # A search cut short by the stop event is shallower than the search of the player's turn
+      if stop.is_set():
+        return
+      if move is not None:
+        self.pondered_moves[reply.next_state.grid.cells] = move
+
+  def close(self) -> None:
+    """
+    Stops pondering and the worker processes of the player, if any.
+    """
+    self.stop_pondering()
+    super().close()
+
+class MCTSComputerPlayer(ComputerPlayer):
+  """
+  A computer player that uses Monte Carlo tree search to choose moves. Its strength grows with
+  the time budget and the number of workers rather than with a fixed search depth.
+  
+  Attributes:
+  mark (Mark): The mark of the player (X or O).
+  time_budget (float | None): The number of seconds each move is searched, or None to only count iterations.
+  iterations (int | None): The number of playouts run for each move, or None to only count time.
+  rollout_policy (str): The policy of the playouts, either "random" or "heuristic".
+  workers (int): The number of worker processes growing search trees. With 1, the search runs in the game's process.
+  """
+  def __init__(self, mark: Mark, time_budget: float | None = 1.0, iterations: int | None = None, rollout_policy: str = "random", workers: int = 1) -> None:
+    super().__init__(mark)
+    self.time_budget = time_budget
+    self.iterations = iterations
+    self.rollout_policy = rollout_policy
+    self.workers = workers
+    self.parallel_mcts: ParallelMCTS | None = None
+
+  @property
+  def pool(self) -> ParallelMCTS | None:
+    """
+    The worker pool of the player, created on first use and kept for all the following moves.
+    """
+    if self.workers <= 1:
+      return None
+    if self.parallel_mcts is None:
+      self.parallel_mcts = ParallelMCTS(self.workers)
+    return self.parallel_mcts
+
+  def get_computer_move(self, game_state: GameState) -> Move | None:
+    """
+    Gets a move from the computer player using Monte Carlo tree search.
+    
+    Parameters:
+    game_state (GameState): The current state of the game.
+    
+    Returns:
+    Move | None: The most visited move, or None if no move is available.
+    """
+    return find_best_move_mcts(game_state, self.time_budget, self.iterations, self.rollout_policy, pool=self.pool)
+
+  def close(self) -> None:
+    """
+    Stops the worker processes of the player, if any.
+    """
+    if self.parallel_mcts is not None:
+      self.parallel_mcts.close()
+      self.parallel_mcts = None
@@ -8,3 +8,10 @@ class Renderer(metaclass=abc.ABCMeta):
   @abc.abstractmethod
   def render(self, game_state: GameState) -> None:
     pass
+
+class NullRenderer(Renderer):
+  """
+  A renderer that draws nothing, for games played without a user interface.
+  """
+  def render(self, game_state: GameState) -> None:
+    pass
@@ -0,0 +1,181 @@
+# tic_tac_toe/game/selfplay.py
+
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from multiprocessing import Pool
+from typing import Any, Iterator
+
+import argparse
+import json
+import random
+import sys
+import time
+
+from tic_tac_toe.game.players import AlphaBetaComputerPlayer, ComputerPlayer, MCTSComputerPlayer, MinimaxComputerPlayer, Player, RandomComputerPlayer
+from tic_tac_toe.logic.entities import Mark
+from tic_tac_toe.logic.models import BitboardGrid, GameState
+
+PLAYER_CLASSES: dict[str, type[ComputerPlayer]] = {
+  "random": RandomComputerPlayer,
+  "minimax": MinimaxComputerPlayer,
+  "alpha_beta": AlphaBetaComputerPlayer,
+  "mcts": MCTSComputerPlayer,
+}
+
+@dataclass(frozen=True)
+class PlayerSpec:
+  """
+  A picklable description of a player, built again in every game.
+
+  Attributes:
+  player_class (type[Player]): The class of the player.
+  options (dict[str, Any]): The keyword arguments passed to the class besides the mark.
+  """
+  player_class: type[Player]
+  options: dict[str, Any] = field(default_factory=dict)
+
+  def create(self, mark: Mark) -> Player:
+    player = self.player_class(mark, **self.options)
+    if isinstance(player, ComputerPlayer):
+      # The delay only paces games for a human watching them
+      player.delay = 0
+    return player
+
+@dataclass(frozen=True)
+class SelfPlayConfig:
+  """
+  The settings shared by all the games of a self-play run.
+
+  Attributes:
+  player_x (PlayerSpec): The player of the crosses.
+  player_o (PlayerSpec): The player of the naughts.
+  dimension (int): The dimension of the board.
+  required_marks_for_win (int): The number of marks in a row required to win.
+  starting_mark (str | None): The mark of the starting player, or None to alternate it from game to game.
+  seed (int): The seed of the random number generator of the first game. Game `n` uses `seed + n`.
+  """
+  player_x: PlayerSpec
+  player_o: PlayerSpec
+  dimension: int = 3
+  required_marks_for_win: int = 3
+  starting_mark: str | None = None
+  seed: int = 0
+
+@dataclass
+class GameRecord:
+  """
+  The result of one self-play game.
+
+  Attributes:
+  game (int): The number of the game in the run.
+  starting_mark (str): The mark of the starting player.
+  winner (str | None): The mark of the winner, or None for a draw.
+  moves (list[int]): The positions of the moves, in the order they were played.
+  times (list[float]): The number of seconds each move took.
+  """
+  game: int
+  starting_mark: str
+  winner: str | None
+  moves: list[int]
+  times: list[float]
+
+def play_game(config: SelfPlayConfig, game: int) -> GameRecord:
+  """
+  Plays one game without rendering it.
+
+  Parameters:
+  config (SelfPlayConfig): The settings of the run.
+  game (int): The number of the game in the run.
+
+  Returns:
+  GameRecord: The result of the game.
+  """
+  random.seed(config.seed + game)
+  starting_mark = Mark(config.starting_mark) if config.starting_mark is not None else (Mark.CROSS, Mark.NAUGHT)[game % 2]
+  players = {Mark.CROSS: config.player_x.create(Mark.CROSS), Mark.NAUGHT: config.player_o.create(Mark.NAUGHT)}
+  game_state = GameState(BitboardGrid(config.dimension), starting_mark, config.required_marks_for_win)
+  moves: list[int] = []
+  times: list[float] = []
+  try:
+    while not game_state.has_game_ended:
+      start = time.perf_counter()
+      previous_state = game_state
+      game_state = players[game_state.get_current_player_mark].make_move(game_state)
+      previous_state.drop_caches()
+      times.append(time.perf_counter() - start)
+      moves.append(game_state.last_move_position)
+  finally:
+    for player in players.values():
+      if hasattr(player, "close"):
+        player.close()
+  winner = game_state.get_winner
+  return GameRecord(game, starting_mark.value, winner.value if winner is not None else None, moves, times)
+
+# Settings of the current worker process, set up by `initialize_worker`
+worker_config: SelfPlayConfig | None = None
+
+def initialize_worker(config: SelfPlayConfig) -> None:
+  global worker_config
+  worker_config = config
+
+def play_worker_game(game: int) -> GameRecord:
+  return play_game(worker_config, game)
+
+def run_self_play(config: SelfPlayConfig, games: int, workers: int = 1, chunk_size: int = 16) -> Iterator[GameRecord]:
+  """
+  Plays games between the two players of a configuration and yields their records as they finish.
+
+  Parameters:
+  config (SelfPlayConfig): The settings of the run.
+  games (int): The number of games to play.
+  workers (int): The number of worker processes. With 1, the games are played in this process, in order.
+  chunk_size (int): The number of games sent to a worker at a time.
+
+  Returns:
+  Iterator[GameRecord]: The records of the games, in the order they finish.
+  """
+  if workers <= 1:
+    for game in range(games):
+      yield play_game(config, game)
+    return
+  with Pool(workers, initializer=initialize_worker, initargs=(config,)) as pool:
+    yield from pool.imap_unordered(play_worker_game, range(games), chunksize=chunk_size)
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description="Play games between two computer players without rendering them, and write one JSON line per game.")
+  parser.add_argument("-X", dest="player_x", choices=PLAYER_CLASSES.keys(), default="alpha_beta")
+  parser.add_argument("-O", dest="player_o", choices=PLAYER_CLASSES.keys(), default="random")
+  parser.add_argument("--x-options", type=json.loads, default={}, help='Keyword arguments of player X, as JSON. For example: \'{"time_budget": 0.05}\'')
+  parser.add_argument("--o-options", type=json.loads, default={}, help="Keyword arguments of player O, as JSON.")
+  parser.add_argument("--games", type=int, default=100)
+  parser.add_argument("--dimension", type=int, default=3)
+  parser.add_argument("--required", dest="required_marks_for_win", type=int, default=3)
+  parser.add_argument("--starting", dest="starting_mark", choices=[Mark.CROSS.value, Mark.NAUGHT.value], default=None, help="Defaults to alternating.")
+  parser.add_argument("--seed", type=int, default=0)
+  parser.add_argument("--workers", type=int, default=1)
+  parser.add_argument("--output", default="-", help="The file to write the results to. Defaults to the standard output.")
+  args = parser.parse_args()
+
+  config = SelfPlayConfig(
+    PlayerSpec(PLAYER_CLASSES[args.player_x], args.x_options),
+    PlayerSpec(PLAYER_CLASSES[args.player_o], args.o_options),
+    args.dimension,
+    args.required_marks_for_win,
+    args.starting_mark,
+    args.seed,
+  )
+  results: Counter[str] = Counter()
+  output = open(args.output, "w") if args.output != "-" else sys.stdout
+  try:
+    for record in run_self_play(config, args.games, args.workers):
+      output.write(json.dumps(asdict(record)) + "\n")
+      results[record.winner or "draw"] += 1
+  finally:
+    if output is not sys.stdout:
+      output.close()
+  print(f"X: {results['X']}, O: {results['O']}, draws: {results['draw']}", file=sys.stderr)
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,229 @@
+# tic_tac_toe/game/telemetry.py
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from dataclasses import asdict, dataclass
+from typing import Any, TextIO
+
+import json
+import os
+import time
+import tracemalloc
+
+from tic_tac_toe.game.players import ComputerPlayer, Player, SearchComputerPlayer
+from tic_tac_toe.logic.models import GameState
+
+# The upper bounds, in seconds, of the think time histogram buckets. A last bucket counts the slower moves.
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+try:
+  PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+except (AttributeError, ValueError, OSError):
+  PAGE_SIZE = None
+
+def get_rss_bytes() -> int | None:
+  """
+  Returns the resident set size of the process, or None where it cannot be read without a dependency.
+  """
+  if PAGE_SIZE is None:
+    return None
+  try:
+    with open("/proc/self/statm") as file:
+      return int(file.read().split()[1]) * PAGE_SIZE
+  except (OSError, ValueError, IndexError):
+    return None
+
+def get_cache_entries(player: Player) -> int | None:
+  # Only the search players keep a cache between moves. With several workers, each worker process also keeps a table of
+  # its own, which cannot be read from here, so only the table of the game's process is counted.
+  if isinstance(player, SearchComputerPlayer):
+    return len(player.transposition_table)
+  return None
+
+def get_latency_histogram(times: list[float]) -> list[int]:
+  """
+  Counts think times into the `LATENCY_BUCKETS`.
+
+  Parameters:
+  times (list[float]): The think times, in seconds.
+
+  Returns:
+  list[int]: The number of times up to each bound of `LATENCY_BUCKETS`, then the number of slower ones.
+  """
+  counts = [0] * (len(LATENCY_BUCKETS) + 1)
+  for seconds in times:
+    counts[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+  return counts
+
+def get_percentile(sorted_times: list[float], percentile: float) -> float | None:
+  if not sorted_times:
+    return None
+  return sorted_times[min(len(sorted_times) - 1, int(percentile / 100 * len(sorted_times)))]
+
+@dataclass
+class MoveTelemetry:
+  """
+  The measures of one move.
+
+  Attributes:
+  move (int): The number of the move in the game, from 1.
+  mark (str): The mark of the player who moved.
+  position (int | None): The position of the mark placed.
+  think_time (float): The number of seconds `make_move` took, without the delay of computer players.
+  cache_entries (int | None): The number of entries in the player's transposition table after the move, or None for players without one. The tables of worker processes are not counted.
+  rss_delta (int | None): The change of the resident set size of the process during the move, in bytes, or None where it cannot be read.
+  traced_memory_delta (int | None): The change of the memory traced by tracemalloc during the move, in bytes, or None when memory is not traced.
+  traced_memory_peak (int | None): The peak of the memory traced by tracemalloc during the move, in bytes, or None when memory is not traced.
+  occupancy (float): The share of the cells holding a mark after the move.
+  """
+  move: int
+  mark: str
+  position: int | None
+  think_time: float
+  cache_entries: int | None
+  rss_delta: int | None
+  traced_memory_delta: int | None
+  traced_memory_peak: int | None
+  occupancy: float
+
+class Telemetry:
+  """
+  An opt-in hook of the game engine that measures every move and writes JSON lines: one summary per game, with its
+  latency histogram, and optionally one line per move.
+
+  Attributes:
+  output (TextIO | None): The stream the lines are written to. Nothing is written if None.
+  record_moves (bool): If True, a line is also written for every move.
+  trace_memory (bool): If True, memory is traced with tracemalloc during the games. Tracing slows every allocation.
+  moves (list[MoveTelemetry]): The measures of the moves of the current game.
+  think_times (list[float]): The think times of every move of every game.
+  games (int): The number of games ended so far.
+  """
+  def __init__(self, output: TextIO | None = None, record_moves: bool = False, trace_memory: bool = False) -> None:
+    self.output = output
+    self.record_moves = record_moves
+    self.trace_memory = trace_memory
+    self.moves: list[MoveTelemetry] = []
+    self.think_times: list[float] = []
+    self.games = 0
+    self.started_tracing = False
+
+  def start_game(self, game_state: GameState) -> None:
+    self.moves = []
+    if self.trace_memory and not tracemalloc.is_tracing():
+      tracemalloc.start()
+      self.started_tracing = True
+
+  def stop_tracing(self) -> None:
+    """
+    Stops tracing memory if `start_game` started it. The game engine calls it once a game is over, even one cut
+    short by an error.
+    """
+    if self.started_tracing:
+      tracemalloc.stop()
+      self.started_tracing = False
+
+  def measure_move(self, player: Player, game_state: GameState) -> GameState:
+    """
+    Lets a player make their move and records its measures. The delay of a computer player only paces the game for
+    a human watching it, so it is waited out before the move is measured.
+
+    Parameters:
+    player (Player): The player to move.
+    game_state (GameState): The state before the move.
+
+    Returns:
+    GameState: The state after the move.
+    """
+    delay = player.delay if isinstance(player, ComputerPlayer) else 0
+    if delay:
+      time.sleep(delay)
+      player.delay = 0
+    tracing = tracemalloc.is_tracing()
+    if tracing:
+      tracemalloc.reset_peak()
+      traced_before = tracemalloc.get_traced_memory()[0]
+    rss_before = get_rss_bytes()
+    start = time.perf_counter()
+    try:
+      next_state = player.make_move(game_state)
+    finally:
+      if delay:
+        player.delay = delay
+    think_time = time.perf_counter() - start
+    rss_after = get_rss_bytes()
+    traced_delta = traced_peak = None
+    if tracing:
+      traced_after, traced_peak = tracemalloc.get_traced_memory()
+      traced_delta = traced_after - traced_before
+
+    grid = next_state.grid
+    cells = grid.dimension ** 2
+    move = MoveTelemetry(
+      len(self.moves) + 1,
+      player.mark.value,
+      next_state.last_move_position,
+      think_time,
+      get_cache_entries(player),
+      rss_after - rss_before if rss_before is not None and rss_after is not None else None,
+      traced_delta,
+      traced_peak,
+      (cells - grid.empty_cells_count) / cells,
+    )
+    self.moves.append(move)
+    self.think_times.append(think_time)
+    if self.record_moves:
+      self.write({"type": "move", "game": self.games, **asdict(move)})
+    return next_state
+
+  def end_game(self, game_state: GameState) -> dict[str, Any]:
+    """
+    Writes the summary of the current game.
+
+    Parameters:
+    game_state (GameState): The final state of the game.
+
+    Returns:
+    dict[str, Any]: The summary.
+    """
+    self.stop_tracing()
+    times = sorted(move.think_time for move in self.moves)
+    winner = game_state.get_winner
+    cache_entries = [move.cache_entries for move in self.moves if move.cache_entries is not None]
+    rss_deltas = [move.rss_delta for move in self.moves if move.rss_delta is not None]
+    traced_peaks = [move.traced_memory_peak for move in self.moves if move.traced_memory_peak is not None]
+    summary = {
+      "type": "game",
+      "game": self.games,
+      "dimension": game_state.grid.dimension,
+      "required_marks_for_win": game_state.required_marks_for_win,
+      "winner": winner.value if winner is not None else None,
+      "moves": len(self.moves),
+      "think_time_total": sum(times),
+      "think_time_mean": sum(times) / len(times) if times else None,
+      "think_time_p50": get_percentile(times, 50),
+      "think_time_p95": get_percentile(times, 95),
+      "think_time_max": times[-1] if times else None,
+      "cache_entries_max": max(cache_entries) if cache_entries else None,
+      "rss_delta_total": sum(rss_deltas) if rss_deltas else None,
+      "traced_memory_peak": max(traced_peaks) if traced_peaks else None,
+      "latency_buckets": LATENCY_BUCKETS,
+      "latency_histogram": get_latency_histogram(times),
+    }
+    self.write(summary)
+    self.games += 1
+    return summary
+
+  def close(self) -> None:
+    """
+    Writes the latency histogram of all the games.
+    """
+    if self.games:
+      self.write({"type": "histogram", "games": self.games, "latency_buckets": LATENCY_BUCKETS, "latency_histogram": get_latency_histogram(self.think_times)})
+    if self.output is not None:
+      self.output.flush()
+
+  def write(self, record: dict[str, Any]) -> None:
+    if self.output is not None:
+      self.output.write(json.dumps(record) + "\n")
@@ -1,18 +1,55 @@
 # tic_tac_toe/logic/algorithms.py
 
-from concurrent.futures import ThreadPoolExecutor
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
 import random
-import os
+import time
 # import logging
 
+if TYPE_CHECKING:
+  from threading import Event
 
+  from tic_tac_toe.logic.endgame import EndgameTable
+  from tic_tac_toe.logic.parallel import ParallelSearch
+
+from tic_tac_toe.logic.board import SearchBoard
 from tic_tac_toe.logic.entities import Mark
+# `evaluate_score` and `heuristic_score` are re-exported for the callers that import them from here, where they used to be defined
+from tic_tac_toe.logic.evaluation import WIN_SCORE, evaluate_score, heuristic_score
+from tic_tac_toe.logic.exceptions import SearchTimeoutError
 from tic_tac_toe.logic.models import Move, GameState
+from tic_tac_toe.logic.ordering import MoveOrdering
+from tic_tac_toe.logic.stats import SearchStats
+from tic_tac_toe.logic.symmetry import restore_position, transform_position
+from tic_tac_toe.logic.transposition import Bound, TranspositionEntry, TranspositionTable
 
-num_cpus = os.cpu_count()
+@dataclass
+class SearchContext:
+  """
+  The state shared by every node of a search.
+  
+  Attributes:
+  board (SearchBoard): The board the search makes and unmakes its moves on.
+  maximizer (Mark): The player who is maximizing their score.
+  table (TranspositionTable | None): The transposition table used to store the results of previously computed states.
+  deadline (float | None): The `time.perf_counter()` value after which the search raises SearchTimeoutError.
+  ordering (MoveOrdering | None): The move ordering policy. Only the transposition table move is searched first if None.
+  stats (SearchStats | None): The counters to fill in. Nothing is counted if None.
+  stop (Event | None): The event that stops the search with SearchTimeoutError once set, from another thread.
+  """
+  board: SearchBoard
+  maximizer: Mark
+  table: TranspositionTable | None = None
+  deadline: float | None = None
+  ordering: MoveOrdering | None = None
+  stats: SearchStats | None = None
+  stop: Event | None = None
 
 # # logging.basicConfig(level=logging.INFO)
-def find_best_move_alpha_beta(game_state: GameState, depth: int, choose_higher_score: bool = True, memo: dict = {}) -> Move:
+def find_best_move_alpha_beta(game_state: GameState, depth: int, choose_higher_score: bool = True, table: TranspositionTable | None = None, deadline: float | None = None, first_position: int | None = None, ordering: MoveOrdering | None = None, pool: ParallelSearch | None = None, endgame: EndgameTable | None = None, stats: SearchStats | None = None, stop: Event | None = None) -> Move:
   """
   This function uses the Alpha-Beta pruning algorithm to find the best move in a game of Tic Tac Toe.
   
@@ -20,47 +57,207 @@ def find_best_move_alpha_beta(game_state: GameState, depth: int, choose_higher_s
   game_state (GameState): The current state of the game.
   depth (int): The maximum depth to search in the game tree.
   choose_higher_score (bool): If True, the function will choose the move with the highest score. If False, it will choose the move with the lowest score.
-  memo (dict): A dictionary used for memoization to store the results of previously computed states.
+  table (TranspositionTable | None): The transposition table to use. A new table is created for this search if None.
+  deadline (float | None): The `time.perf_counter()` value after which the search raises SearchTimeoutError.
+  first_position (int | None): The position of the root move to search first, and to prefer among equally scored moves.
+  ordering (MoveOrdering | None): The move ordering policy used below the root. Only the transposition table move is searched first if None.
+  pool (ParallelSearch | None): The worker processes to search the root moves in. The search runs in this process if None.
+  endgame (EndgameTable | None): The solved table of the board configuration, if any. When choosing the highest score, positions it holds are answered without searching.
+  stats (SearchStats | None): The counters to fill in with the nodes, cutoffs, table hits and root move times of the search. The worker processes of a pool do not report theirs, so only the root move times are counted with a pool.
+  stop (Event | None): The event that stops the search with SearchTimeoutError once set, from another thread. The worker processes of a pool do not see it.
   
   Returns:
-  Move: The best move found.
+  Move: The best move found, or None if the game has ended. Every cell is searched on an empty board, where `GameState.get_valid_moves` has no moves.
   """
   # logging.info('Starting find_best_move_alpha_beta')
   
-  moves = game_state.get_valid_moves
+  if choose_higher_score and (endgame_move := probe_endgame(endgame, game_state)) is not None:
+    return endgame_move
+
+  if table is None:
+    table = TranspositionTable()
+  context = SearchContext(SearchBoard(game_state), game_state.get_current_player_mark, table, deadline, ordering, stats, stop)
+  board = context.board
+  moves = order_moves(board.generate_moves(), first_position)
   
   if not moves:
     # logging.error('No valid moves available')
     return None
-  
-  with ThreadPoolExecutor(max_workers=num_cpus) as executor:
-    scores = list(executor.map(lambda move: alpha_beta_pruning(move, game_state.get_current_player_mark, depth, -float('inf'), float('inf'), choose_higher_score, memo), moves))
-    # scores = [alpha_beta_pruning(move, game_state.get_current_player_mark, depth, -float('inf'), float('inf'), choose_higher_score) for move in moves]
 
-  # Find the maximum score
-  max_score = max(scores) if choose_higher_score else min(scores)
+  # Symmetric moves lead to equivalent positions, so only one move of each group is searched
+  unique_moves, representatives = group_symmetric_moves(board, moves)
+  if pool is not None:
+    start = time.perf_counter()
+    unique_scores = pool.score_root_moves(game_state, unique_moves, depth, choose_higher_score, "alpha_beta", deadline)
+    if stats is not None:
+      # The root moves are searched at the same time, so each is given the time of the whole batch
+      elapsed = time.perf_counter() - start
+      for move in unique_moves:
+        stats.record_root_move(move, elapsed)
+  else:
+    unique_scores = score_root_moves_alpha_beta(context, unique_moves, depth, choose_higher_score)
+  scores = [unique_scores[representative] for representative in representatives]
 
-  # Find all moves with the maximum score
-  best_moves = [move for move, score in zip(moves, scores) if score == max_score]
+  chosen_position = select_best_move(board, moves, scores, choose_higher_score)
+  best_score = max(scores) if choose_higher_score else min(scores)
 
-  # Prioritize moves that could lead to a win in the next turn
-  for move in best_moves:
-    if move.next_state.get_winner is game_state.get_current_player_mark:
-      return move
+  # Store the root so that the principal variation can be followed from the table
+  store_in_table(table, board, depth + 1, best_score, Bound.EXACT, chosen_position)
+  if pool is not None:
+    # The workers keep their own tables, so keep the chosen line's score here
+    board.make_move(chosen_position)
+    store_in_table(table, board, depth, best_score, Bound.EXACT, None)
+    board.unmake_move()
 
-  # If no such move exists, prioritize moves that block the opponent from winning in their next turn
-  for move in best_moves:
-    if any(next_move.next_state.get_winner is not game_state.get_current_player_mark for next_move in move.next_state.get_valid_moves):
-      return move
+  # logging.info(f'Chosen move: {chosen_position}')
+  # logging.info('Ending find_best_move_alpha_beta')
+  return game_state.generate_move_to(chosen_position)
 
-  # If no such move exists, randomly select one of the best moves
-  chosen_move = random.choice(best_moves)
+def score_root_moves_alpha_beta(context: SearchContext, moves: list[int], depth: int, choose_higher_score: bool) -> list[int]:
+  """
+  This function scores the root moves one after the other, narrowing the window with the best score found so far.
+  
+  Parameters:
+  context (SearchContext): The search, with its board in the root position.
+  moves (list[int]): The positions of the root moves to score, best candidates first.
+  depth (int): The maximum depth to search below each root move.
+  choose_higher_score (bool): If True, the root picks the move with the highest score.
+  
+  Returns:
+  list[int]: The score of each move. Scores lower than the best score (higher when choosing the lowest score) are only bounds.
+  """
+  board = context.board
+  stats = context.stats
+  bound = -float('inf') if choose_higher_score else float('inf')
+  scores = []
+  for move in moves:
+    start = time.perf_counter() if stats is not None else 0.0
+    board.make_move(move)
+    # Searching with a window one point wider than the best score keeps equally good moves exact
+    if choose_higher_score:
+      score = alpha_beta_pruning(context, depth, bound - 1, float('inf'), False)
+      bound = max(bound, score)
+    else:
+      score = alpha_beta_pruning(context, depth, -float('inf'), bound + 1, True)
+      bound = min(bound, score)
+    board.unmake_move()
+    scores.append(score)
+    if stats is not None:
+      stats.record_root_move(move, time.perf_counter() - start)
+  return scores
+
+def find_best_move_iterative_deepening(game_state: GameState, time_budget: float, max_depth: int | None = None, choose_higher_score: bool = True, table: TranspositionTable | None = None, ordering: MoveOrdering | None = None, pool: ParallelSearch | None = None, endgame: EndgameTable | None = None, stats: SearchStats | None = None, stop: Event | None = None, first_position: int | None = None) -> Move:
+  """
+  This function runs Alpha-Beta searches of increasing depth until the time budget runs out.
+  The first iteration always completes, so a move is returned even with a tiny budget.
+  
+  Parameters:
+  game_state (GameState): The current state of the game.
+  time_budget (float): The number of seconds the search may take.
+  max_depth (int | None): The deepest iteration to run. Defaults to the number of empty cells.
+  choose_higher_score (bool): If True, the function will choose the move with the highest score. If False, it will choose the move with the lowest score.
+  table (TranspositionTable | None): The transposition table to use. A new table is created for this search if None.
+  ordering (MoveOrdering | None): The move ordering policy used below the root. Only the transposition table move is searched first if None.
+  pool (ParallelSearch | None): The worker processes to search the root moves in. The search runs in this process if None.
+  endgame (EndgameTable | None): The solved table of the board configuration, if any. When choosing the highest score, positions it holds are answered without searching.
+  stats (SearchStats | None): The counters to fill in for all the iterations, with the time of each completed one. Only the root move times are counted with a pool.
+  stop (Event | None): The event that ends the search once set, from another thread, like the end of the time budget. The worker processes of a pool do not see it.
+  first_position (int | None): The position of the root move to search first in the first iteration. The later iterations start from the best move of the previous one.
+  
+  Returns:
+  Move: The best move found by the deepest completed iteration, or None if the search was stopped before the first one completed.
+  """
+  if choose_higher_score and (endgame_move := probe_endgame(endgame, game_state)) is not None:
+    return endgame_move
+
+  deadline = time.perf_counter() + time_budget
+  if table is None:
+    table = TranspositionTable()
+  if ordering is not None:
+    ordering.new_search()
+  if pool is not None:
+    pool.new_search()
+  if max_depth is None:
+    max_depth = game_state.grid.empty_cells_count
+
+  best_move = None
+  for depth in range(1, max_depth + 1):
+    # The previous iteration stored its principal variation in the table, so searching
+    # its root move first lets every deeper node start from the best line found so far
+    if best_move is not None:
+      first_position = best_move.position
+    start = time.perf_counter()
+    try:
+      move = find_best_move_alpha_beta(game_state, depth, choose_higher_score, table, deadline if best_move is not None else None, first_position, ordering, pool, stats=stats, stop=stop)
+    except SearchTimeoutError:
+      break
+    if move is None:
+      return None
+    best_move = move
+    if stats is not None:
+      stats.depth_times[depth] = time.perf_counter() - start
+    # logging.info(f'Completed depth {depth}: {get_principal_variation(game_state, table)}')
+    if has_decisive_score(best_move, table) or time.perf_counter() >= deadline:
+      break
+  return best_move
+
+def has_decisive_score(move: Move, table: TranspositionTable) -> bool:
+  """
+  This function checks whether a root move is already known to win or lose, so deeper searches cannot change the result.
+  
+  Parameters:
+  move (Move): The root move to check.
+  table (TranspositionTable): The transposition table filled by the search.
+  
+  Returns:
+  bool: True if the move ends the game or has a stored winning or losing score.
+  """
+  if move.next_state.has_game_ended:
+    return True
+  entry = table.get(move.next_state.canonical_key)
+  return entry is not None and entry.bound is Bound.EXACT and abs(entry.score) >= WIN_SCORE
 
-  # logging.info(f'Chosen move: {chosen_move}')
-  # logging.info('Ending find_best_move_alpha_beta')
-  return chosen_move
+def has_exact_root_score(game_state: GameState, move: Move, table: TranspositionTable) -> bool:
+  """
+  This function checks whether the search of a position found its game-theoretic value, so that no other check can improve on the move.
+  
+  Parameters:
+  game_state (GameState): The position that was searched.
+  move (Move): The root move chosen by the search.
+  table (TranspositionTable): The transposition table filled by the search.
+  
+  Returns:
+  bool: True if the move has a winning or losing score, or if the position was searched to the end of the game.
+  """
+  if has_decisive_score(move, table):
+    return True
+  entry = table.get(game_state.canonical_key)
+  # The root is stored with the number of plies searched from it
+  return entry is not None and entry.bound is Bound.EXACT and entry.depth >= game_state.grid.empty_cells_count
 
-def find_best_move_minimax(game_state: GameState, depth: int, choose_higher_score: bool = True, memo: dict = {}) -> Move:
+def get_principal_variation(game_state: GameState, table: TranspositionTable, max_length: int | None = None) -> list[int]:
+  """
+  This function follows the best moves stored in the transposition table from a game state.
+  
+  Parameters:
+  game_state (GameState): The state to start from.
+  table (TranspositionTable): The transposition table filled by the search.
+  max_length (int | None): The maximum number of moves to return.
+  
+  Returns:
+  list[int]: The positions of the moves along the principal variation.
+  """
+  variation = []
+  board = SearchBoard(game_state)
+  while (max_length is None or len(variation) < max_length) and not board.has_game_ended:
+    _, best_move = probe_table(table, board)
+    if best_move is None or board.is_position_filled(best_move):
+      break
+    variation.append(best_move)
+    board.make_move(best_move)
+  return variation
+
+def find_best_move_minimax(game_state: GameState, depth: int, choose_higher_score: bool = True, table: TranspositionTable | None = None, pool: ParallelSearch | None = None, endgame: EndgameTable | None = None, stats: SearchStats | None = None) -> Move:
   """
   This function uses the Minimax algorithm to find the best move in a game of Tic Tac Toe.
   
@@ -68,229 +265,323 @@ def find_best_move_minimax(game_state: GameState, depth: int, choose_higher_scor
   game_state (GameState): The current state of the game.
   depth (int): The maximum depth to search in the game tree.
   choose_higher_score (bool): If True, the function will choose the move with the highest score. If False, it will choose the move with the lowest score.
-  memo (dict): A dictionary used for memoization to store the results of previously computed states.
+  table (TranspositionTable | None): The transposition table to use. A new table is created for this search if None.
+  pool (ParallelSearch | None): The worker processes to search the root moves in. The search runs in this process if None.
+  endgame (EndgameTable | None): The solved table of the board configuration, if any. When choosing the highest score, positions it holds are answered without searching.
+  stats (SearchStats | None): The counters to fill in with the nodes, table hits and root move times of the search. Only the root move times are counted with a pool.
   
   Returns:
-  Move: The best move found.
+  Move: The best move found, or None if the game has ended. Every cell is searched on an empty board, where `GameState.get_valid_moves` has no moves.
   """
   
   # logging.info('Starting find_best_move_minimax')
   
-  moves = game_state.get_valid_moves
+  if choose_higher_score and (endgame_move := probe_endgame(endgame, game_state)) is not None:
+    return endgame_move
 
+  if table is None:
+    table = TranspositionTable()
+  context = SearchContext(SearchBoard(game_state), game_state.get_current_player_mark, table, stats=stats)
+  board = context.board
+  moves = board.generate_moves()
+  
   if not moves:
     # logging.error('No valid moves available')
     return None
+
+  unique_moves, representatives = group_symmetric_moves(board, moves)
+  if pool is not None:
+    start = time.perf_counter()
+    unique_scores = pool.score_root_moves(game_state, unique_moves, depth, choose_higher_score, "minimax")
+    if stats is not None:
+      elapsed = time.perf_counter() - start
+      for move in unique_moves:
+        stats.record_root_move(move, elapsed)
+  else:
+    unique_scores = []
+    for move in unique_moves:
+      start = time.perf_counter() if stats is not None else 0.0
+      board.make_move(move)
+      unique_scores.append(minimax(context, depth, not choose_higher_score))
+      board.unmake_move()
+      if stats is not None:
+        stats.record_root_move(move, time.perf_counter() - start)
+  scores = [unique_scores[representative] for representative in representatives]
+
+  chosen_position = select_best_move(board, moves, scores, choose_higher_score)
+  
+  # logging.info(f'Chosen move: {chosen_position}')
+  # logging.info('Ending find_best_move_minimax')
+  return game_state.generate_move_to(chosen_position)
+
+def probe_endgame(endgame: EndgameTable | None, game_state: GameState) -> Move | None:
+  """
+  This function looks a game state up in an endgame table.
+  
+  Parameters:
+  endgame (EndgameTable | None): The endgame table to look in.
+  game_state (GameState): The state to look up.
   
-  with ThreadPoolExecutor(max_workers=num_cpus) as executor:
-    scores = list(executor.map(lambda move: minimax(move, game_state.get_current_player_mark, depth, choose_higher_score, memo), moves))
-    # scores = [minimax(move, game_state.get_current_player_mark, depth, choose_higher_score) for move in moves]
+  Returns:
+  Move | None: The solved best move, or None if there is no table or the table does not hold the state.
+  """
+  entry = endgame.lookup(game_state) if endgame is not None else None
+  if entry is None or entry.best_move is None:
+    return None
+  return game_state.generate_move_to(entry.best_move)
 
+def select_best_move(board: SearchBoard, moves: list[int], scores: list[int], choose_higher_score: bool) -> int:
+  """
+  This function picks the move to play among the root moves and their scores.
+  
+  Parameters:
+  board (SearchBoard): The board, in the root position.
+  moves (list[int]): The positions of the root moves that were searched.
+  scores (list[int]): The score of each root move.
+  choose_higher_score (bool): If True, the function will choose the move with the highest score. If False, it will choose the move with the lowest score.
+  
+  Returns:
+  int: The position of the chosen move.
+  """
   # Find the maximum score
   max_score = max(scores) if choose_higher_score else min(scores)
 
   # Find all moves with the maximum score
   best_moves = [move for move, score in zip(moves, scores) if score == max_score]
+  mark = board.current_mark
 
   # Prioritize moves that could lead to a win in the next turn
   for move in best_moves:
-    if move.next_state.get_winner is game_state.get_current_player_mark:
+    board.make_move(move)
+    wins = board.winner is mark
+    board.unmake_move()
+    if wins:
       return move
 
   # If no such move exists, prioritize moves that block the opponent from winning in their next turn
   for move in best_moves:
-    if any(next_move.next_state.get_winner is not game_state.get_current_player_mark for next_move in move.next_state.get_valid_moves):
+    board.make_move(move)
+    blocks = False
+    for next_move in board.generate_moves():
+      board.make_move(next_move)
+      blocks = board.winner is not mark
+      board.unmake_move()
+      if blocks:
+        break
+    board.unmake_move()
+    if blocks:
       return move
 
   # If no such move exists, randomly select one of the best moves
-  chosen_move = random.choice(best_moves)
-  
-  # logging.info(f'Chosen move: {chosen_move}')
-  # logging.info('Ending find_best_move_minimax')
-  return chosen_move
+  return random.choice(best_moves)
 
-def alpha_beta_pruning(move: Move, maximizer: Mark, depth: int = None, alpha: int = -float('inf'), beta: int = float('inf'), choose_higher_score: bool = False, memo: dict = {}) -> int:
+def alpha_beta_pruning(context: SearchContext, depth: int = None, alpha: int = -float('inf'), beta: int = float('inf'), choose_higher_score: bool = False) -> int:
   """
   This function implements the Alpha-Beta pruning algorithm, which is an optimization of the Minimax algorithm.
   
   Parameters:
-  move (Move): The move to evaluate.
-  maximizer (Mark): The player who is maximizing their score.
+  context (SearchContext): The search, with its board in the position after the move to evaluate.
   depth (int): The maximum depth to search in the game tree.
   alpha (int): The best value that the maximizer currently can guarantee at that level or above.
   beta (int): The best value that the minimizer currently can guarantee at that level or above.
   choose_higher_score (bool): If True, the function will choose the move with the highest score. If False, it will choose the move with the lowest score.
-  memo (dict): A dictionary used for memoization to store the results of previously computed states.
   
   Returns:
   int: The score of the move.
-  """  
-  
-  # logging.info(f'Starting alpha_beta_pruning - Move: {move_format} - Depth: {depth} - Choose higher score: {choose_higher_score}')
-  
-  # Convert the game state to a hashable format that can be used as a dictionary key
-  state_key = str(move.next_state)
-  
-  # If the result of this state has been computed before, return the stored result
-  if state_key in memo:
-    return memo[state_key]
-  
+  """
   
-  if move.next_state.has_game_ended or depth == 0:
-    return evaluate_score(move.next_state, maximizer, heuristic=depth is not None)
-
-  max_eval = -float('inf')
-  min_eval = float('inf')
-
-  if choose_higher_score:
-    for child_move in move.next_state.get_valid_moves:
-      eval = alpha_beta_pruning(child_move, maximizer, depth - 1, alpha, beta, not choose_higher_score)
-      max_eval = max(max_eval, eval)
-      alpha = max(alpha, eval)
-      if beta <= alpha:
-        break
+  # logging.info(f'Starting alpha_beta_pruning - Depth: {depth} - Choose higher score: {choose_higher_score}')
+  
+  board = context.board
+  stats = context.stats
+  if stats is not None:
+    stats.nodes += 1
+    if len(board.history) > stats.max_depth:
+      stats.max_depth = len(board.history)
+  if board.has_game_ended or depth == 0:
+    if stats is not None:
+      stats.leaf_evaluations += 1
+    return board.get_score(context.maximizer, heuristic=depth is not None)
+
+  if context.deadline is not None and time.perf_counter() > context.deadline:
+    raise SearchTimeoutError("Error: The search ran out of time.")
+  if context.stop is not None and context.stop.is_set():
+    raise SearchTimeoutError("Error: The search was stopped.")
+
+  # Reuse a previous result if it was searched at least as deep and its bound is usable with the current window
+  entry, table_move = probe_table(context.table, board)
+  if entry is not None and entry.depth >= depth:
+    if stats is not None:
+      stats.table_hits += 1
+    if entry.bound is Bound.EXACT:
+      return entry.score
+    if entry.bound is Bound.LOWER:
+      alpha = max(alpha, entry.score)
+    else:
+      beta = min(beta, entry.score)
+    if beta <= alpha:
+      return entry.score
+
+  original_alpha, original_beta = alpha, beta
+  best_eval = -float('inf') if choose_higher_score else float('inf')
+  best_move = None
+
+  if context.ordering is None:
+    child_moves = order_moves(board.generate_moves(), table_move)
   else:
-    for child_move in move.next_state.get_valid_moves:
-      eval = alpha_beta_pruning(child_move, maximizer, depth - 1, alpha, beta, not choose_higher_score)
-      min_eval = min(min_eval, eval)
+    child_moves = context.ordering.order(board, board.generate_moves(), table_move, context.maximizer, choose_higher_score)
+
+  for index, child_move in enumerate(child_moves):
+    board.make_move(child_move)
+    eval = alpha_beta_pruning(context, depth - 1, alpha, beta, not choose_higher_score)
+    board.unmake_move()
+    if choose_higher_score:
+      if eval > best_eval:
+        best_eval, best_move = eval, child_move
+      alpha = max(alpha, eval)
+    else:
+      if eval < best_eval:
+        best_eval, best_move = eval, child_move
       beta = min(beta, eval)
-      if beta <= alpha:
-        break
-  
-  # logging.info(f'Returning score: {max_eval if choose_higher_score else min_eval}')
+    if beta <= alpha:
+      if context.ordering is not None:
+        context.ordering.record_cutoff(board, child_move, depth)
+      if stats is not None:
+        stats.record_cutoff(index)
+      break
+  
+  # logging.info(f'Returning score: {best_eval}')
   # logging.info('Ending alpha_beta_pruning')
 
-  # Store the result in the memo dictionary before returning it
-  result = max_eval if choose_higher_score else min_eval
-  memo[state_key] = result
-  return result
-
-def minimax(move: Move, maximizer: Mark, depth: int = None, choose_higher_score: bool = False, memo: dict = {}) -> int:
+  # Store the result with the bound it represents before returning it
+  if context.table is not None:
+    if best_eval <= original_alpha:
+      bound = Bound.UPPER
+    elif best_eval >= original_beta:
+      bound = Bound.LOWER
+    else:
+      bound = Bound.EXACT
+    store_in_table(context.table, board, depth, best_eval, bound, best_move)
+  return best_eval
+
+def minimax(context: SearchContext, depth: int = None, choose_higher_score: bool = False) -> int:
   """
   This function implements the Minimax algorithm, which is a decision-making algorithm for finding the best move in a game of Tic Tac Toe.
   
   Parameters:
-  move (Move): The move to evaluate.
-  maximizer (Mark): The player who is maximizing their score.
+  context (SearchContext): The search, with its board in the position after the move to evaluate.
   depth (int): The maximum depth to search in the game tree.
   choose_higher_score (bool): If True, the function will choose the move with the highest score. If False, it will choose the move with the lowest score.
-  memo (dict): A dictionary used for memoization to store the results of previously computed states.
   
   Returns:
   int: The score of the move.
   """
   
-  # logging.info(f'Starting minimax - Move: {move_format} - Depth: {depth} - Choose higher score: {choose_higher_score}')
-  
-  # Convert the game state to a hashable format that can be used as a dictionary key
-  state_key = str(move.next_state)
+  # logging.info(f'Starting minimax - Depth: {depth} - Choose higher score: {choose_higher_score}')
+  
+  board = context.board
+  stats = context.stats
+  if stats is not None:
+    stats.nodes += 1
+    if len(board.history) > stats.max_depth:
+      stats.max_depth = len(board.history)
+  if board.has_game_ended or depth == 0:
+    if stats is not None:
+      stats.leaf_evaluations += 1
+    return board.get_score(context.maximizer, heuristic=depth is not None)
+
+  # Minimax never narrows a window, so every stored score is exact
+  entry, _ = probe_table(context.table, board)
+  if entry is not None and entry.depth >= depth:
+    if stats is not None:
+      stats.table_hits += 1
+    return entry.score
+
+  moves = board.generate_moves()
+  scores = []
+  for next_move in moves:
+    board.make_move(next_move)
+    scores.append(minimax(context, depth - 1, not choose_higher_score))
+    board.unmake_move()
   
-  # If the result of this state has been computed before, return the stored result
-  if state_key in memo:
-    return memo[state_key]
-  
-  if move.next_state.has_game_ended or depth == 0:
-    return evaluate_score(move.next_state, maximizer, heuristic=depth is not None)
-
-  moves = move.next_state.get_valid_moves
-  scores = [minimax(next_move, maximizer, depth - 1, not choose_higher_score) for next_move in moves]
-
   # logging.info(f'Returning score: {max(scores) if choose_higher_score else min(scores)}')
   # logging.info('Ending minimax')
 
-  # Store the result in the memo dictionary before returning it
+  # Store the result in the transposition table before returning it
   result = max(scores) if choose_higher_score else min(scores)
-  memo[state_key] = result
+  store_in_table(context.table, board, depth, result, Bound.EXACT, moves[scores.index(result)])
   return result
 
-
-def evaluate_score(game_state: GameState, maximizer: Mark, heuristic: bool) -> int:
+def probe_table(table: TranspositionTable | None, board: SearchBoard) -> tuple[TranspositionEntry | None, int | None]:
   """
-  This function evaluates the score of a game state.
+  This function looks the position of a board up in the transposition table. Symmetric positions share one entry,
+  stored in the coordinates of their canonical form.
   
   Parameters:
-  game_state (GameState): The state of the game to evaluate.
-  maximizer (Mark): The player who is maximizing their score.
-  heuristic (bool): If True, the function will use a heuristic to estimate the score. If False, it will calculate the exact score.
+  table (TranspositionTable | None): The transposition table to look in.
+  board (SearchBoard): The board in the position to look up.
   
   Returns:
-  int: The score of the game state.
+  tuple[TranspositionEntry | None, int | None]: The entry, if any, and its best move mapped back onto `board`.
   """
-  
-  # logging.info(f'Starting evaluate_score - Move: {game_state.get_move_format_from_index(game_state.last_move_position)}')
-  score = 0
-  if game_state.get_winner is maximizer:
-    score = 1000
-  elif game_state.is_draw:
-    score = 0
-  elif game_state.get_winner is not None:
-    score = -1000
-  elif heuristic:
-    score = heuristic_score(game_state, maximizer)
-  # logging.info(f'Returning score: {score} - Move: {game_state.get_move_format_from_index(game_state.last_move_position)}')
-  # logging.info('Ending evaluate_score')
-  return score
+  entry = table.get(board.canonical_key) if table is not None else None
+  if entry is None or entry.best_move is None:
+    return entry, None
+  return entry, restore_position(board.dimension, entry.best_move, board.canonical_transform)
 
-def heuristic_score(game_state: GameState, maximizer: Mark) -> int:
+def store_in_table(table: TranspositionTable | None, board: SearchBoard, depth: int, score: int, bound: Bound, best_move: int | None) -> None:
   """
-  This function calculates a heuristic score for a game state.
+  This function stores a search result for the position of a board under its canonical key.
   
   Parameters:
-  game_state (GameState): The state of the game to evaluate.
-  maximizer (Mark): The player who is maximizing their score.
-  
-  Returns:
-  int: The heuristic score of the game state.
+  table (TranspositionTable | None): The transposition table to store in.
+  board (SearchBoard): The board in the position that was searched.
+  depth (int): The remaining depth the position was searched to.
+  score (int): The score of the position.
+  bound (Bound): Whether the score is exact, a lower bound or an upper bound.
+  best_move (int | None): The position of the best move on `board`, if any.
   """
-  max_score = 0
-  min_score = 0
-  potential_moves_score = 0
-  required_mark = game_state.required_marks_for_win
-
-  for sequence in game_state.generate_sequences:
-    max_score += evaluate_line(sequence, maximizer, required_mark)
-    min_score += evaluate_line(sequence, maximizer.other, required_mark)
-    # potential_moves_score += evaluate_potential_moves(sequence, maximizer)
+  if table is None:
+    return
+  if best_move is not None:
+    best_move = transform_position(board.dimension, best_move, board.canonical_transform)
+  table.store(board.canonical_key, depth, score, bound, best_move)
 
-  return max_score - min_score + potential_moves_score
-
-def evaluate_potential_moves(line: str, maximizer: Mark) -> int:
+def group_symmetric_moves(board: SearchBoard, moves: list[int]) -> tuple[list[int], list[int]]:
   """
-  This function evaluates the potential moves in a line of the game grid.
+  This function groups moves that lead to symmetric positions.
   
   Parameters:
-  line (str): The line of the game grid to evaluate.
-  maximizer (Mark): The player who is maximizing their score.
+  board (SearchBoard): The board in the position the moves are played from.
+  moves (list[int]): The positions of the moves to group.
   
   Returns:
-  int: The score of the potential moves.
+  tuple[list[int], list[int]]: The first move of each group, and for every move the index of its group's move in that list.
   """
-  
-  score = 0
-  for i in range(len(line)):
-    # If the cell is empty and is adjacent to a cell of the player, add 1 to the score
-    if line[i] == Mark.EMPTY.value and (i > 0 and line[i-1] == maximizer or i < len(line) - 1 and line[i+1] == maximizer):
-      score += 1
-  return score
-
-def evaluate_line(line: str, maximizer: Mark, required_mark: int) -> int:
+  unique_moves = []
+  representatives = []
+  groups: dict[int, int] = {}
+  for move in moves:
+    board.make_move(move)
+    key = board.canonical_key
+    board.unmake_move()
+    if key not in groups:
+      groups[key] = len(unique_moves)
+      unique_moves.append(move)
+    representatives.append(groups[key])
+  return unique_moves, representatives
+
+def order_moves(moves: list[int], first_position: int | None) -> list[int]:
   """
-  This function evaluates a line of the game grid.
+  This function moves `first_position`, usually the best move stored in the transposition table, to the front.
   
   Parameters:
-  line (str): The line of the game grid to evaluate.
-  maximizer (Mark): The player who is maximizing their score.
-  required_mark (int): The number of marks required for a win.
+  moves (list[int]): The positions of the moves to order.
+  first_position (int | None): The position of the move to search first.
   
   Returns:
-  int: The score of the line.
-  """
-  minimizer = maximizer.other
-  segments = line.split(minimizer)
-  max_score = 0
-  for i, segment in enumerate(segments):
-    # Skip dead segments and empty segments
-    if segment == "" or (i > 0 and i < len(segments) - 1 and len(segment) < required_mark):
-      continue
-    max_score = max(max_score, segment.count(maximizer))
-  return max_score
+  list[int]: The ordered positions.
+  """
+  if first_position is None:
+    return moves
+  return sorted(moves, key=lambda move: move != first_position)
@@ -0,0 +1,129 @@
+# tic_tac_toe/logic/batch.py
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, NamedTuple, Sequence
+
+from tic_tac_toe.logic.entities import Mark
+from tic_tac_toe.logic.evaluation import WIN_SCORE
+from tic_tac_toe.logic.models import GameState
+
+try:
+  import numpy as np
+except ImportError:
+  np = None
+
+if TYPE_CHECKING:
+  from numpy.typing import NDArray
+
+# The values of the cells in a batch of boards
+EMPTY_VALUE = 0
+CROSS_VALUE = 1
+NAUGHT_VALUE = -1
+
+class BatchEvaluation(NamedTuple):
+  """
+  The evaluation of a batch of boards, one entry per board.
+
+  Attributes:
+  winners (NDArray): `CROSS_VALUE` or `NAUGHT_VALUE` for the boards holding a winning window, else `EMPTY_VALUE`.
+  draws (NDArray): True for the full boards without a winner.
+  scores (NDArray): The score of each board for the maximizer, the same as `evaluate_score` with the heuristic.
+  """
+  winners: NDArray
+  draws: NDArray
+  scores: NDArray
+
+def require_numpy() -> None:
+  if np is None:
+    raise ImportError("Error: NumPy is not installed. The batch evaluation needs it: pip install tic-tac-toe[batch]")
+
+def encode_boards(game_states: Sequence[GameState]) -> NDArray:
+  """
+  Converts game states of the same dimension into a batch of boards.
+
+  Parameters:
+  game_states (Sequence[GameState]): The states to convert.
+
+  Returns:
+  NDArray: An `(N, dimension, dimension)` int8 array of `EMPTY_VALUE`, `CROSS_VALUE` and `NAUGHT_VALUE` cells.
+  """
+  require_numpy()
+  dimension = game_states[0].grid.dimension if game_states else 0
+  characters = np.frombuffer("".join(game_state.grid.cells for game_state in game_states).encode(), dtype=np.uint8)
+  boards = np.where(characters == ord(Mark.CROSS.value), CROSS_VALUE, np.where(characters == ord(Mark.NAUGHT.value), NAUGHT_VALUE, EMPTY_VALUE))
+  return boards.astype(np.int8).reshape(len(game_states), dimension, dimension)
+
+def get_window_sums(planes: NDArray, required_marks_for_win: int) -> NDArray:
+  """
+  Sums a batch of boards over every winning window, in the four directions.
+
+  Parameters:
+  planes (NDArray): An `(N, dimension, dimension)` array.
+  required_marks_for_win (int): The length of the windows.
+
+  Returns:
+  NDArray: An `(N, windows)` array holding the sum of each window: the rows, then the columns, then both diagonals.
+  """
+  count, dimension, _ = planes.shape
+  span = dimension - required_marks_for_win + 1
+  if span <= 0:
+    return np.zeros((count, 0), dtype=np.int16)
+  planes = planes.astype(np.int16, copy=False)
+  # Each window is the sum of `required_marks_for_win` shifted slices, one per cell of the window
+  rows = sum(planes[:, :, offset:offset + span] for offset in range(required_marks_for_win))
+  columns = sum(planes[:, offset:offset + span, :] for offset in range(required_marks_for_win))
+  diagonals = sum(planes[:, offset:offset + span, offset:offset + span] for offset in range(required_marks_for_win))
+  anti_diagonals = sum(
+    planes[:, offset:offset + span, required_marks_for_win - 1 - offset:required_marks_for_win - 1 - offset + span]
+    for offset in range(required_marks_for_win)
+  )
+  return np.concatenate([sums.reshape(count, -1) for sums in (rows, columns, diagonals, anti_diagonals)], axis=1)
+
+def evaluate_boards(boards: NDArray, required_marks_for_win: int, maximizer: Mark = Mark.CROSS) -> BatchEvaluation:
+  """
+  Evaluates a batch of boards at once, with array operations instead of one `GameState` per board.
+
+  Parameters:
+  boards (NDArray): An `(N, dimension, dimension)` array of `EMPTY_VALUE`, `CROSS_VALUE` and `NAUGHT_VALUE` cells, from valid games.
+  required_marks_for_win (int): The number of marks in a row required to win.
+  maximizer (Mark): The player who is maximizing their score.
+
+  Returns:
+  BatchEvaluation: The winner, draw flag and score of each board.
+  """
+  require_numpy()
+  boards = np.asarray(boards)
+  if boards.ndim != 3 or boards.shape[1] != boards.shape[2]:
+    raise ValueError("Error: Invalid boards. The boards must be an (N, dimension, dimension) array.")
+  crosses = get_window_sums(boards == CROSS_VALUE, required_marks_for_win)
+  naughts = get_window_sums(boards == NAUGHT_VALUE, required_marks_for_win)
+
+  cross_wins = (crosses == required_marks_for_win).any(axis=1)
+  naught_wins = (naughts == required_marks_for_win).any(axis=1)
+  winners = np.where(cross_wins, CROSS_VALUE, np.where(naught_wins, NAUGHT_VALUE, EMPTY_VALUE)).astype(np.int8)
+  full = (boards != EMPTY_VALUE).all(axis=(1, 2))
+  draws = full & (winners == EMPTY_VALUE)
+
+  # A window holding marks of only one player is worth the square of its mark count to that player
+  balance = (np.where(naughts == 0, crosses * crosses, 0) - np.where(crosses == 0, naughts * naughts, 0)).sum(axis=1, dtype=np.int64)
+  if maximizer is Mark.NAUGHT:
+    balance = -balance
+  scores = np.clip(balance, -WIN_SCORE + 1, WIN_SCORE - 1)
+  maximizer_value = CROSS_VALUE if maximizer is Mark.CROSS else NAUGHT_VALUE
+  scores = np.where(winners == maximizer_value, WIN_SCORE, np.where(winners != EMPTY_VALUE, -WIN_SCORE, np.where(draws, 0, scores)))
+  return BatchEvaluation(winners, draws, scores)
+
+def evaluate_game_states(game_states: Sequence[GameState], maximizer: Mark = Mark.CROSS) -> BatchEvaluation:
+  """
+  Evaluates game states of the same configuration at once.
+
+  Parameters:
+  game_states (Sequence[GameState]): The states to evaluate.
+  maximizer (Mark): The player who is maximizing their score.
+
+  Returns:
+  BatchEvaluation: The winner, draw flag and score of each state.
+  """
+  required_marks_for_win = game_states[0].required_marks_for_win if game_states else 1
+  return evaluate_boards(encode_boards(game_states), required_marks_for_win, maximizer)
@@ -0,0 +1,124 @@
+# tic_tac_toe/logic/board.py
+
+from __future__ import annotations
+
+from tic_tac_toe.logic.entities import Mark
+from tic_tac_toe.logic.evaluation import WIN_SCORE, WindowEvaluator
+from tic_tac_toe.logic.models import BitboardGrid, GameState, get_bit_positions, get_neighboring_bits
+from tic_tac_toe.logic.transposition import get_symmetric_move_keys
+
+class SearchBoard:
+  """
+  A mutable board used inside searches. Moves are made and unmade in place, without the validation
+  and the copies that building a `GameState` per node costs. Only positions reached through `make_move`
+  from a valid `GameState` are meaningful, so no move is checked.
+
+  Attributes:
+  dimension (int): The dimension of the board.
+  required_marks_for_win (int): The number of marks in a row required to win.
+  line_table (LineTable): The windows of the board.
+  cross_bits (int): The bitmask of the cells holding a cross.
+  naught_bits (int): The bitmask of the cells holding a naught.
+  current_mark (Mark): The mark of the player to move.
+  winner (Mark | None): The mark of the winner, if the game is won.
+  empty_cells_count (int): The number of empty cells.
+  zobrist_keys (tuple[int, ...]): The Zobrist keys of the position under each of the 8 board symmetries.
+  evaluator (WindowEvaluator): The window counters of the position.
+  """
+
+  def __init__(self, game_state: GameState) -> None:
+    grid = game_state.grid if isinstance(game_state.grid, BitboardGrid) else BitboardGrid(game_state.grid.dimension, game_state.grid.cells)
+    self.dimension = grid.dimension
+    self.required_marks_for_win = game_state.required_marks_for_win
+    self.line_table = game_state.line_table
+    self.cross_bits = grid.cross_bits
+    self.naught_bits = grid.naught_bits
+    self.current_mark = game_state.get_current_player_mark
+    self.winner = game_state.get_winner
+    self.empty_cells_count = grid.empty_cells_count
+    self.zobrist_keys = game_state.zobrist_keys
+    self.evaluator = WindowEvaluator.from_game_state(game_state)
+    self.cross_move_keys = get_symmetric_move_keys(self.dimension, Mark.CROSS)
+    self.naught_move_keys = get_symmetric_move_keys(self.dimension, Mark.NAUGHT)
+    # The position, Zobrist keys and winner before each move made, to restore them on unmake
+    self.history: list[tuple[int, tuple[int, ...], Mark | None]] = []
+
+  @property
+  def has_game_ended(self) -> bool:
+    return self.winner is not None or self.empty_cells_count == 0
+
+  @property
+  def ply(self) -> int:
+    return self.dimension ** 2 - self.empty_cells_count
+
+  @property
+  def canonical_key(self) -> int:
+    return min(self.zobrist_keys)
+
+  @property
+  def canonical_transform(self) -> int:
+    return self.zobrist_keys.index(min(self.zobrist_keys))
+
+  def is_position_filled(self, index: int) -> bool:
+    return ((self.cross_bits | self.naught_bits) >> index) & 1 == 1
+
+  def generate_moves(self) -> list[int]:
+    """
+    Returns the empty cells next to a mark, in ascending order, every cell on an empty board, or no
+    cells if the game has ended.
+    """
+    if self.has_game_ended:
+      return []
+    occupied = self.cross_bits | self.naught_bits
+    if not occupied:
+      return list(range(self.dimension ** 2))
+    return get_bit_positions(get_neighboring_bits(self.dimension, occupied))
+
+  def make_move(self, position: int) -> None:
+    mark = self.current_mark
+    bit = 1 << position
+    if mark is Mark.CROSS:
+      self.cross_bits |= bit
+      bits, move_keys, self.current_mark = self.cross_bits, self.cross_move_keys[position], Mark.NAUGHT
+    else:
+      self.naught_bits |= bit
+      bits, move_keys, self.current_mark = self.naught_bits, self.naught_move_keys[position], Mark.CROSS
+    self.history.append((position, self.zobrist_keys, self.winner))
+    self.zobrist_keys = tuple(key ^ move_key for key, move_key in zip(self.zobrist_keys, move_keys))
+    self.empty_cells_count -= 1
+    self.evaluator.place(position, mark)
+    if self.winner is None:
+      # Only the windows through the new mark can have been completed
+      window_masks = self.line_table.window_masks
+      for window in self.line_table.cell_windows[position]:
+        if bits & window_masks[window] == window_masks[window]:
+          self.winner = mark
+          break
+
+  def unmake_move(self) -> None:
+    position, self.zobrist_keys, self.winner = self.history.pop()
+    mark = Mark.NAUGHT if self.current_mark is Mark.CROSS else Mark.CROSS
+    if mark is Mark.CROSS:
+      self.cross_bits &= ~(1 << position)
+    else:
+      self.naught_bits &= ~(1 << position)
+    self.current_mark = mark
+    self.empty_cells_count += 1
+    self.evaluator.remove(position, mark)
+
+  def get_score(self, maximizer: Mark, heuristic: bool) -> int:
+    """
+    Scores the position the same way `evaluate_score` scores a game state.
+
+    Parameters:
+    maximizer (Mark): The player who is maximizing their score.
+    heuristic (bool): If True, positions without a result are scored by the window heuristic. Otherwise they score 0.
+
+    Returns:
+    int: The score of the position.
+    """
+    if self.winner is not None:
+      return WIN_SCORE if self.winner is maximizer else -WIN_SCORE
+    if self.empty_cells_count == 0 or not heuristic:
+      return 0
+    return self.evaluator.get_score(maximizer)
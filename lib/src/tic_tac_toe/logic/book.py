@@ -0,0 +1,172 @@
+# tic_tac_toe/logic/book.py
+
+from __future__ import annotations
+
+from functools import lru_cache
+from hashlib import blake2b
+
+import argparse
+import os
+import struct
+import sys
+
+from tic_tac_toe.logic.algorithms import find_best_move_alpha_beta
+from tic_tac_toe.logic.entities import Mark
+from tic_tac_toe.logic.models import BitboardGrid, GameState, Move
+from tic_tac_toe.logic.ordering import KillerHistoryOrdering
+from tic_tac_toe.logic.symmetry import get_inverse_transforms, get_state_index, get_transforms
+from tic_tac_toe.logic.transposition import TranspositionTable
+
+# (dimension, required marks for win) of the configurations the console offers most often
+BOOK_CONFIGURATIONS = ((3, 3), (4, 3), (4, 4), (5, 4), (6, 4), (7, 4))
+
+BOOK_MAGIC = b"TTTB"
+BOOK_VERSION = 1
+# Magic, version, dimension, required marks for win, number of entries
+BOOK_HEADER = struct.Struct("<4sBBBI")
+# Position key, best move in the coordinates of the canonical position
+BOOK_ENTRY = struct.Struct("<QH")
+
+def get_book_key(game_state: GameState) -> tuple[int, int]:
+  """
+  Computes the book key of a game state: an 8-byte hash of its canonical base-3 index, so that
+  symmetric positions and positions with the marks swapped share one entry.
+
+  Parameters:
+  game_state (GameState): The state to compute the key of.
+
+  Returns:
+  tuple[int, int]: The key, and the transform that maps the position onto its canonical form.
+  """
+  index, transform = get_state_index(game_state)
+  digest = blake2b(index.to_bytes((index.bit_length() + 7) // 8 or 1, "little"), digest_size=8).digest()
+  return int.from_bytes(digest, "little"), transform
+
+def build_opening_book(dimension: int, required_marks_for_win: int, plies: int, depth: int) -> dict[int, int]:
+  """
+  Searches every position of the first plies of a configuration and collects the best moves.
+
+  Parameters:
+  dimension (int): The dimension of the board.
+  required_marks_for_win (int): The number of marks in a row required to win.
+  plies (int): The number of marks on the deepest positions in the book.
+  depth (int): The depth each position is searched to.
+
+  Returns:
+  dict[int, int]: The best move of each position, in the coordinates of its canonical form, by book key.
+  """
+  entries: dict[int, int] = {}
+  # Scores are relative to the player to move, so each mark needs its own table
+  tables = {Mark.CROSS: TranspositionTable(), Mark.NAUGHT: TranspositionTable()}
+  ordering = KillerHistoryOrdering()
+
+  frontier = [GameState(BitboardGrid(dimension), Mark.CROSS, required_marks_for_win)]
+  for _ in range(plies + 1):
+    next_frontier = []
+    for game_state in frontier:
+      key, transform = get_book_key(game_state)
+      if key in entries or game_state.has_game_ended:
+        continue
+      ordering.new_search()
+      move = find_best_move_alpha_beta(game_state, depth, table=tables[game_state.get_current_player_mark], ordering=ordering)
+      entries[key] = get_transforms(dimension)[transform][move.position]
+      # The first mark may be placed on any cell, the following ones next to a mark
+      moves = game_state.get_valid_moves if game_state.has_game_started else [game_state.generate_move_to(position) for position in range(dimension ** 2)]
+      next_frontier += [move.next_state for move in moves]
+    frontier = next_frontier
+  return entries
+
+def get_book_filename(dimension: int, required_marks_for_win: int) -> str:
+  return f"book_{dimension}x{dimension}_{required_marks_for_win}.bin"
+
+def write_opening_book(path: str, dimension: int, required_marks_for_win: int, entries: dict[int, int]) -> None:
+  # Sorted by key, so that rebuilding a book with the same moves writes the same file
+  temporary_path = f"{path}.tmp"
+  with open(temporary_path, "wb") as file:
+    file.write(BOOK_HEADER.pack(BOOK_MAGIC, BOOK_VERSION, dimension, required_marks_for_win, len(entries)))
+    for key in sorted(entries):
+      file.write(BOOK_ENTRY.pack(key, entries[key]))
+  os.replace(temporary_path, path)
+
+class OpeningBook:
+  """
+  The best moves of the first plies of a board configuration, searched offline.
+
+  Attributes:
+  dimension (int): The dimension of the board the book was built for.
+  required_marks_for_win (int): The number of marks in a row required to win the book was built for.
+  entries (dict[int, int]): The best move of each position, in the coordinates of its canonical form, by book key.
+  """
+
+  def __init__(self, path: str) -> None:
+    with open(path, "rb") as file:
+      data = file.read()
+    if len(data) < BOOK_HEADER.size:
+      raise ValueError(f"Error: Invalid opening book. The file {path} is not an opening book of this version.")
+    magic, version, self.dimension, self.required_marks_for_win, count = BOOK_HEADER.unpack_from(data)
+    if magic != BOOK_MAGIC or version != BOOK_VERSION or len(data) != BOOK_HEADER.size + count * BOOK_ENTRY.size:
+      raise ValueError(f"Error: Invalid opening book. The file {path} is not an opening book of this version.")
+    self.entries = dict(BOOK_ENTRY.iter_unpack(data[BOOK_HEADER.size:]))
+
+  def __len__(self) -> int:
+    return len(self.entries)
+
+  def lookup(self, game_state: GameState) -> Move | None:
+    """
+    Looks the book move of a game state up.
+
+    Parameters:
+    game_state (GameState): The state to look up.
+
+    Returns:
+    Move | None: The book move, or None if the book does not hold the state.
+    """
+    if game_state.grid.dimension != self.dimension or game_state.required_marks_for_win != self.required_marks_for_win:
+      return None
+    key, transform = get_book_key(game_state)
+    position = self.entries.get(key)
+    if position is None:
+      return None
+    return game_state.generate_move_to(get_inverse_transforms(self.dimension)[transform][position])
+
+@lru_cache(maxsize=None)
+def open_opening_book(directory: str, dimension: int, required_marks_for_win: int) -> OpeningBook | None:
+  """
+  Opens the opening book of a configuration from a directory, once per process.
+
+  Parameters:
+  directory (str): The directory the books were written to.
+  dimension (int): The dimension of the board.
+  required_marks_for_win (int): The number of marks in a row required to win.
+
+  Returns:
+  OpeningBook | None: The book, or None if the directory holds no book for the configuration.
+  """
+  path = os.path.join(directory, get_book_filename(dimension, required_marks_for_win))
+  return OpeningBook(path) if os.path.exists(path) else None
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description="Build the opening books of the common board configurations.")
+  parser.add_argument("directory", help="The directory to write the books to.")
+  parser.add_argument(
+    "--configuration",
+    dest="configurations",
+    action="append",
+    choices=[f"{dimension}x{required_marks_for_win}" for dimension, required_marks_for_win in BOOK_CONFIGURATIONS],
+    help="A configuration to build, as DIMENSIONxREQUIRED. Defaults to all of them.",
+  )
+  parser.add_argument("--plies", type=int, default=2, help="The number of marks on the deepest positions in the book.")
+  parser.add_argument("--depth", type=int, default=4, help="The depth each position is searched to.")
+  args = parser.parse_args()
+
+  os.makedirs(args.directory, exist_ok=True)
+  configurations = [tuple(map(int, configuration.split("x"))) for configuration in args.configurations] if args.configurations else BOOK_CONFIGURATIONS
+  for dimension, required_marks_for_win in configurations:
+    path = os.path.join(args.directory, get_book_filename(dimension, required_marks_for_win))
+    print(f"Searching the first {args.plies} plies of {dimension}x{dimension} with {required_marks_for_win} marks in a row...", file=sys.stderr)
+    entries = build_opening_book(dimension, required_marks_for_win, args.plies, args.depth)
+    write_opening_book(path, dimension, required_marks_for_win, entries)
+    print(f"Wrote {len(entries)} positions to {path}", file=sys.stderr)
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,207 @@
+# tic_tac_toe/logic/endgame.py
+
+from __future__ import annotations
+
+from enum import IntEnum
+from functools import lru_cache
+from typing import NamedTuple
+
+import argparse
+import mmap
+import os
+import struct
+import sys
+
+from tic_tac_toe.logic.lines import get_line_table
+from tic_tac_toe.logic.models import GameState, get_neighboring_bits
+from tic_tac_toe.logic.symmetry import get_index_weights, get_inverse_transforms, get_state_index, get_transforms
+
+# (dimension, required marks for win) small enough to be solved completely
+ENDGAME_CONFIGURATIONS = ((3, 3), (4, 3), (4, 4))
+
+ENDGAME_MAGIC = b"TTTE"
+ENDGAME_VERSION = 1
+# Magic, version, dimension, required marks for win
+ENDGAME_HEADER = struct.Struct("<4sBBB")
+
+# Scores used while solving: a win in `n` plies scores `WIN_DISTANCE - n`, so faster wins score higher
+WIN_DISTANCE = 100
+
+class Outcome(IntEnum):
+  """
+  The result of a position with perfect play, from the point of view of the player to move.
+  """
+  UNKNOWN = 0
+  WIN = 1
+  LOSS = 2
+  DRAW = 3
+
+class EndgameEntry(NamedTuple):
+  outcome: Outcome
+  best_move: int | None
+
+def encode_entry(outcome: Outcome, best_move: int | None) -> int:
+  return outcome | (best_move + 1 if best_move is not None else 0) << 2
+
+def decode_entry(value: int) -> EndgameEntry:
+  best_move = (value >> 2) - 1
+  return EndgameEntry(Outcome(value & 0b11), best_move if best_move >= 0 else None)
+
+def solve_endgame(dimension: int, required_marks_for_win: int) -> bytearray:
+  """
+  Solves every position reachable from the empty board and returns the table entries.
+
+  Positions are solved by a depth-first negamax from the empty board, memoized by the index of their
+  canonical form, so that a position and its symmetric images are solved once. Wins are taken by the
+  shortest line and losses delayed by the longest one.
+
+  Parameters:
+  dimension (int): The dimension of the board.
+  required_marks_for_win (int): The number of marks in a row required to win.
+
+  Returns:
+  bytearray: One byte per base-3 index, holding the outcome and the best move of the position.
+  """
+  if (dimension, required_marks_for_win) not in ENDGAME_CONFIGURATIONS:
+    raise ValueError(f"Error: Unsupported configuration. Endgame tables can only be built for: {ENDGAME_CONFIGURATIONS}.")
+
+  line_table = get_line_table(dimension, required_marks_for_win)
+  cell_windows, window_masks = line_table.cell_windows, line_table.window_masks
+  transforms = get_transforms(dimension)
+  weights = get_index_weights(dimension)
+  full_mask = (1 << dimension ** 2) - 1
+  entries = bytearray(3 ** (dimension ** 2))
+  scores: dict[int, int] = {}
+
+  # The 8 symmetric indexes are kept for both labelings of the marks, so that the index of a
+  # position with either player to move is a single `min` away
+  def solve(mover_bits: int, other_bits: int, mover_indexes: tuple[int, ...], other_indexes: tuple[int, ...]) -> int:
+    index = min(mover_indexes)
+    score = scores.get(index)
+    if score is not None:
+      return score
+
+    occupied = mover_bits | other_bits
+    moves = get_neighboring_bits(dimension, occupied) if occupied else full_mask
+    best_score, best_move = -WIN_DISTANCE - 1, None
+    while moves:
+      bit = moves & -moves
+      moves ^= bit
+      position = bit.bit_length() - 1
+      next_bits = mover_bits | bit
+      if any(next_bits & window_masks[window] == window_masks[window] for window in cell_windows[position]):
+        score = WIN_DISTANCE - 1
+      elif occupied | bit == full_mask:
+        score = 0
+      else:
+        # The player to move changes, so the mark placed now is a 2 from the next player's point of view
+        next_mover_indexes = tuple(index + 2 * weight[position] for index, weight in zip(other_indexes, weights))
+        next_other_indexes = tuple(index + weight[position] for index, weight in zip(mover_indexes, weights))
+        score = -solve(other_bits, next_bits, next_mover_indexes, next_other_indexes)
+        score = score - 1 if score > 0 else score + 1 if score < 0 else 0
+      if score > best_score:
+        best_score, best_move = score, position
+
+    transform = mover_indexes.index(index)
+    outcome = Outcome.WIN if best_score > 0 else Outcome.LOSS if best_score < 0 else Outcome.DRAW
+    entries[index] = encode_entry(outcome, transforms[transform][best_move])
+    scores[index] = best_score
+    return best_score
+
+  solve(0, 0, (0,) * len(transforms), (0,) * len(transforms))
+  return entries
+
+def get_endgame_filename(dimension: int, required_marks_for_win: int) -> str:
+  return f"endgame_{dimension}x{dimension}_{required_marks_for_win}.bin"
+
+def write_endgame_table(path: str, dimension: int, required_marks_for_win: int) -> None:
+  entries = solve_endgame(dimension, required_marks_for_win)
+  # Written next to the target and renamed, so that readers never map a partial file
+  temporary_path = f"{path}.tmp"
+  with open(temporary_path, "wb") as file:
+    file.write(ENDGAME_HEADER.pack(ENDGAME_MAGIC, ENDGAME_VERSION, dimension, required_marks_for_win))
+    file.write(entries)
+  os.replace(temporary_path, path)
+
+class EndgameTable:
+  """
+  A read-only, memory-mapped endgame table. The operating system shares the pages of the file
+  between all the processes that open it, and only reads the pages that lookups touch.
+
+  Attributes:
+  path (str): The path of the table file.
+  dimension (int): The dimension of the board the table was built for.
+  required_marks_for_win (int): The number of marks in a row required to win the table was built for.
+  """
+
+  def __init__(self, path: str) -> None:
+    self.path = path
+    with open(path, "rb") as file:
+      # Empty files cannot be mapped, and shorter ones have no header to check
+      if os.fstat(file.fileno()).st_size < ENDGAME_HEADER.size:
+        raise ValueError(f"Error: Invalid endgame table. The file {path} is not an endgame table of this version.")
+      self.data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, version, self.dimension, self.required_marks_for_win = ENDGAME_HEADER.unpack_from(self.data)
+    if magic != ENDGAME_MAGIC or version != ENDGAME_VERSION or len(self.data) != ENDGAME_HEADER.size + 3 ** (self.dimension ** 2):
+      self.data.close()
+      raise ValueError(f"Error: Invalid endgame table. The file {path} is not an endgame table of this version.")
+
+  def lookup(self, game_state: GameState) -> EndgameEntry | None:
+    """
+    Looks the solved result of a game state up.
+
+    Parameters:
+    game_state (GameState): The state to look up.
+
+    Returns:
+    EndgameEntry | None: The outcome and the best move on the board of `game_state`, or None if the table holds no entry for it.
+    """
+    if game_state.grid.dimension != self.dimension or game_state.required_marks_for_win != self.required_marks_for_win:
+      return None
+    index, transform = get_state_index(game_state)
+    entry = decode_entry(self.data[ENDGAME_HEADER.size + index])
+    if entry.outcome is Outcome.UNKNOWN:
+      return None
+    return EndgameEntry(entry.outcome, get_inverse_transforms(self.dimension)[transform][entry.best_move])
+
+  def close(self) -> None:
+    self.data.close()
+
+@lru_cache(maxsize=None)
+def open_endgame_table(directory: str, dimension: int, required_marks_for_win: int) -> EndgameTable | None:
+  """
+  Opens the endgame table of a configuration from a directory, once per process.
+
+  Parameters:
+  directory (str): The directory the tables were written to.
+  dimension (int): The dimension of the board.
+  required_marks_for_win (int): The number of marks in a row required to win.
+
+  Returns:
+  EndgameTable | None: The table, or None if the directory holds no table for the configuration.
+  """
+  path = os.path.join(directory, get_endgame_filename(dimension, required_marks_for_win))
+  return EndgameTable(path) if os.path.exists(path) else None
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description="Build the endgame tables of the small board configurations.")
+  parser.add_argument("directory", help="The directory to write the tables to.")
+  parser.add_argument(
+    "--configuration",
+    dest="configurations",
+    action="append",
+    choices=[f"{dimension}x{required_marks_for_win}" for dimension, required_marks_for_win in ENDGAME_CONFIGURATIONS],
+    help="A configuration to build, as DIMENSIONxREQUIRED. Defaults to all of them.",
+  )
+  args = parser.parse_args()
+
+  os.makedirs(args.directory, exist_ok=True)
+  configurations = [tuple(map(int, configuration.split("x"))) for configuration in args.configurations] if args.configurations else ENDGAME_CONFIGURATIONS
+  for dimension, required_marks_for_win in configurations:
+    path = os.path.join(args.directory, get_endgame_filename(dimension, required_marks_for_win))
+    print(f"Solving {dimension}x{dimension} with {required_marks_for_win} marks in a row...", file=sys.stderr)
+    write_endgame_table(path, dimension, required_marks_for_win)
+    print(f"Wrote {path}", file=sys.stderr)
+
+if __name__ == "__main__":
+  main()
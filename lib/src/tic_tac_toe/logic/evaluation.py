@@ -0,0 +1,109 @@
+# tic_tac_toe/logic/evaluation.py
+
+from __future__ import annotations
+
+from tic_tac_toe.logic.entities import Mark
+from tic_tac_toe.logic.lines import LineTable
+from tic_tac_toe.logic.models import GameState
+
+WIN_SCORE = 1000
+
+class WindowEvaluator:
+  """
+  Keeps the number of crosses and naughts in every winning window of a board, so that the heuristic
+  score can be updated when a mark is placed or removed instead of being recomputed from the whole board.
+
+  A window holding marks of only one player is worth the square of its mark count to that player.
+  Windows holding marks of both players can no longer be completed and are worth nothing. This score
+  replaced the longest open segment of each line, which a mark can change far from where it is placed,
+  so it cannot be kept up to date from counters.
+
+  Attributes:
+  line_table (LineTable): The windows of the board.
+  cross_counts (list[int]): The number of crosses in each window.
+  naught_counts (list[int]): The number of naughts in each window.
+  balance (int): The sum of the window values from the point of view of the crosses.
+  """
+
+  def __init__(self, line_table: LineTable) -> None:
+    self.line_table = line_table
+    self.weights = tuple(count * count for count in range(line_table.required_marks_for_win + 1))
+    self.cross_counts = [0] * len(line_table.windows)
+    self.naught_counts = [0] * len(line_table.windows)
+    self.balance = 0
+
+  @classmethod
+  def from_game_state(cls, game_state: GameState) -> WindowEvaluator:
+    evaluator = cls(game_state.line_table)
+    for position in game_state.grid.filled_positions:
+      evaluator.place(position, Mark(game_state.grid.cells[position]))
+    return evaluator
+
+  def place(self, position: int, mark: Mark) -> None:
+    weights = self.weights
+    own_counts, other_counts = (self.cross_counts, self.naught_counts) if mark is Mark.CROSS else (self.naught_counts, self.cross_counts)
+    change = 0
+    for window in self.line_table.cell_windows[position]:
+      own, other = own_counts[window], other_counts[window]
+      if other == 0:
+        change += weights[own + 1] - weights[own]
+      elif own == 0:
+        # The window was the other player's and is now blocked
+        change += weights[other]
+      own_counts[window] = own + 1
+    self.balance += change if mark is Mark.CROSS else -change
+
+  def remove(self, position: int, mark: Mark) -> None:
+    weights = self.weights
+    own_counts, other_counts = (self.cross_counts, self.naught_counts) if mark is Mark.CROSS else (self.naught_counts, self.cross_counts)
+    change = 0
+    for window in self.line_table.cell_windows[position]:
+      own, other = own_counts[window] - 1, other_counts[window]
+      if other == 0:
+        change += weights[own + 1] - weights[own]
+      elif own == 0:
+        change += weights[other]
+      own_counts[window] = own
+    self.balance -= change if mark is Mark.CROSS else -change
+
+  def get_score(self, maximizer: Mark) -> int:
+    score = self.balance if maximizer is Mark.CROSS else -self.balance
+    # A heuristic score must never look like a decided game
+    return max(-WIN_SCORE + 1, min(WIN_SCORE - 1, score))
+
+def evaluate_score(game_state: GameState, maximizer: Mark, heuristic: bool) -> int:
+  """
+  This function evaluates the score of a game state.
+  
+  Parameters:
+  game_state (GameState): The state of the game to evaluate.
+  maximizer (Mark): The player who is maximizing their score.
+  heuristic (bool): If True, the function will use a heuristic to estimate the score. If False, it will calculate the exact score.
+  
+  Returns:
+  int: The score of the game state.
+  """
+  
+  score = 0
+  if game_state.get_winner is maximizer:
+    score = WIN_SCORE
+  elif game_state.is_draw:
+    score = 0
+  elif game_state.get_winner is not None:
+    score = -WIN_SCORE
+  elif heuristic:
+    score = heuristic_score(game_state, maximizer)
+  return score
+
+def heuristic_score(game_state: GameState, maximizer: Mark) -> int:
+  """
+  This function calculates a heuristic score for a game state from scratch.
+  
+  Parameters:
+  game_state (GameState): The state of the game to evaluate.
+  maximizer (Mark): The player who is maximizing their score.
+  
+  Returns:
+  int: The heuristic score of the game state.
+  """
+  return WindowEvaluator.from_game_state(game_state).get_score(maximizer)
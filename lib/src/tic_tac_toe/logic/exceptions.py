@@ -6,3 +6,9 @@ class InvalidGameStateError(Exception):
 
 class InvalidMoveError(Exception):
   """Exception raised for invalid player move."""
+
+class SearchTimeoutError(Exception):
+  """Exception raised when a search runs past its deadline."""
+
+class SearchLimitError(Exception):
+  """Exception raised when a search visits more positions than it may."""
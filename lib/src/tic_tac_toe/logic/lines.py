@@ -0,0 +1,84 @@
+# tic_tac_toe/logic/lines.py
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+
+@dataclass(frozen=True)
+class LineTable:
+  """
+  The lines of a board, computed once per dimension and number of marks required to win.
+
+  Attributes:
+  dimension (int): The dimension of the board.
+  required_marks_for_win (int): The number of marks in a row required to win.
+  lines (tuple[tuple[int, ...], ...]): The rows, then the columns, then the diagonals long enough to hold a win.
+  row_count (int): The number of rows at the start of `lines`.
+  column_count (int): The number of columns following the rows in `lines`.
+  windows (tuple[tuple[int, ...], ...]): Every run of `required_marks_for_win` consecutive cells of a line.
+  window_masks (tuple[int, ...]): The bitmask of the cells of each window.
+  cell_lines (tuple[tuple[int, ...], ...]): For each cell, the indexes of the lines crossing it.
+  cell_windows (tuple[tuple[int, ...], ...]): For each cell, the indexes of the windows containing it.
+  """
+  dimension: int
+  required_marks_for_win: int
+  lines: tuple[tuple[int, ...], ...]
+  row_count: int
+  column_count: int
+  windows: tuple[tuple[int, ...], ...]
+  window_masks: tuple[int, ...]
+  cell_lines: tuple[tuple[int, ...], ...]
+  cell_windows: tuple[tuple[int, ...], ...]
+
+  def get_crossed_lines(self, positions: list[int]) -> list[int]:
+    return sorted({line for position in positions for line in self.cell_lines[position]})
+
+@lru_cache(maxsize=None)
+def get_line_table(dimension: int, required_marks_for_win: int) -> LineTable:
+  """
+  Returns the shared line table of a board configuration, building it on first use.
+
+  Parameters:
+  dimension (int): The dimension of the board.
+  required_marks_for_win (int): The number of marks in a row required to win.
+
+  Returns:
+  LineTable: The line table of the configuration.
+  """
+  rows = [tuple(row * dimension + column for column in range(dimension)) for row in range(dimension)]
+  columns = [tuple(row * dimension + column for row in range(dimension)) for column in range(dimension)]
+  diagonals = []
+  # Diagonals are identified by `row - column` (top-left to bottom-right) and `row + column` (top-right to bottom-left)
+  for difference in range(1 - dimension, dimension):
+    diagonals.append(tuple(row * dimension + row - difference for row in range(max(0, difference), min(dimension, dimension + difference))))
+  for total in range(2 * dimension - 1):
+    diagonals.append(tuple(row * dimension + total - row for row in range(max(0, total - dimension + 1), min(dimension, total + 1))))
+  lines = tuple(rows + columns + [diagonal for diagonal in diagonals if len(diagonal) >= required_marks_for_win])
+
+  windows = tuple(
+    line[start:start + required_marks_for_win]
+    for line in lines
+    for start in range(len(line) - required_marks_for_win + 1)
+  )
+
+  cell_lines = [[] for _ in range(dimension ** 2)]
+  for index, line in enumerate(lines):
+    for position in line:
+      cell_lines[position].append(index)
+  cell_windows = [[] for _ in range(dimension ** 2)]
+  for index, window in enumerate(windows):
+    for position in window:
+      cell_windows[position].append(index)
+
+  return LineTable(
+    dimension=dimension,
+    required_marks_for_win=required_marks_for_win,
+    lines=lines,
+    row_count=len(rows),
+    column_count=len(columns),
+    windows=windows,
+    window_masks=tuple(sum(1 << position for position in window) for window in windows),
+    cell_lines=tuple(tuple(indexes) for indexes in cell_lines),
+    cell_windows=tuple(tuple(indexes) for indexes in cell_windows),
+  )
@@ -0,0 +1,247 @@
+# tic_tac_toe/logic/mcts.py
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+
+import math
+import random
+import time
+
+from tic_tac_toe.logic.board import SearchBoard
+from tic_tac_toe.logic.entities import Mark
+from tic_tac_toe.logic.models import GameState, Move, get_bit_positions, get_neighboring_bits
+from tic_tac_toe.logic.parallel import PositionEncoding, decode_game_state, encode_game_state, num_cpus
+
+ROLLOUT_POLICIES = ("random", "heuristic")
+# The UCT exploration constant. Larger values visit rarely tried moves more often.
+EXPLORATION = math.sqrt(2)
+# The number of candidate moves the heuristic rollout policy compares at each step
+ROLLOUT_SAMPLES = 4
+
+# Visits and summed results of the root moves, by position. A win counts 1 and a draw 0.5 for the player to move.
+RootStatistics = dict[int, tuple[int, float]]
+
+class MCTSNode:
+  """
+  A node of a Monte Carlo search tree, reached by playing `position` from its parent.
+
+  Attributes:
+  position (int | None): The position of the move leading to the node, or None at the root.
+  parent (MCTSNode | None): The node the move was played from.
+  mark (Mark | None): The mark of the player who played the move, whose results the node counts.
+  untried_moves (list[int]): The moves that have no child node yet, in the order they will be expanded.
+  children (list[MCTSNode]): The expanded child nodes.
+  visits (int): The number of playouts through the node.
+  wins (float): The summed results of these playouts for `mark`.
+  """
+
+  def __init__(self, position: int | None, parent: MCTSNode | None, mark: Mark | None, untried_moves: list[int]) -> None:
+    self.position = position
+    self.parent = parent
+    self.mark = mark
+    self.untried_moves = untried_moves
+    self.children: list[MCTSNode] = []
+    self.visits = 0
+    self.wins = 0.0
+
+  def select_child(self, exploration: float) -> MCTSNode:
+    # UCT: the average result plus a bonus for children visited less than their siblings
+    log_visits = math.log(self.visits)
+    return max(self.children, key=lambda child: child.wins / child.visits + exploration * math.sqrt(log_visits / child.visits))
+
+def rollout(board: SearchBoard, rollout_policy: str, rng: random.Random) -> Mark | None:
+  """
+  Plays a position out to the end and restores the board.
+
+  Parameters:
+  board (SearchBoard): The board to play out.
+  rollout_policy (str): "random" plays uniformly among the moves next to a mark. "heuristic" plays the best
+  scored of a few sampled moves.
+  rng (random.Random): The random number generator of the search.
+
+  Returns:
+  Mark | None: The winner of the playout, or None for a draw.
+  """
+  if rollout_policy == "random":
+    return random_rollout(board, rng)
+  plies = 0
+  while not board.has_game_ended:
+    moves = board.generate_moves()
+    if len(moves) > 1:
+      mark = board.current_mark
+      best_score, position = None, None
+      for candidate in rng.sample(moves, min(ROLLOUT_SAMPLES, len(moves))):
+        board.make_move(candidate)
+        score = board.get_score(mark, True)
+        board.unmake_move()
+        if best_score is None or score > best_score:
+          best_score, position = score, candidate
+    else:
+      position = rng.choice(moves)
+    board.make_move(position)
+    plies += 1
+  winner = board.winner
+  for _ in range(plies):
+    board.unmake_move()
+  return winner
+
+def random_rollout(board: SearchBoard, rng: random.Random) -> Mark | None:
+  # Random moves need neither the Zobrist keys nor the window counters of the board, so the
+  # playout only updates two bitmasks and leaves the board untouched
+  if board.has_game_ended:
+    return board.winner
+  dimension = board.dimension
+  cell_windows, window_masks = board.line_table.cell_windows, board.line_table.window_masks
+  mark, other_mark = board.current_mark, Mark.NAUGHT if board.current_mark is Mark.CROSS else Mark.CROSS
+  own_bits, other_bits = (board.cross_bits, board.naught_bits) if mark is Mark.CROSS else (board.naught_bits, board.cross_bits)
+  full_mask = (1 << dimension ** 2) - 1
+  while (own_bits | other_bits) != full_mask:
+    position = rng.choice(get_bit_positions(get_neighboring_bits(dimension, own_bits | other_bits)))
+    own_bits |= 1 << position
+    for window in cell_windows[position]:
+      if own_bits & window_masks[window] == window_masks[window]:
+        return mark
+    own_bits, other_bits, mark, other_mark = other_bits, own_bits, other_mark, mark
+  return None
+
+def search_tree(game_state: GameState, time_budget: float | None, iterations: int | None, rollout_policy: str, exploration: float, seed: int | None) -> RootStatistics:
+  """
+  Grows a Monte Carlo search tree from a position until the budget runs out.
+
+  Parameters:
+  game_state (GameState): The root state.
+  time_budget (float | None): The number of seconds to search, or None to only count iterations.
+  iterations (int | None): The number of playouts to run, or None to only count time.
+  rollout_policy (str): The policy of the playouts, one of `ROLLOUT_POLICIES`.
+  exploration (float): The UCT exploration constant.
+  seed (int | None): The seed of the random number generator.
+
+  Returns:
+  RootStatistics: The visits and results of the root moves.
+  """
+  rng = random.Random(seed)
+  board = SearchBoard(game_state)
+  root = MCTSNode(None, None, None, board.generate_moves())
+  rng.shuffle(root.untried_moves)
+  deadline = time.perf_counter() + time_budget if time_budget is not None else None
+
+  count = 0
+  while (iterations is None or count < iterations) and (deadline is None or time.perf_counter() < deadline):
+    count += 1
+    node = root
+    plies = 0
+    # Selection: follow the UCT choices down to a node with moves left to expand
+    while not node.untried_moves and node.children:
+      node = node.select_child(exploration)
+      board.make_move(node.position)
+      plies += 1
+    # Expansion: add one child for a move not tried yet
+    if node.untried_moves:
+      position = node.untried_moves.pop()
+      mark = board.current_mark
+      board.make_move(position)
+      plies += 1
+      child = MCTSNode(position, node, mark, board.generate_moves())
+      rng.shuffle(child.untried_moves)
+      node.children.append(child)
+      node = child
+    winner = rollout(board, rollout_policy, rng)
+    for _ in range(plies):
+      board.unmake_move()
+    # Backpropagation: every node counts the result for the player who moved into it
+    while node is not None:
+      node.visits += 1
+      node.wins += 1.0 if winner is node.mark else 0.5 if winner is None else 0.0
+      node = node.parent
+  return {child.position: (child.visits, child.wins) for child in root.children}
+
+def merge_root_statistics(statistics: list[RootStatistics]) -> RootStatistics:
+  merged: RootStatistics = {}
+  for worker_statistics in statistics:
+    for position, (visits, wins) in worker_statistics.items():
+      merged_visits, merged_wins = merged.get(position, (0, 0.0))
+      merged[position] = (merged_visits + visits, merged_wins + wins)
+  return merged
+
+def find_best_move_mcts(game_state: GameState, time_budget: float | None = 1.0, iterations: int | None = None, rollout_policy: str = "random", exploration: float = EXPLORATION, pool: ParallelMCTS | None = None, seed: int | None = None) -> Move | None:
+  """
+  This function uses Monte Carlo tree search with UCT selection to find the best move in a game of Tic Tac Toe.
+
+  Parameters:
+  game_state (GameState): The current state of the game.
+  time_budget (float | None): The number of seconds to search, or None to only count iterations.
+  iterations (int | None): The number of playouts to run in total, or None to only count time.
+  rollout_policy (str): The policy of the playouts, one of `ROLLOUT_POLICIES`.
+  exploration (float): The UCT exploration constant.
+  pool (ParallelMCTS | None): The worker processes to grow the trees in. The search runs in this process if None.
+  seed (int | None): The seed of the random number generators.
+
+  Returns:
+  Move | None: The most visited root move, or None if no move is available.
+  """
+  if rollout_policy not in ROLLOUT_POLICIES:
+    raise ValueError(f"Error: Unknown rollout policy. Choose one of: {ROLLOUT_POLICIES}.")
+  if time_budget is None and iterations is None:
+    raise ValueError("Error: Missing budget. Give a time budget, a number of iterations, or both.")
+  if game_state.has_game_ended:
+    return None
+
+  if pool is not None:
+    statistics = pool.search(game_state, time_budget, iterations, rollout_policy, exploration, seed)
+  else:
+    statistics = search_tree(game_state, time_budget, iterations, rollout_policy, exploration, seed)
+  if not statistics:
+    return None
+  position = max(statistics, key=lambda position: statistics[position])
+  return game_state.generate_move_to(position)
+
+class ParallelMCTS:
+  """
+  A persistent pool of worker processes that grow independent Monte Carlo search trees from the
+  same root. The root statistics of the trees are summed, so that the playouts of all the workers
+  count towards the choice of the move.
+
+  Attributes:
+  max_workers (int): The number of worker processes.
+  """
+
+  def __init__(self, max_workers: int | None = None) -> None:
+    self.max_workers = max_workers or num_cpus
+    self.executor = ProcessPoolExecutor(max_workers=self.max_workers)
+
+  def __enter__(self) -> ParallelMCTS:
+    return self
+
+  def __exit__(self, *_) -> None:
+    self.close()
+
+  def search(self, game_state: GameState, time_budget: float | None, iterations: int | None, rollout_policy: str, exploration: float, seed: int | None) -> RootStatistics:
+    """
+    Grows one tree per worker and sums their root statistics.
+
+    Parameters:
+    game_state (GameState): The root state.
+    time_budget (float | None): The number of seconds each worker searches, or None to only count iterations.
+    iterations (int | None): The number of playouts to run across all the workers, or None to only count time.
+    rollout_policy (str): The policy of the playouts, one of `ROLLOUT_POLICIES`.
+    exploration (float): The UCT exploration constant.
+    seed (int | None): The seed the seeds of the workers are drawn from.
+
+    Returns:
+    RootStatistics: The summed visits and results of the root moves.
+    """
+    encoding = encode_game_state(game_state)
+    rng = random.Random(seed)
+    worker_iterations = -(-iterations // self.max_workers) if iterations is not None else None
+    futures = [
+      self.executor.submit(search_encoded_tree, encoding, time_budget, worker_iterations, rollout_policy, exploration, rng.getrandbits(64))
+      for _ in range(self.max_workers)
+    ]
+    return merge_root_statistics([future.result() for future in futures])
+
+  def close(self) -> None:
+    self.executor.shutdown(wait=False, cancel_futures=True)
+
+def search_encoded_tree(encoding: PositionEncoding, time_budget: float | None, iterations: int | None, rollout_policy: str, exploration: float, seed: int) -> RootStatistics:
+  return search_tree(decode_game_state(encoding), time_budget, iterations, rollout_policy, exploration, seed)
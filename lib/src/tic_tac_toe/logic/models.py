@@ -2,116 +2,108 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from functools import cached_property
+from dataclasses import dataclass, field, fields
+from functools import lru_cache
+from typing import Any, Callable, Iterator, Sequence
 
 import random
 
 from tic_tac_toe.logic.entities import Mark
+from tic_tac_toe.logic.lines import LineTable, get_line_table
+from tic_tac_toe.logic.transposition import compute_symmetric_zobrist_keys, update_symmetric_zobrist_keys
 from tic_tac_toe.logic.validators import validate_game_state, validate_game_board, validate_player_move
 
-@dataclass(frozen=True)
-class LineGenerator:
-  length: int
-  dimension: int
-
-  def generate_horizontal_lines(self, occupied_cells: list[int], column_numbers: list[int], row_numbers: list[int]) -> list[list[int]]:
-    lines = []
-    for i in range(len(occupied_cells)):
-        if column_numbers[i] + self.length > self.dimension:
-          continue
-        line = []
-        for k in range(i, len(occupied_cells)):
-          if len(line) == self.length or column_numbers[k] - column_numbers[i] >= self.length:
-            break
-          if k < len(occupied_cells) and row_numbers[k] == row_numbers[i]:
-            line.append(occupied_cells[k])
-        if len(line) == self.length:
-          lines.append(line)
-    return lines
-
-  def generate_vertical_lines(self, occupied_cells: list[int], column_numbers: list[int], row_numbers: list[int]) -> list[list[int]]:
-    lines = []
-    for i in range(len(occupied_cells)):
-      if row_numbers[i] + self.length > self.dimension:
-        break
-      line = []
-      for k in range(i, len(occupied_cells)):
-        if len(line) == self.length or row_numbers[k] - row_numbers[i] >= self.length:
-          break
-        if k < len(occupied_cells) and column_numbers[k] == column_numbers[i]:
-          line.append(occupied_cells[k])
-      if len(line) == self.length:
-        lines.append(line)
-    return lines
-  
-  def generate_diagonal_lines_tl_br(self, occupied_cells: list[int], column_numbers: list[int], row_numbers: list[int]) -> list[list[int]]:
-    lines = []
-    for i in range(len(occupied_cells)):
-      if column_numbers[i] + self.length > self.dimension:
-        continue
-      if row_numbers[i] + self.length > self.dimension:
-        break
-      line = []
-      for k in range(i, len(occupied_cells)):
-        if len(line) == self.length or row_numbers[k] - row_numbers[i] >= self.length:
-          break
-        if k < len(occupied_cells) and row_numbers[k] - row_numbers[i] == column_numbers[k] - column_numbers[i]:
-          line.append(occupied_cells[k])
-      if len(line) == self.length:
-        lines.append(line)
-    return lines
-  
-  def generate_diagonal_lines_tr_bl(self, occupied_cells: list[int], column_numbers: list[int], row_numbers: list[int]) -> list[list[int]]:
-    lines = []
-    for i in range(len(occupied_cells)):
-      if column_numbers[i] - self.length < -1: 
-        continue
-      if row_numbers[i] + self.length > self.dimension:
-        break
-      line = []
-      for k in range(i, len(occupied_cells)):
-        if len(line) == self.length or row_numbers[k] - row_numbers[i] >= self.length:
-          break
-        if k < len(occupied_cells) and row_numbers[k] - row_numbers[i] == column_numbers[i] - column_numbers[k]:
-          line.append(occupied_cells[k])
-      if len(line) == self.length:
-        lines.append(line)
-    return lines
-
-@dataclass(frozen=True)
+class cached_slot:
+  """
+  A cached property for classes with `__slots__`. The value is computed on first access and kept in the slot named
+  after the property with a leading underscore, which the class declares as a field with `init=False`. Unlike a
+  `__dict__`, the slots cost a pointer each until they are filled, and `drop_cached_slots` empties them.
+  """
+  def __init__(self, func: Callable[[Any], Any]) -> None:
+    self.func = func
+    self.__doc__ = func.__doc__
+    self.slot_name = f"_{func.__name__}"
+
+  def __get__(self, instance: Any, owner: type | None = None) -> Any:
+    if instance is None:
+      return self
+    try:
+      return getattr(instance, self.slot_name)
+    except AttributeError:
+      value = self.func(instance)
+      object.__setattr__(instance, self.slot_name, value)
+      return value
+
+def drop_cached_slots(instance: Any) -> None:
+  for cls in type(instance).__mro__:
+    for value in vars(cls).values():
+      if isinstance(value, cached_slot) and hasattr(instance, value.slot_name):
+        object.__delattr__(instance, value.slot_name)
+
+def get_init_field_state(instance: Any) -> list[Any]:
+  # Pickles the fields only, so that a copy starts without the cached values
+  return [getattr(instance, item.name) for item in fields(instance) if item.init]
+
+def set_init_field_state(instance: Any, state: list[Any]) -> None:
+  for item, value in zip([item for item in fields(instance) if item.init], state):
+    object.__setattr__(instance, item.name, value)
+
+def cache_field() -> Any:
+  return field(init=False, repr=False, compare=False)
+
+@dataclass(frozen=True, slots=True)
 class Grid:
   dimension: int = 3
   cells: str = None
+  _cross_marks_count: int = cache_field()
+  _naught_marks_count: int = cache_field()
+  _empty_cells_count: int = cache_field()
+  _filled_positions: list[int] = cache_field()
+
+  __getstate__ = get_init_field_state
+  __setstate__ = set_init_field_state
   
   def __post_init__(self):
     if self.cells is None:
       object.__setattr__(self, "cells", Mark.EMPTY * self.dimension ** 2)
     validate_game_board(self)
   
-  @cached_property
+  @cached_slot
   def cross_marks_count(self) -> int:
     return self.cells.count(Mark.CROSS.value)
   
-  @cached_property
+  @cached_slot
   def naught_marks_count(self) -> int:
     return self.cells.count(Mark.NAUGHT.value)
   
-  @cached_property
+  @cached_slot
   def empty_cells_count(self) -> int:
     return self.cells.count(Mark.EMPTY.value)
 
-  @cached_property
+  @property
   def count(self) -> int:
     return self.dimension ** 2
   
-  @cached_property
+  @cached_slot
   def filled_positions(self) -> list[int]:
     return [i for i, cell in enumerate(self.cells) if cell != Mark.EMPTY]
 
+  def drop_caches(self) -> None:
+    drop_cached_slots(self)
+
   def is_position_filled(self, index: int) -> bool:
     return self.cells[index] != Mark.EMPTY
+
+  def with_mark(self, index: int, mark: Mark) -> Grid:
+    return Grid(self.dimension, self.cells[:index] + mark.value + self.cells[index + 1:])
   
+  # Line sequences are whole board lines crossing at least one mark, so that every symmetric image of
+  # a position yields the same sequences and the same heuristic score. The row, column and diagonal
+  # sequences below are slices of the bounding box of the marks.
+  def generate_line_sequences(self, required_mark: int) -> list[tuple[int, ...]]:
+    table = get_line_table(self.dimension, required_mark)
+    return [table.lines[line] for line in table.get_crossed_lines(self.filled_positions)]
+
   def generate_row_sequences(self, required_mark: int, strict: bool = False) -> list[list[int]]:
         # Get all occupied cells
     filled_positions = self.filled_positions
@@ -214,21 +206,31 @@ class Grid:
     return diagonal_sequences
 
   def generate_potential_victory_sequences(self, victory_sequence_length: int) -> list[list[int]]:
-    # Get all occupied cells
-    filled_positions = self.filled_positions
+    # Windows of the required length whose cells are all filled
+    table = get_line_table(self.dimension, victory_sequence_length)
+    windows = sorted({window for position in self.filled_positions for window in table.cell_windows[position]})
+    return [
+      list(table.windows[window]) for window in windows
+      if all(self.is_position_filled(position) for position in table.windows[window])
+    ]
 
-    # Pre-calculate column and row numbers
-    column_numbers = [cell % self.dimension for cell in filled_positions]
-    row_numbers = [cell // self.dimension for cell in filled_positions]
-  
-    # Generate all possible potential victory sequences
-    potential_victory_sequences = []
-    victory_sequence_generator = LineGenerator(victory_sequence_length, self.dimension)
-    potential_victory_sequences += victory_sequence_generator.generate_horizontal_lines(filled_positions, column_numbers, row_numbers)
-    potential_victory_sequences += victory_sequence_generator.generate_vertical_lines(filled_positions, column_numbers, row_numbers)
-    potential_victory_sequences += victory_sequence_generator.generate_diagonal_lines_tl_br(filled_positions, column_numbers, row_numbers)
-    potential_victory_sequences += victory_sequence_generator.generate_diagonal_lines_tr_bl(filled_positions, column_numbers, row_numbers)
-    return potential_victory_sequences
+  def find_winning_sequence(self, required_marks_for_win: int) -> list[int]:
+    for window in get_line_table(self.dimension, required_marks_for_win).windows:
+      mark = self.cells[window[0]]
+      if mark != Mark.EMPTY and all(self.cells[position] == mark for position in window):
+        return list(window)
+    return []
+
+  def find_winning_sequence_through(self, index: int, required_marks_for_win: int) -> list[int]:
+    # Only the windows containing `index` can hold a sequence that includes the mark placed there
+    mark = self.cells[index]
+    if mark == Mark.EMPTY:
+      return []
+    table = get_line_table(self.dimension, required_marks_for_win)
+    for window in table.cell_windows[index]:
+      if all(self.cells[position] == mark for position in table.windows[window]):
+        return list(table.windows[window])
+    return []
 
   def generate_possible_moves(self) -> list[int]:
     visited_cells = set()
@@ -263,122 +265,268 @@ class Grid:
         neighbors.append(y * self.dimension + x)
     return neighbors
 
-@dataclass(frozen=True)
+@lru_cache(maxsize=None)
+def get_column_masks(dimension: int) -> tuple[int, int, int]:
+  # Full board mask plus masks of the cells that are not in the first / last column
+  full_mask = (1 << dimension ** 2) - 1
+  first_column = sum(1 << (row * dimension) for row in range(dimension))
+  last_column = first_column << (dimension - 1)
+  return full_mask, full_mask & ~first_column, full_mask & ~last_column
+
+@lru_cache(maxsize=None)
+def get_direction_masks(dimension: int, required_marks_for_win: int) -> tuple[tuple[int, int], ...]:
+  # For each direction, the bit shift between consecutive cells and the mask of the cells
+  # from which a sequence of `required_marks_for_win` cells fits on the board
+  span = dimension - required_marks_for_win
+  def start_mask(rows: range, columns: range) -> int:
+    return sum(1 << (row * dimension + column) for row in rows for column in columns)
+  return (
+    (1, start_mask(range(dimension), range(span + 1))),
+    (dimension, start_mask(range(span + 1), range(dimension))),
+    (dimension + 1, start_mask(range(span + 1), range(span + 1))),
+    (dimension - 1, start_mask(range(span + 1), range(required_marks_for_win - 1, dimension))),
+  )
+
+def get_neighboring_bits(dimension: int, occupied: int) -> int:
+  # Dilates the occupied cells by one cell in the 8 directions and keeps the empty cells reached
+  full_mask, not_first_column, not_last_column = get_column_masks(dimension)
+  left_movable = occupied & not_first_column
+  right_movable = occupied & not_last_column
+  neighbors = (
+    (occupied << dimension) | (occupied >> dimension)
+    | (right_movable << 1) | (left_movable >> 1)
+    | (right_movable << (dimension + 1)) | (left_movable >> (dimension + 1))
+    | (left_movable << (dimension - 1)) | (right_movable >> (dimension - 1))
+  )
+  return neighbors & full_mask & ~occupied
+
+def get_bit_positions(bits: int) -> list[int]:
+  positions = []
+  while bits:
+    lowest_bit = bits & -bits
+    positions.append(lowest_bit.bit_length() - 1)
+    bits ^= lowest_bit
+  return positions
+
+@dataclass(frozen=True, slots=True)
+class BitboardGrid(Grid):
+  cross_bits: int = None
+  naught_bits: int = None
+
+  __getstate__ = get_init_field_state
+  __setstate__ = set_init_field_state
+
+  def __post_init__(self):
+    Grid.__post_init__(self)
+    if self.cross_bits is None or self.naught_bits is None:
+      object.__setattr__(self, "cross_bits", sum(1 << i for i, cell in enumerate(self.cells) if cell == Mark.CROSS))
+      object.__setattr__(self, "naught_bits", sum(1 << i for i, cell in enumerate(self.cells) if cell == Mark.NAUGHT))
+
+  @classmethod
+  def from_bits(cls, dimension: int, cross_bits: int, naught_bits: int) -> BitboardGrid:
+    cells = "".join(
+      Mark.CROSS.value if (cross_bits >> i) & 1 else Mark.NAUGHT.value if (naught_bits >> i) & 1 else Mark.EMPTY.value
+      for i in range(dimension ** 2)
+    )
+    return cls(dimension, cells, cross_bits=cross_bits, naught_bits=naught_bits)
+
+  # The counts and positions come from the bits at about the cost of a cache lookup, so they are not kept
+
+  @property
+  def occupied_bits(self) -> int:
+    return self.cross_bits | self.naught_bits
+
+  @property
+  def cross_marks_count(self) -> int:
+    return self.cross_bits.bit_count()
+
+  @property
+  def naught_marks_count(self) -> int:
+    return self.naught_bits.bit_count()
+
+  @property
+  def empty_cells_count(self) -> int:
+    return self.dimension * self.dimension - (self.cross_bits | self.naught_bits).bit_count()
+
+  @property
+  def filled_positions(self) -> list[int]:
+    return get_bit_positions(self.cross_bits | self.naught_bits)
+
+  def is_position_filled(self, index: int) -> bool:
+    return (self.occupied_bits >> index) & 1 == 1
+
+  def with_mark(self, index: int, mark: Mark) -> BitboardGrid:
+    bit = 1 << index
+    return BitboardGrid(
+      self.dimension,
+      self.cells[:index] + mark.value + self.cells[index + 1:],
+      cross_bits=self.cross_bits | bit if mark is Mark.CROSS else self.cross_bits & ~bit,
+      naught_bits=self.naught_bits | bit if mark is Mark.NAUGHT else self.naught_bits & ~bit
+    )
+
+  def find_winning_sequence(self, required_marks_for_win: int) -> list[int]:
+    for bits in (self.cross_bits, self.naught_bits):
+      if bits.bit_count() < required_marks_for_win:
+        continue
+      for shift, start_mask in get_direction_masks(self.dimension, required_marks_for_win):
+        # A bit survives only if the `required_marks_for_win - 1` cells after it in this direction are also set
+        starts = bits & start_mask
+        for i in range(1, required_marks_for_win):
+          starts &= bits >> (shift * i)
+          if not starts:
+            break
+        if starts:
+          start = (starts & -starts).bit_length() - 1
+          return [start + shift * i for i in range(required_marks_for_win)]
+    return []
+
+  def find_winning_sequence_through(self, index: int, required_marks_for_win: int) -> list[int]:
+    if (self.cross_bits >> index) & 1:
+      bits = self.cross_bits
+    elif (self.naught_bits >> index) & 1:
+      bits = self.naught_bits
+    else:
+      return []
+    table = get_line_table(self.dimension, required_marks_for_win)
+    for window in table.cell_windows[index]:
+      mask = table.window_masks[window]
+      if bits & mask == mask:
+        return list(table.windows[window])
+    return []
+
+  def generate_possible_moves(self) -> list[int]:
+    return get_bit_positions(get_neighboring_bits(self.dimension, self.occupied_bits))
+
+@dataclass(frozen=True, slots=True)
 class Move:
   player_mark: Mark
   position: int
   previous_state: GameState
-  next_state: GameState
+  _next_state: GameState = cache_field()
+
+  __getstate__ = get_init_field_state
+  __setstate__ = set_init_field_state
+
+  @cached_slot
+  def next_state(self) -> GameState:
+    # Built on first access, as most candidate moves are never played
+    return self.previous_state.generate_next_state(self.position)
 
-@dataclass(frozen=True)
+  def drop_caches(self) -> None:
+    drop_cached_slots(self)
+
+@dataclass(frozen=True, slots=True)
 class GameState:
   grid: Grid
   initial_player_mark: Mark = Mark.CROSS
   required_marks_for_win: int = 3
   last_move_position: int = None
+  # Set when the state was derived from a state without a winner, so only the last move can have won
+  incremental: bool = field(default=False, repr=False, compare=False)
+  # Zobrist keys of the position under each of the 8 board symmetries, the position itself first
+  zobrist_keys: tuple[int, ...] = field(default=None, repr=False, compare=False)
+  _canonical_key: int = cache_field()
+  _get_current_player_mark: Mark = cache_field()
+  _get_winning_sequence: list[int] = cache_field()
+  _get_valid_moves: list[Move] = cache_field()
+
+  __getstate__ = get_init_field_state
+  __setstate__ = set_init_field_state
 
   def __post_init__(self):
     validate_game_state(self)
+    if self.zobrist_keys is None:
+      object.__setattr__(self, "zobrist_keys", compute_symmetric_zobrist_keys(self.grid, self.get_current_player_mark))
+
+  @property
+  def zobrist_key(self) -> int:
+    return self.zobrist_keys[0]
+
+  @cached_slot
+  def canonical_key(self) -> int:
+    return min(self.zobrist_keys)
+
+  @property
+  def canonical_transform(self) -> int:
+    # The symmetry that maps this position onto the one all its symmetric images share in search caches
+    return self.zobrist_keys.index(self.canonical_key)
 
-  @cached_property
+  @cached_slot
   def get_current_player_mark(self) -> Mark:
-    return self.initial_player_mark if self.grid.cross_marks_count is self.grid.naught_marks_count else self.initial_player_mark.other
+    return self.initial_player_mark if self.grid.cross_marks_count == self.grid.naught_marks_count else self.initial_player_mark.other
   
-  @cached_property
+  @property
   def has_game_started(self) -> bool:
     return self.grid.empty_cells_count != self.grid.dimension ** 2
   
-  @cached_property
+  @property
   def has_game_ended(self) -> bool:
     return self.has_game_started and (self.get_winner is not None or self.is_draw)
   
-  @cached_property
+  @property
   def is_draw(self) -> bool:
     return self.get_winner is None and self.grid.empty_cells_count == 0
 
-  @cached_property
+  @property
   def get_winner(self) -> Mark | None:
     return Mark(self.grid.cells[self.get_winning_sequence[0]]) if self.get_winning_sequence else None
   
-  def fill_sequences(self, sequence: list[int]) -> str:
-    return "".join(self.grid.cells[i] if i < len(self.grid.cells) else "" for i in sequence)
+  def fill_sequences(self, sequence: Sequence[int]) -> str:
+    return "".join(self.grid.cells[i] for i in sequence)
 
-  @cached_property
+  # The sequences are only read once per state, so they are built on every access rather than kept
+  @property
   def generate_sequences(self) -> list[str]:
-    sequences = []
-
-    for row in self.row_sequences:
-      sequences.append(self.fill_sequences(row))
-    for column in self.column_sequences:
-      sequences.append(self.fill_sequences(column))
-    for diagonal in self.diagonal_sequences:
-      sequences.append(self.fill_sequences(diagonal))
-    
-    return sequences
+    return [self.fill_sequences(line) for line in self.line_sequences]
+
+  @property
+  def line_table(self) -> LineTable:
+    return get_line_table(self.grid.dimension, self.required_marks_for_win)
 
-  @cached_property
+  @property
+  def line_sequences(self) -> list[tuple[int, ...]]:
+    return self.grid.generate_line_sequences(self.required_marks_for_win)
+
+  @property
   def row_sequences(self) -> list[list[int]]:
     return self.grid.generate_row_sequences(self.required_marks_for_win)
 
-  @cached_property
+  @property
   def column_sequences(self) -> list[list[int]]:
     return self.grid.generate_column_sequences(self.required_marks_for_win)
   
-  @cached_property
+  @property
   def diagonal_sequences(self) -> list[list[int]]:
     return self.grid.generate_diagonal_sequences(self.required_marks_for_win)
 
-  def ee(self, sequence: list[int], start: int, current_mark: Mark) -> list[int]:
-    winning_sequence = []
-    for i in range(start, start + self.required_marks_for_win):
-      if self.grid.cells[sequence[i]] == Mark.EMPTY.value:
-        break
-      if self.grid.cells[sequence[i]] != current_mark:
-        break
-      winning_sequence.append(sequence[i])
-    return winning_sequence
-
-  @cached_property
+  @cached_slot
   def get_winning_sequence(self) -> list[int]:
-    potential_winning_sequences = self.grid.generate_potential_victory_sequences(self.required_marks_for_win)
     if not self.has_game_started:
       return []
-    
-    # potential_winning_sequences = []
-
-    # potential_winning_sequences.extend(self.row_sequences)
-    # potential_winning_sequences.extend(self.column_sequences)
-    # potential_winning_sequences.extend(self.diagonal_sequences)
-
-    for sequence in potential_winning_sequences:
-      # check if there is a winning sequence of required length
-      if len(sequence) < self.required_marks_for_win:
-        continue
-      
-      for i in range(0, len(sequence), self.required_marks_for_win):
-        if i + self.required_marks_for_win > len(sequence):
-          break
-        winning_mark = Mark.CROSS
-        winning_sequence = self.ee(sequence, i, winning_mark)
-        if len(winning_sequence) == self.required_marks_for_win:
-          return winning_sequence
-        winning_sequence = self.ee(sequence, i, winning_mark.other)
-        if len(winning_sequence) == self.required_marks_for_win:
-          return winning_sequence
-    return []
+    if self.incremental and self.last_move_position is not None:
+      return self.grid.find_winning_sequence_through(self.last_move_position, self.required_marks_for_win)
+    return self.grid.find_winning_sequence(self.required_marks_for_win)
   
   def get_winning_sequence_positions(self, required_mark: int) ->  list[list[int]]:
     return self.grid.generate_potential_victory_sequences(required_mark)
   
-  @cached_property
+  @cached_slot
   def get_valid_moves(self) -> list[Move]:
-    valid_moves = []
+    return list(self.generate_valid_moves())
+
+  def drop_caches(self) -> None:
+    """
+    Empties the cached values of the state. The valid moves refer back to the state, so dropping them frees the
+    moves and the states they built without waiting for the garbage collector.
+    """
+    drop_cached_slots(self)
+
+  def generate_valid_moves(self) -> Iterator[Move]:
     if not self.has_game_ended:
-      valid_move_indexes = self.grid.generate_possible_moves()
-      valid_moves = [self.generate_move_to(index) for index in valid_move_indexes]
-    return valid_moves
+      for index in self.grid.generate_possible_moves():
+        yield self.generate_move_to(index)
 
-  @cached_property
+  @property
   def get_last_move(self) -> str:
     return self.get_move_format_from_index(self.last_move_position) if self.last_move_position is not None else None
   
@@ -401,17 +549,14 @@ class GameState:
     return self.make_move_to(random.randint(0, self.grid.count - 1))
   
   def generate_move_to(self, index: int) -> Move:
-    return Move(
-      player_mark=self.get_current_player_mark,
-      position=index,
-      previous_state=self,
-      next_state=GameState(
-        Grid(
-          dimension=self.grid.dimension,
-          cells=self.grid.cells[:index] + self.get_current_player_mark.value + self.grid.cells[index + 1:]
-        ),
-        initial_player_mark=self.initial_player_mark,
-        required_marks_for_win=self.required_marks_for_win,
-        last_move_position=index
-      )
+    return Move(player_mark=self.get_current_player_mark, position=index, previous_state=self)
+
+  def generate_next_state(self, index: int) -> GameState:
+    return GameState(
+      self.grid.with_mark(index, self.get_current_player_mark),
+      initial_player_mark=self.initial_player_mark,
+      required_marks_for_win=self.required_marks_for_win,
+      last_move_position=index,
+      incremental=self.get_winner is None,
+      zobrist_keys=update_symmetric_zobrist_keys(self.zobrist_keys, self.grid.dimension, index, self.get_current_player_mark)
     )
@@ -0,0 +1,121 @@
+# tic_tac_toe/logic/ordering.py
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import abc
+
+if TYPE_CHECKING:
+  from tic_tac_toe.logic.board import SearchBoard
+
+from tic_tac_toe.logic.entities import Mark
+
+class MoveOrdering(metaclass=abc.ABCMeta):
+  """
+  Abstract base class for the policy deciding in which order a search explores the moves of a node.
+  The better the first moves, the earlier Alpha-Beta pruning can cut the remaining ones off.
+  """
+
+  @abc.abstractmethod
+  def order(self, board: SearchBoard, moves: list[int], table_move: int | None, maximizer: Mark, choose_higher_score: bool) -> list[int]:
+    """
+    Abstract method to order the moves of a node.
+
+    Parameters:
+    board (SearchBoard): The search board, in the position the moves are played from.
+    moves (list[int]): The positions of the moves to order.
+    table_move (int | None): The position of the best move stored in the transposition table, if any.
+    maximizer (Mark): The player who is maximizing their score.
+    choose_higher_score (bool): True if the node picks the highest score.
+
+    Returns:
+    list[int]: The positions in the order they should be searched.
+    """
+    pass
+
+  def record_cutoff(self, board: SearchBoard, move: int, depth: int) -> None:
+    """
+    Called when the move to `move` caused a beta cutoff on `board` with `depth` plies left to search.
+    """
+    pass
+
+  def new_search(self) -> None:
+    """
+    Called once before each search, so that the policy can forget or age what it learned.
+    """
+    pass
+
+class TableMoveOrdering(MoveOrdering):
+  """
+  Searches the transposition table move first and keeps the generation order for the other moves.
+  """
+
+  def order(self, board: SearchBoard, moves: list[int], table_move: int | None, maximizer: Mark, choose_higher_score: bool) -> list[int]:
+    if table_move is None:
+      return moves
+    return sorted(moves, key=lambda move: move != table_move)
+
+class KillerHistoryOrdering(MoveOrdering):
+  """
+  Searches the transposition table move first, then the killer moves of the ply, then the other moves by history score.
+
+  Attributes:
+  killer_slots (int): The number of killer moves remembered per ply.
+  killers (dict[int, list[int]]): The positions of the latest moves that caused a cutoff, per ply.
+  history (dict[tuple[Mark, int], int]): The accumulated cutoff score of each mark and position.
+  """
+
+  def __init__(self, killer_slots: int = 2) -> None:
+    self.killer_slots = killer_slots
+    self.killers: dict[int, list[int]] = {}
+    self.history: dict[tuple[Mark, int], int] = {}
+
+  def order(self, board: SearchBoard, moves: list[int], table_move: int | None, maximizer: Mark, choose_higher_score: bool) -> list[int]:
+    killers = self.killers.get(board.ply, [])
+    mark = board.current_mark
+    def priority(move: int) -> tuple[int, int]:
+      if move == table_move:
+        return (0, 0)
+      if move in killers:
+        return (1, killers.index(move))
+      return (2, -self.history.get((mark, move), 0))
+    return sorted(moves, key=priority)
+
+  def record_cutoff(self, board: SearchBoard, move: int, depth: int) -> None:
+    killers = self.killers.setdefault(board.ply, [])
+    if move in killers:
+      killers.remove(move)
+    killers.insert(0, move)
+    del killers[self.killer_slots:]
+    # Cutoffs close to the root prune larger subtrees, so they weigh more
+    key = (board.current_mark, move)
+    self.history[key] = self.history.get(key, 0) + depth * depth
+
+  def new_search(self) -> None:
+    # Killers belong to the plies of the previous position; history is kept but aged
+    self.killers.clear()
+    self.history = {key: score // 2 for key, score in self.history.items() if score > 1}
+
+class StaticEvaluationOrdering(MoveOrdering):
+  """
+  Searches the transposition table move first and the other moves by the heuristic score of the position they lead to.
+  This plays and evaluates every child, so it costs more per node than the other policies.
+  """
+
+  def order(self, board: SearchBoard, moves: list[int], table_move: int | None, maximizer: Mark, choose_higher_score: bool) -> list[int]:
+    sign = -1 if choose_higher_score else 1
+    def priority(move: int) -> tuple[int, int]:
+      if move == table_move:
+        return (0, 0)
+      board.make_move(move)
+      score = board.get_score(maximizer, heuristic=True)
+      board.unmake_move()
+      return (1, sign * score)
+    return sorted(moves, key=priority)
+
+MOVE_ORDERINGS = {
+  "table": TableMoveOrdering,
+  "killer_history": KillerHistoryOrdering,
+  "static": StaticEvaluationOrdering,
+}
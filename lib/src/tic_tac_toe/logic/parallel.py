@@ -0,0 +1,157 @@
+# tic_tac_toe/logic/parallel.py
+
+from __future__ import annotations
+
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing.sharedctypes import Synchronized
+from typing import TypeAlias
+
+import multiprocessing
+import os
+import time
+
+from tic_tac_toe.logic.algorithms import SearchContext, alpha_beta_pruning, minimax
+from tic_tac_toe.logic.board import SearchBoard
+from tic_tac_toe.logic.entities import Mark
+from tic_tac_toe.logic.models import BitboardGrid, GameState
+from tic_tac_toe.logic.ordering import MoveOrdering
+from tic_tac_toe.logic.transposition import TranspositionTable
+
+num_cpus = os.cpu_count()
+
+# (dimension, required marks for win, initial player mark, cross bits, naught bits)
+PositionEncoding: TypeAlias = tuple[int, int, str, int, int]
+
+def encode_game_state(game_state: GameState) -> PositionEncoding:
+  grid = game_state.grid if isinstance(game_state.grid, BitboardGrid) else BitboardGrid(game_state.grid.dimension, game_state.grid.cells)
+  return (grid.dimension, game_state.required_marks_for_win, game_state.initial_player_mark.value, grid.cross_bits, grid.naught_bits)
+
+def decode_game_state(encoding: PositionEncoding) -> GameState:
+  dimension, required_marks_for_win, initial_player_mark, cross_bits, naught_bits = encoding
+  return GameState(BitboardGrid.from_bits(dimension, cross_bits, naught_bits), Mark(initial_player_mark), required_marks_for_win)
+
+class ParallelSearch:
+  """
+  A persistent pool of worker processes that search the root moves of a position in parallel.
+
+  Every worker keeps its own transposition tables and move ordering between searches. The best
+  root score found so far is shared through shared memory, so that workers starting later still prune.
+
+  Attributes:
+  max_workers (int): The number of worker processes.
+  """
+
+  def __init__(self, max_workers: int | None = None, max_table_entries: int = 1_000_000, ordering_class: type[MoveOrdering] | None = None) -> None:
+    """
+    Initializes the pool. The worker processes are started on the first search.
+
+    Parameters:
+    max_workers (int | None): The number of worker processes. Defaults to the number of CPUs.
+    max_table_entries (int): The size limit of the transposition table of each worker.
+    ordering_class (type[MoveOrdering] | None): The move ordering policy used by the workers.
+    """
+    self.max_workers = max_workers or num_cpus
+    self.root_bound = multiprocessing.Value("d", 0.0)
+    self.search_id = 0
+    self.executor = ProcessPoolExecutor(
+      max_workers=self.max_workers,
+      initializer=initialize_worker,
+      initargs=(self.root_bound, max_table_entries, ordering_class),
+    )
+
+  def __enter__(self) -> ParallelSearch:
+    return self
+
+  def __exit__(self, *_) -> None:
+    self.close()
+
+  def new_search(self) -> None:
+    # Lets the workers age their move ordering once per move rather than once per iteration
+    self.search_id += 1
+
+  def score_root_moves(self, game_state: GameState, moves: list[int], depth: int, choose_higher_score: bool, algorithm: str = "alpha_beta", deadline: float | None = None) -> list[int]:
+    """
+    Scores the root moves in the worker processes.
+
+    Parameters:
+    game_state (GameState): The root state.
+    moves (list[int]): The positions of the root moves to score, best candidates first.
+    depth (int): The maximum depth to search below each root move.
+    choose_higher_score (bool): If True, the root picks the move with the highest score.
+    algorithm (str): Either "alpha_beta" or "minimax".
+    deadline (float | None): The `time.perf_counter()` value after which the search raises SearchTimeoutError.
+
+    Returns:
+    list[int]: The score of each move. With "alpha_beta", scores lower than the best score (higher when choosing the lowest score) are only bounds.
+    """
+    with self.root_bound.get_lock():
+      self.root_bound.value = -float("inf") if choose_higher_score else float("inf")
+    # perf_counter values cannot be compared across processes, so the deadline travels as wall-clock time
+    wall_deadline = time.time() + (deadline - time.perf_counter()) if deadline is not None else None
+    encoding = encode_game_state(game_state)
+    futures: list[Future] = [
+      self.executor.submit(search_root_move, encoding, move, depth, choose_higher_score, algorithm, wall_deadline, self.search_id)
+      for move in moves
+    ]
+    try:
+      return [future.result() for future in futures]
+    except BaseException:
+      for future in futures:
+        future.cancel()
+      raise
+
+  def close(self) -> None:
+    self.executor.shutdown(wait=False, cancel_futures=True)
+
+# State of the current worker process, set up by `initialize_worker`
+worker_root_bound: Synchronized | None = None
+worker_max_table_entries = 0
+worker_ordering_class: type[MoveOrdering] | None = None
+worker_tables: dict[Mark, TranspositionTable] = {}
+worker_orderings: dict[Mark, MoveOrdering] = {}
+worker_search_id = -1
+worker_root: tuple[PositionEncoding, GameState] | None = None
+
+def initialize_worker(root_bound: Synchronized, max_table_entries: int, ordering_class: type[MoveOrdering] | None) -> None:
+  global worker_root_bound, worker_max_table_entries, worker_ordering_class
+  worker_root_bound = root_bound
+  worker_max_table_entries = max_table_entries
+  worker_ordering_class = ordering_class
+
+def search_root_move(encoding: PositionEncoding, position: int, depth: int, choose_higher_score: bool, algorithm: str, wall_deadline: float | None, search_id: int) -> int:
+  global worker_root, worker_search_id
+
+  # All root moves of a search share the same root, so it is only decoded once per worker
+  if worker_root is None or worker_root[0] != encoding:
+    worker_root = (encoding, decode_game_state(encoding))
+  game_state = worker_root[1]
+  maximizer = game_state.get_current_player_mark
+  # A search that timed out leaves its board mid-line, so every root move gets a fresh board
+  board = SearchBoard(game_state)
+  board.make_move(position)
+
+  # Scores are relative to the maximizer, so each mark needs its own table
+  table = worker_tables.setdefault(maximizer, TranspositionTable(worker_max_table_entries))
+  ordering = None
+  if worker_ordering_class is not None:
+    ordering = worker_orderings.setdefault(maximizer, worker_ordering_class())
+    if search_id != worker_search_id:
+      ordering.new_search()
+  worker_search_id = search_id
+
+  deadline = time.perf_counter() + (wall_deadline - time.time()) if wall_deadline is not None else None
+  context = SearchContext(board, maximizer, table, deadline, ordering)
+
+  if algorithm == "minimax":
+    return minimax(context, depth, not choose_higher_score)
+
+  # Searching with a window one point wider than the best score keeps equally good moves exact
+  bound = worker_root_bound.value
+  if choose_higher_score:
+    score = alpha_beta_pruning(context, depth, bound - 1, float("inf"), False)
+  else:
+    score = alpha_beta_pruning(context, depth, -float("inf"), bound + 1, True)
+  with worker_root_bound.get_lock():
+    if choose_higher_score and score > worker_root_bound.value or not choose_higher_score and score < worker_root_bound.value:
+      worker_root_bound.value = score
+  return score
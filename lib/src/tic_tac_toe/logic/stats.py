@@ -0,0 +1,52 @@
+# tic_tac_toe/logic/stats.py
+
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any
+
+@dataclass
+class SearchStats:
+  """
+  Counters filled in by a search when it is given a stats object. Searches without one only check
+  that it is None, once per node.
+
+  Attributes:
+  nodes (int): The number of positions visited.
+  leaf_evaluations (int): The number of positions scored without searching deeper.
+  beta_cutoffs (int): The number of positions whose remaining moves were pruned.
+  cutoff_move_indexes (Counter[int]): For each index in the move order, the number of cutoffs its move caused.
+  table_hits (int): The number of transposition table entries deep enough to be used.
+  max_depth (int): The deepest ply below the root the search reached.
+  root_move_times (dict[int, float]): The number of seconds spent below each root move, by position.
+  depth_times (dict[int, float]): The number of seconds of each completed iteration of an iterative deepening search, by depth.
+  """
+  nodes: int = 0
+  leaf_evaluations: int = 0
+  beta_cutoffs: int = 0
+  cutoff_move_indexes: Counter[int] = field(default_factory=Counter)
+  table_hits: int = 0
+  max_depth: int = 0
+  root_move_times: dict[int, float] = field(default_factory=dict)
+  depth_times: dict[int, float] = field(default_factory=dict)
+
+  def record_cutoff(self, move_index: int) -> None:
+    self.beta_cutoffs += 1
+    self.cutoff_move_indexes[move_index] += 1
+
+  def record_root_move(self, position: int, seconds: float) -> None:
+    # Iterative deepening searches the same root moves again, so the times add up
+    self.root_move_times[position] = self.root_move_times.get(position, 0.0) + seconds
+
+  def to_dict(self) -> dict[str, Any]:
+    return {
+      "nodes": self.nodes,
+      "leaf_evaluations": self.leaf_evaluations,
+      "beta_cutoffs": self.beta_cutoffs,
+      "cutoff_move_indexes": dict(sorted(self.cutoff_move_indexes.items())),
+      "table_hits": self.table_hits,
+      "max_depth": self.max_depth,
+      "root_move_times": self.root_move_times,
+      "depth_times": self.depth_times,
+    }
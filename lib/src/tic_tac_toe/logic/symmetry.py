@@ -0,0 +1,120 @@
+# tic_tac_toe/logic/symmetry.py
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+  from tic_tac_toe.logic.models import GameState, Grid
+
+from tic_tac_toe.logic.entities import Mark
+
+IDENTITY = 0
+
+@lru_cache(maxsize=None)
+def get_transforms(dimension: int) -> tuple[tuple[int, ...], ...]:
+  """
+  Returns the 8 symmetries of a square board as position permutations, the identity first.
+  A transform `t` moves the mark at position `p` to position `t[p]`.
+
+  Parameters:
+  dimension (int): The dimension of the board.
+
+  Returns:
+  tuple[tuple[int, ...], ...]: The identity, the 3 rotations and the 4 reflections.
+  """
+  last = dimension - 1
+  mappings = (
+    lambda row, column: (row, column),
+    lambda row, column: (column, last - row),
+    lambda row, column: (last - row, last - column),
+    lambda row, column: (last - column, row),
+    lambda row, column: (row, last - column),
+    lambda row, column: (last - row, column),
+    lambda row, column: (column, row),
+    lambda row, column: (last - column, last - row),
+  )
+  transforms = []
+  for mapping in mappings:
+    transform = []
+    for position in range(dimension ** 2):
+      row, column = mapping(*divmod(position, dimension))
+      transform.append(row * dimension + column)
+    transforms.append(tuple(transform))
+  return tuple(transforms)
+
+@lru_cache(maxsize=None)
+def get_inverse_transforms(dimension: int) -> tuple[tuple[int, ...], ...]:
+  inverses = []
+  for transform in get_transforms(dimension):
+    inverse = [0] * len(transform)
+    for position, target in enumerate(transform):
+      inverse[target] = position
+    inverses.append(tuple(inverse))
+  return tuple(inverses)
+
+def transform_position(dimension: int, position: int, transform: int) -> int:
+  return get_transforms(dimension)[transform][position]
+
+def restore_position(dimension: int, position: int, transform: int) -> int:
+  return get_inverse_transforms(dimension)[transform][position]
+
+def transform_cells(cells: str, dimension: int, transform: int) -> str:
+  inverse = get_inverse_transforms(dimension)[transform]
+  return "".join(cells[inverse[position]] for position in range(len(cells)))
+
+def canonicalize(grid: Grid) -> tuple[str, int]:
+  """
+  Maps a grid to its canonical form, the smallest of its 8 symmetric cell strings.
+
+  Parameters:
+  grid (Grid): The grid to canonicalize.
+
+  Returns:
+  tuple[str, int]: The canonical cells and the transform that maps the grid onto them.
+  """
+  candidates = [(transform_cells(grid.cells, grid.dimension, transform), transform) for transform in range(len(get_transforms(grid.dimension)))]
+  return min(candidates)
+
+@lru_cache(maxsize=None)
+def get_index_weights(dimension: int) -> tuple[tuple[int, ...], ...]:
+  # For each transform, the base-3 weight of each position once the transform is applied
+  return tuple(tuple(3 ** target for target in transform) for transform in get_transforms(dimension))
+
+def get_position_index(dimension: int, mover_bits: int, other_bits: int) -> tuple[int, int]:
+  """
+  Computes the canonical base-3 index of a position, as used by endgame tables and opening books.
+
+  Marks are relabeled so that the player to move is always 1 and the other player 2, then the cells
+  are read as a base-3 number. The index is the smallest such number over the 8 board symmetries.
+
+  Parameters:
+  dimension (int): The dimension of the board.
+  mover_bits (int): The bitmask of the cells of the player to move.
+  other_bits (int): The bitmask of the cells of the other player.
+
+  Returns:
+  tuple[int, int]: The index, and the transform that maps the position onto the indexed one.
+  """
+  indexes = []
+  for weights in get_index_weights(dimension):
+    index = 0
+    for position in range(dimension ** 2):
+      if (mover_bits >> position) & 1:
+        index += weights[position]
+      elif (other_bits >> position) & 1:
+        index += 2 * weights[position]
+    indexes.append(index)
+  index = min(indexes)
+  return index, indexes.index(index)
+
+def get_state_index(game_state: GameState) -> tuple[int, int]:
+  mover = game_state.get_current_player_mark.value
+  mover_bits = other_bits = 0
+  for position, cell in enumerate(game_state.grid.cells):
+    if cell == mover:
+      mover_bits |= 1 << position
+    elif cell != Mark.EMPTY:
+      other_bits |= 1 << position
+  return get_position_index(game_state.grid.dimension, mover_bits, other_bits)
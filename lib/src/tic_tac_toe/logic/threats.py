@@ -0,0 +1,228 @@
+# tic_tac_toe/logic/threats.py
+
+from __future__ import annotations
+
+from tic_tac_toe.logic.board import SearchBoard
+from tic_tac_toe.logic.entities import Mark
+from tic_tac_toe.logic.exceptions import SearchLimitError
+from tic_tac_toe.logic.models import GameState, Move, get_bit_positions, get_neighboring_bits
+
+# The number of attacker moves a forcing sequence may hold
+THREAT_DEPTH = 12
+# The number of positions a threat search may visit before giving up
+THREAT_NODES = 5_000
+
+class ThreatSearch:
+  """
+  A search for forcing sequences: wins where every attacker move creates a threat, and the defender
+  may only answer the threats. Only a few moves are searched at each position, so these sequences
+  are found far deeper than a full-width search reaches.
+
+  Threats are found in the winning windows of the board, from the mark counts kept by the
+  `WindowEvaluator` of the board. A four is a window one mark away from a win: a run of
+  `required_marks_for_win - 1` marks, contiguous or broken. A three is a move that brings two
+  windows to `required_marks_for_win - 2` marks, such as an open run with room to become an open
+  four. Threes are only searched when at least 4 marks in a row are required to win.
+
+  The defender answers a four on its empty cell, and a three on any empty cell of the windows it
+  created or by making a four of their own. Sequences are only reported when every such answer
+  loses, so a sequence built on threes can still be refuted by a move outside these answers. A
+  sequence of fours alone is a proven win, as the defender has no other answer to a four.
+
+  Attributes:
+  board (SearchBoard): The board searched, left in its initial position between searches.
+  max_depth (int): The number of attacker moves a forcing sequence may hold.
+  max_nodes (int): The number of positions the searches of this object may visit in total.
+  threes (bool): If True, threes are searched besides fours, when at least 4 marks in a row are required to win.
+  nodes (int): The number of positions visited so far.
+  """
+
+  def __init__(self, board: SearchBoard, max_depth: int = THREAT_DEPTH, max_nodes: int = THREAT_NODES, threes: bool = True) -> None:
+    self.board = board
+    self.max_depth = max_depth
+    self.max_nodes = max_nodes
+    self.nodes = 0
+    self.required_marks_for_win = board.required_marks_for_win
+    self.threes = threes and board.required_marks_for_win >= 4
+    # The canonical keys of the positions where the attacker has no sequence, with the depth searched
+    self.failures: dict[tuple[int, Mark], int] = {}
+
+  def get_counts(self, mark: Mark) -> tuple[list[int], list[int]]:
+    evaluator = self.board.evaluator
+    if mark is Mark.CROSS:
+      return evaluator.cross_counts, evaluator.naught_counts
+    return evaluator.naught_counts, evaluator.cross_counts
+
+  def get_threat_bits(self, mark: Mark, threes: bool = False) -> tuple[int, int, int]:
+    """
+    Returns the bitmasks of the empty cells where `mark` wins, makes a four and, if `threes`, makes a three.
+    """
+    own_counts, other_counts = self.get_counts(mark)
+    window_masks = self.board.line_table.window_masks
+    required = self.required_marks_for_win
+    lowest = required - 3 if threes else required - 2
+    wins = fours = once = twice = 0
+    for window, own in enumerate(own_counts):
+      if own < lowest or other_counts[window]:
+        continue
+      mask = window_masks[window]
+      if own == required - 1:
+        wins |= mask
+      elif own == required - 2:
+        fours |= mask
+      else:
+        # A cell in two such windows brings both to two marks from a win
+        twice |= once & mask
+        once |= mask
+    empty = ~(self.board.cross_bits | self.board.naught_bits)
+    return wins & empty, fours & empty, twice & empty
+
+  def get_valid_positions(self, bits: int) -> list[int]:
+    # Marks may only be placed next to another mark
+    board = self.board
+    return get_bit_positions(bits & get_neighboring_bits(board.dimension, board.cross_bits | board.naught_bits))
+
+  def find_winning_move(self, attacker: Mark) -> int | None:
+    """
+    Searches for a forcing sequence of `attacker`, who must be the player to move.
+
+    Parameters:
+    attacker (Mark): The mark of the player to find a sequence for.
+
+    Returns:
+    int | None: The first move of a winning sequence, or None if there is none within `max_depth` moves.
+
+    Raises:
+    SearchLimitError: If the searches of this object visited more than `max_nodes` positions. The board is restored first.
+    """
+    ply = len(self.board.history)
+    try:
+      return self.attack(attacker, self.max_depth)
+    except SearchLimitError:
+      while len(self.board.history) > ply:
+        self.board.unmake_move()
+      raise
+
+  def attack(self, attacker: Mark, depth: int) -> int | None:
+    board = self.board
+    self.nodes += 1
+    if self.nodes > self.max_nodes:
+      raise SearchLimitError("Error: The threat search visited too many positions.")
+    if board.has_game_ended:
+      return None
+    wins, fours, threes = self.get_threat_bits(attacker, self.threes)
+    if wins:
+      return (wins & -wins).bit_length() - 1
+    if depth == 0:
+      return None
+    key = (board.canonical_key, attacker)
+    if self.failures.get(key, -1) >= depth:
+      return None
+
+    defender = Mark.NAUGHT if attacker is Mark.CROSS else Mark.CROSS
+    defender_wins, _, _ = self.get_threat_bits(defender)
+    if defender_wins:
+      # A pending four of the defender must be blocked, and the block must keep the initiative
+      candidates = self.get_valid_positions(fours & defender_wins) if defender_wins & (defender_wins - 1) == 0 else []
+    else:
+      candidates = self.get_valid_positions(fours) + self.get_valid_positions(threes & ~fours)
+
+    for move in candidates:
+      board.make_move(move)
+      wins = self.defend(attacker, defender, move, depth - 1)
+      board.unmake_move()
+      if wins:
+        return move
+    self.failures[key] = depth
+    return None
+
+  def defend(self, attacker: Mark, defender: Mark, move: int, depth: int) -> bool:
+    board = self.board
+    own_counts, other_counts = self.get_counts(attacker)
+    window_masks = board.line_table.window_masks
+    required = self.required_marks_for_win
+    threats = threat_windows = 0
+    for window in board.line_table.cell_windows[move]:
+      if other_counts[window] == 0:
+        if own_counts[window] == required - 1:
+          threats |= window_masks[window]
+        elif own_counts[window] == required - 2:
+          threat_windows |= window_masks[window]
+    occupied = board.cross_bits | board.naught_bits
+    threats &= ~occupied
+    if threats & (threats - 1):
+      # The defender has no four pending, so two winning cells cannot both be blocked
+      return True
+    if threats:
+      replies = threats
+    else:
+      replies = (threat_windows & ~occupied) | self.get_threat_bits(defender)[1]
+
+    for reply in self.get_valid_positions(replies):
+      board.make_move(reply)
+      wins = board.winner is None and self.attack(attacker, depth) is not None
+      board.unmake_move()
+      if not wins:
+        return False
+    return True
+
+def find_threat_move(game_state: GameState, max_depth: int = THREAT_DEPTH, max_nodes: int = THREAT_NODES, threes: bool = True) -> Move | None:
+  """
+  This function looks for a forced win of the player to move with a threat search.
+
+  Parameters:
+  game_state (GameState): The current state of the game.
+  max_depth (int): The number of attacker moves a forcing sequence may hold.
+  max_nodes (int): The number of positions the search may visit.
+  threes (bool): If False, only sequences of fours are searched, whose wins are proven.
+
+  Returns:
+  Move | None: The first move of a winning sequence, or None if none was found.
+  """
+  if game_state.has_game_ended or not game_state.has_game_started:
+    return None
+  board = SearchBoard(game_state)
+  try:
+    position = ThreatSearch(board, max_depth, max_nodes, threes).find_winning_move(board.current_mark)
+  except SearchLimitError:
+    return None
+  return game_state.generate_move_to(position) if position is not None else None
+
+def find_threat_defense(game_state: GameState, move: Move, max_depth: int = THREAT_DEPTH, max_nodes: int = THREAT_NODES) -> Move:
+  """
+  This function checks that a move leaves the opponent without a forced win, and otherwise looks
+  for a move that refutes the opponent's sequences.
+
+  Parameters:
+  game_state (GameState): The current state of the game.
+  move (Move): The move chosen for the current state.
+  max_depth (int): The number of attacker moves a forcing sequence may hold.
+  max_nodes (int): The number of positions the searches may visit in total.
+
+  Returns:
+  Move: `move` if it leaves no forced win or if no refutation was found, else the refutation with the best heuristic score.
+  """
+  board = SearchBoard(game_state)
+  search = ThreatSearch(board, max_depth, max_nodes)
+  mark = board.current_mark
+  opponent = Mark.NAUGHT if mark is Mark.CROSS else Mark.CROSS
+
+  # The chosen move is checked first, then the others from the best heuristic score
+  scores = {}
+  for position in board.generate_moves():
+    board.make_move(position)
+    scores[position] = board.get_score(mark, True)
+    board.unmake_move()
+  positions = [move.position] + sorted((position for position in scores if position != move.position), key=lambda position: -scores[position])
+  try:
+    for position in positions:
+      board.make_move(position)
+      try:
+        refuted = board.winner is mark or search.find_winning_move(opponent) is None
+      finally:
+        board.unmake_move()
+      if refuted:
+        return move if position == move.position else game_state.generate_move_to(position)
+  except SearchLimitError:
+    pass
+  return move
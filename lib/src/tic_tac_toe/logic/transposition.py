@@ -0,0 +1,189 @@
+# tic_tac_toe/logic/transposition.py
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from enum import Enum
+from functools import lru_cache
+from typing import TYPE_CHECKING, NamedTuple
+
+import random
+import threading
+
+if TYPE_CHECKING:
+  from tic_tac_toe.logic.models import Grid
+
+from tic_tac_toe.logic.entities import Mark
+from tic_tac_toe.logic.symmetry import get_transforms
+
+# Fixed seed so that keys are identical in every process and every run
+ZOBRIST_SEED = 0x5EED
+
+class ZobristKeys(NamedTuple):
+  cross: tuple[int, ...]
+  naught: tuple[int, ...]
+  naught_to_move: int
+
+@lru_cache(maxsize=None)
+def get_zobrist_keys(dimension: int) -> ZobristKeys:
+  generator = random.Random(ZOBRIST_SEED + dimension)
+  cells = dimension ** 2
+  return ZobristKeys(
+    cross=tuple(generator.getrandbits(64) for _ in range(cells)),
+    naught=tuple(generator.getrandbits(64) for _ in range(cells)),
+    naught_to_move=generator.getrandbits(64),
+  )
+
+def compute_zobrist_key(grid: Grid, player_to_move: Mark) -> int:
+  """
+  Computes the Zobrist key of a position from scratch.
+
+  Parameters:
+  grid (Grid): The grid of the position.
+  player_to_move (Mark): The mark of the player whose turn it is.
+
+  Returns:
+  int: The 64-bit Zobrist key of the position.
+  """
+  keys = get_zobrist_keys(grid.dimension)
+  key = keys.naught_to_move if player_to_move is Mark.NAUGHT else 0
+  for position, cell in enumerate(grid.cells):
+    if cell == Mark.CROSS:
+      key ^= keys.cross[position]
+    elif cell == Mark.NAUGHT:
+      key ^= keys.naught[position]
+  return key
+
+def compute_symmetric_zobrist_keys(grid: Grid, player_to_move: Mark) -> tuple[int, ...]:
+  """
+  Computes the Zobrist keys of the 8 symmetric images of a position from scratch.
+
+  Parameters:
+  grid (Grid): The grid of the position.
+  player_to_move (Mark): The mark of the player whose turn it is.
+
+  Returns:
+  tuple[int, ...]: One key per transform of `get_transforms`, the key of the position itself first.
+  """
+  keys = get_zobrist_keys(grid.dimension)
+  symmetric_keys = []
+  for transform in get_transforms(grid.dimension):
+    key = keys.naught_to_move if player_to_move is Mark.NAUGHT else 0
+    for position, cell in enumerate(grid.cells):
+      if cell == Mark.CROSS:
+        key ^= keys.cross[transform[position]]
+      elif cell == Mark.NAUGHT:
+        key ^= keys.naught[transform[position]]
+    symmetric_keys.append(key)
+  return tuple(symmetric_keys)
+
+def get_move_key(dimension: int, position: int, mark: Mark) -> int:
+  """
+  Returns the value to XOR into a Zobrist key when `mark` is placed at `position`.
+  The side to move changes with every move, so the side key is always toggled as well.
+  """
+  keys = get_zobrist_keys(dimension)
+  return (keys.cross if mark is Mark.CROSS else keys.naught)[position] ^ keys.naught_to_move
+
+@lru_cache(maxsize=None)
+def get_symmetric_move_keys(dimension: int, mark: Mark) -> tuple[tuple[int, ...], ...]:
+  """
+  Returns, for each position, the values to XOR into the 8 symmetric Zobrist keys when `mark` is placed there.
+  """
+  keys = get_zobrist_keys(dimension)
+  piece_keys = keys.cross if mark is Mark.CROSS else keys.naught
+  return tuple(
+    tuple(piece_keys[transform[position]] ^ keys.naught_to_move for transform in get_transforms(dimension))
+    for position in range(dimension ** 2)
+  )
+
+def update_symmetric_zobrist_keys(symmetric_keys: tuple[int, ...], dimension: int, position: int, mark: Mark) -> tuple[int, ...]:
+  move_keys = get_symmetric_move_keys(dimension, mark)[position]
+  return tuple(key ^ move_key for key, move_key in zip(symmetric_keys, move_keys))
+
+class Bound(Enum):
+  EXACT = 0
+  LOWER = 1
+  UPPER = 2
+
+class TranspositionEntry(NamedTuple):
+  depth: int
+  score: int
+  bound: Bound
+  best_move: int | None
+
+class TranspositionTable:
+  """
+  A bounded cache of search results keyed by Zobrist key.
+
+  Scores are stored from the point of view of the maximizer of the search that produced them,
+  so a table must only be shared between searches made for the same player.
+
+  Attributes:
+  max_entries (int): The maximum number of entries kept in the table.
+  """
+
+  def __init__(self, max_entries: int = 1_000_000) -> None:
+    """
+    Initializes an empty transposition table.
+
+    Parameters:
+    max_entries (int): The maximum number of entries kept in the table. When the table is full, the oldest entry is evicted.
+    """
+    if max_entries < 1:
+      raise ValueError("Error: Invalid table size. The transposition table must hold at least one entry.")
+    self.max_entries = max_entries
+    self.entries: OrderedDict[int, TranspositionEntry] = OrderedDict()
+
+  def __len__(self) -> int:
+    return len(self.entries)
+
+  def get(self, key: int) -> TranspositionEntry | None:
+    return self.entries.get(key)
+
+  def store(self, key: int, depth: int, score: int, bound: Bound, best_move: int | None) -> None:
+    """
+    Stores a search result, keeping the existing entry if it was searched deeper.
+
+    Parameters:
+    key (int): The Zobrist key of the position.
+    depth (int): The remaining depth the position was searched to.
+    score (int): The score of the position.
+    bound (Bound): Whether the score is exact, a lower bound or an upper bound.
+    best_move (int | None): The position of the best move found, if any.
+    """
+    existing = self.entries.get(key)
+    if existing is not None:
+      if existing.depth > depth:
+        return
+    elif len(self.entries) >= self.max_entries:
+      self.entries.popitem(last=False)
+    self.entries[key] = TranspositionEntry(depth, score, bound, best_move)
+
+  def clear(self) -> None:
+    self.entries.clear()
+
+class SharedTranspositionTable(TranspositionTable):
+  """
+  A transposition table that several threads may search with at once, such as the searches of the sessions of a
+  server playing the same mark. Every access holds a lock.
+
+  Attributes:
+  max_entries (int): The maximum number of entries kept in the table.
+  """
+
+  def __init__(self, max_entries: int = 1_000_000) -> None:
+    super().__init__(max_entries)
+    self.lock = threading.Lock()
+
+  def get(self, key: int) -> TranspositionEntry | None:
+    with self.lock:
+      return self.entries.get(key)
+
+  def store(self, key: int, depth: int, score: int, bound: Bound, best_move: int | None) -> None:
+    with self.lock:
+      super().store(key, depth, score, bound, best_move)
+
+  def clear(self) -> None:
+    with self.lock:
+      super().clear()
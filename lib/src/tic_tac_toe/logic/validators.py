@@ -56,12 +56,9 @@ def validate_player_move(game_state: GameState, position: int) -> None:
   if game_state.grid.is_position_filled(position):
     raise InvalidMoveError(f"Error: Invalid move. The cell at position {game_state.get_move_format_from_index(position)} is already filled.")
   
-  if len(game_state.get_valid_moves) == 0:
+  valid_positions = [move.position for move in game_state.generate_valid_moves()]
+  if len(valid_positions) == 0 or position in valid_positions:
     return None
-  
-  for move in game_state.get_valid_moves:
-    if move.position == position:
-      return None
   raise InvalidMoveError(f"Error: Invalid move. The cell at position {game_state.get_move_format_from_index(position)} is not adjacent to an existing mark.")
 
 def validate_players(players: list[Player]) -> None:
@@ -0,0 +1,58 @@
+# tests/conftest.py
+
+from typing import Callable
+
+import random
+
+import pytest
+
+from tic_tac_toe.logic.entities import Mark
+from tic_tac_toe.logic.models import BitboardGrid, GameState
+
+def play_random_game(dimension: int, required_marks_for_win: int, rng: random.Random, starting_mark: Mark = Mark.CROSS) -> list[GameState]:
+  """
+  Plays random moves from the empty board until the game ends.
+
+  Returns:
+  list[GameState]: The states of the game after each move, the final one last.
+  """
+  game_state = GameState(BitboardGrid(dimension), starting_mark, required_marks_for_win)
+  game_state = game_state.make_move_to(rng.randrange(dimension ** 2)).next_state
+  states = [game_state]
+  while not game_state.has_game_ended:
+    game_state = rng.choice(game_state.get_valid_moves).next_state
+    states.append(game_state)
+  return states
+
+def get_next_states(game_state: GameState) -> list[GameState]:
+  # The first mark may be placed on any cell, the following ones next to a mark
+  if not game_state.has_game_started:
+    return [game_state.make_move_to(position).next_state for position in range(game_state.grid.dimension ** 2)]
+  return [move.next_state for move in game_state.get_valid_moves]
+
+def solve_game(game_state: GameState, results: dict[tuple[str, Mark], int]) -> int:
+  """
+  Solves a game state by a plain negamax over its valid moves, without symmetries, tables or bounds.
+
+  Returns:
+  int: 1 if the player to move wins with perfect play, -1 if they lose and 0 for a draw.
+  """
+  key = (game_state.grid.cells, game_state.get_current_player_mark)
+  if key not in results:
+    if game_state.get_winner is not None:
+      # Only the player who just moved can have completed a line
+      results[key] = -1
+    elif game_state.is_draw:
+      results[key] = 0
+    else:
+      results[key] = max(-solve_game(next_state, results) for next_state in get_next_states(game_state))
+  return results[key]
+
+@pytest.fixture
+def random_game() -> Callable[..., list[GameState]]:
+  return play_random_game
+
+@pytest.fixture(scope="session")
+def solved_results() -> dict[tuple[str, Mark], int]:
+  # Shared by the tests so that each configuration is solved once
+  return {}
@@ -0,0 +1,90 @@
+# tests/test_algorithms.py
+
+import random
+
+import pytest
+
+from tic_tac_toe.logic.algorithms import SearchContext, alpha_beta_pruning, find_best_move_alpha_beta, find_best_move_iterative_deepening, minimax
+from tic_tac_toe.logic.board import SearchBoard
+from tic_tac_toe.logic.ordering import KillerHistoryOrdering, StaticEvaluationOrdering, TableMoveOrdering
+from tic_tac_toe.logic.transposition import TranspositionTable
+
+def get_positions(random_game, dimension, required_marks_for_win, count, seed):
+  rng = random.Random(seed)
+  positions = []
+  while len(positions) < count:
+    states = [game_state for game_state in random_game(dimension, required_marks_for_win, rng) if not game_state.has_game_ended]
+    positions += rng.sample(states, min(2, len(states)))
+  return positions[:count]
+
+@pytest.mark.parametrize("dimension, required_marks_for_win, depth", [(3, 3, 4), (4, 3, 3), (5, 4, 3)])
+def test_alpha_beta_with_table_matches_minimax(random_game, dimension, required_marks_for_win, depth):
+  for game_state in get_positions(random_game, dimension, required_marks_for_win, 12, dimension + depth):
+    maximizer = game_state.get_current_player_mark
+    # The table is kept across the depths, as iterative deepening does, so that the bounds of shallower searches are reused
+    table = TranspositionTable()
+    for search_depth in range(1, depth + 1):
+      expected = minimax(SearchContext(SearchBoard(game_state), maximizer), search_depth, True)
+      context = SearchContext(SearchBoard(game_state), maximizer, table)
+      assert alpha_beta_pruning(context, search_depth, choose_higher_score=True) == expected
+
+@pytest.mark.parametrize("ordering_class", [TableMoveOrdering, KillerHistoryOrdering, StaticEvaluationOrdering])
+def test_move_ordering_keeps_the_minimax_root_value(random_game, ordering_class):
+  ordering = ordering_class()
+  for game_state in get_positions(random_game, 5, 4, 12, 8):
+    maximizer = game_state.get_current_player_mark
+    table = TranspositionTable()
+    ordering.new_search()
+    for search_depth in range(1, 4):
+      expected = minimax(SearchContext(SearchBoard(game_state), maximizer), search_depth, True)
+      context = SearchContext(SearchBoard(game_state), maximizer, table, ordering=ordering)
+      assert alpha_beta_pruning(context, search_depth, choose_higher_score=True) == expected
+
+def test_alpha_beta_solves_positions_with_a_shared_table(random_game):
+  # Searched to the end of the game, scores do not depend on the depth left, so one table per mark can serve every position
+  tables = {}
+  for game_state in get_positions(random_game, 4, 3, 20, 5):
+    if game_state.grid.empty_cells_count > 9:
+      continue
+    maximizer = game_state.get_current_player_mark
+    depth = game_state.grid.empty_cells_count
+    expected = minimax(SearchContext(SearchBoard(game_state), maximizer), depth, True)
+    context = SearchContext(SearchBoard(game_state), maximizer, tables.setdefault(maximizer, TranspositionTable()))
+    assert alpha_beta_pruning(context, depth, choose_higher_score=True) == expected
+
+def test_best_move_has_the_minimax_root_value(random_game):
+  for game_state in get_positions(random_game, 4, 3, 10, 11):
+    maximizer = game_state.get_current_player_mark
+    # The finders search `depth` plies below each root move
+    expected = minimax(SearchContext(SearchBoard(game_state), maximizer), 4, True)
+    move = find_best_move_alpha_beta(game_state, 3, table=TranspositionTable())
+    board = SearchBoard(game_state)
+    board.make_move(move.position)
+    assert minimax(SearchContext(board, maximizer), 3, False) == expected
+
+def test_iterative_deepening_has_the_minimax_root_value(random_game):
+  for game_state in get_positions(random_game, 4, 3, 10, 11):
+    maximizer = game_state.get_current_player_mark
+    expected = minimax(SearchContext(SearchBoard(game_state), maximizer), 4, True)
+    move = find_best_move_iterative_deepening(game_state, 10.0, max_depth=3)
+    board = SearchBoard(game_state)
+    board.make_move(move.position)
+    assert minimax(SearchContext(board, maximizer), 3, False) == expected
+
+def test_iterative_deepening_completes_the_first_iteration(random_game):
+  game_state = get_positions(random_game, 9, 5, 1, 3)[0]
+  move = find_best_move_iterative_deepening(game_state, 0.0)
+  assert move is not None
+  assert move.position in [valid_move.position for valid_move in game_state.get_valid_moves]
+
+def test_alpha_beta_takes_an_immediate_win(random_game):
+  rng = random.Random(2)
+  checked = 0
+  while checked < 20:
+    states = random_game(5, 4, rng)
+    if states[-1].get_winner is None or len(states) < 2:
+      continue
+    game_state = states[-2]
+    move = find_best_move_alpha_beta(game_state, 2, table=TranspositionTable())
+    assert move.next_state.get_winner is game_state.get_current_player_mark
+    checked += 1
@@ -0,0 +1,51 @@
+# tests/test_async_engine.py
+
+import asyncio
+
+from tic_tac_toe.game.async_engine import AsyncPlayer, AsyncRenderer, AsyncTicTacToe, PlayerAdapter, RendererAdapter
+from tic_tac_toe.game.players import RandomComputerPlayer
+from tic_tac_toe.game.renderer import NullRenderer
+from tic_tac_toe.logic.entities import Mark
+
+class FirstCellPlayer(AsyncPlayer):
+  async def get_move(self, game_state):
+    await asyncio.sleep(0)
+    return game_state.get_valid_moves[0] if game_state.has_game_started else game_state.make_move_to(0)
+
+class RecordingRenderer(AsyncRenderer):
+  def __init__(self):
+    self.states = []
+
+  async def render(self, game_state):
+    self.states.append(game_state)
+
+def get_random_player(mark):
+  player = RandomComputerPlayer(mark)
+  player.delay = 0
+  return player
+
+def test_synchronous_players_and_renderers_are_adapted():
+  game = AsyncTicTacToe(get_random_player(Mark.CROSS), get_random_player(Mark.NAUGHT), NullRenderer())
+  assert isinstance(game.player1, PlayerAdapter)
+  assert isinstance(game.player2, PlayerAdapter)
+  assert isinstance(game.renderer, RendererAdapter)
+  game_state = asyncio.run(game.play("X", 3, 3))
+  assert game_state is not None and game_state.has_game_ended
+
+def test_games_run_concurrently():
+  renderers = [RecordingRenderer() for _ in range(20)]
+  async def play_all():
+    games = [AsyncTicTacToe(FirstCellPlayer(Mark.CROSS), get_random_player(Mark.NAUGHT), renderer) for renderer in renderers]
+    return await asyncio.gather(*(game.play("X", 4, 3) for game in games))
+  final_states = asyncio.run(play_all())
+  for renderer, game_state in zip(renderers, final_states):
+    assert game_state.has_game_ended
+    assert renderer.states[-1] is game_state
+
+def test_errors_are_handled_by_a_coroutine():
+  errors = []
+  async def handle(error):
+    errors.append(str(error))
+  game = AsyncTicTacToe(FirstCellPlayer(Mark.CROSS), get_random_player(Mark.NAUGHT), NullRenderer(), handle)
+  assert asyncio.run(game.play("?", 3, 3)) is None
+  assert len(errors) == 1
@@ -0,0 +1,26 @@
+# tests/test_batch.py
+
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from tic_tac_toe.logic.batch import CROSS_VALUE, EMPTY_VALUE, NAUGHT_VALUE, evaluate_boards, evaluate_game_states
+from tic_tac_toe.logic.entities import Mark
+from tic_tac_toe.logic.evaluation import evaluate_score
+
+@pytest.mark.parametrize("dimension, required_marks_for_win", [(3, 3), (4, 3), (6, 4), (9, 5), (15, 5)])
+@pytest.mark.parametrize("maximizer", [Mark.CROSS, Mark.NAUGHT])
+def test_batch_matches_evaluate_score(random_game, dimension, required_marks_for_win, maximizer):
+  rng = random.Random(dimension)
+  game_states = [game_state for _ in range(10) for game_state in random_game(dimension, required_marks_for_win, rng)]
+  evaluation = evaluate_game_states(game_states, maximizer)
+  assert evaluation.scores.tolist() == [evaluate_score(game_state, maximizer, True) for game_state in game_states]
+  values = {Mark.CROSS: CROSS_VALUE, Mark.NAUGHT: NAUGHT_VALUE, None: EMPTY_VALUE}
+  assert evaluation.winners.tolist() == [values[game_state.get_winner] for game_state in game_states]
+  assert evaluation.draws.tolist() == [game_state.is_draw for game_state in game_states]
+
+def test_invalid_boards_are_rejected():
+  with pytest.raises(ValueError, match="Error: Invalid boards"):
+    evaluate_boards(np.zeros((2, 3, 4), dtype=np.int8), 3)
@@ -0,0 +1,49 @@
+# tests/test_board.py
+
+import random
+
+from tic_tac_toe.logic.algorithms import find_best_move_alpha_beta, find_best_move_minimax
+from tic_tac_toe.logic.board import SearchBoard
+from tic_tac_toe.logic.entities import Mark
+from tic_tac_toe.logic.evaluation import evaluate_score
+from tic_tac_toe.logic.models import BitboardGrid, GameState
+
+def get_position(board):
+  return (board.cross_bits, board.naught_bits, board.current_mark, board.winner, board.empty_cells_count, board.zobrist_keys, board.evaluator.balance)
+
+def test_board_follows_the_game_states(random_game):
+  rng = random.Random(10)
+  for _ in range(10):
+    states = random_game(7, 4, rng)
+    board = SearchBoard(states[0])
+    for game_state in states[1:]:
+      board.make_move(game_state.last_move_position)
+      assert board.current_mark is game_state.get_current_player_mark
+      assert board.winner is game_state.get_winner
+      assert board.has_game_ended == game_state.has_game_ended
+      assert board.zobrist_keys == game_state.zobrist_keys
+      assert board.generate_moves() == sorted(move.position for move in game_state.get_valid_moves)
+      assert board.get_score(Mark.CROSS, True) == evaluate_score(game_state, Mark.CROSS, True)
+
+def test_unmake_restores_the_position(random_game):
+  game_state = random_game(6, 4, random.Random(11))[8]
+  board = SearchBoard(game_state)
+  position = get_position(board)
+  for move in board.generate_moves():
+    board.make_move(move)
+    for reply in board.generate_moves()[:5]:
+      board.make_move(reply)
+      board.unmake_move()
+    board.unmake_move()
+    assert get_position(board) == position
+  assert board.history == []
+
+def test_empty_board_allows_every_cell():
+  game_state = GameState(BitboardGrid(3), Mark.CROSS, 3)
+  # `GameState.get_valid_moves` has no moves before the first mark, but the first mark may go anywhere
+  assert game_state.get_valid_moves == []
+  assert SearchBoard(game_state).generate_moves() == list(range(9))
+  for find_best_move in (find_best_move_alpha_beta, find_best_move_minimax):
+    move = find_best_move(game_state, 2)
+    assert move is not None
+    assert move.next_state.grid.cells.count(Mark.CROSS.value) == 1
@@ -0,0 +1,41 @@
+# tests/test_book.py
+
+import pytest
+
+from conftest import get_next_states, solve_game
+from tic_tac_toe.logic.book import OpeningBook, build_opening_book, write_opening_book
+from tic_tac_toe.logic.entities import Mark
+from tic_tac_toe.logic.models import BitboardGrid, GameState
+
+@pytest.fixture(scope="module")
+def opening_book(tmp_path_factory):
+  path = tmp_path_factory.mktemp("book") / "book_3x3_3.bin"
+  # Searched to the end of the game, every book move is a solved best move
+  write_opening_book(str(path), 3, 3, build_opening_book(3, 3, 2, 9))
+  return OpeningBook(str(path))
+
+@pytest.mark.parametrize("starting_mark", [Mark.CROSS, Mark.NAUGHT])
+def test_book_moves_match_solved_positions(opening_book, solved_results, starting_mark):
+  root = GameState(BitboardGrid(3), starting_mark, 3)
+  checked = 0
+  for game_state in [root] + get_next_states(root) + [state for next_state in get_next_states(root) for state in get_next_states(next_state)]:
+    if game_state.has_game_ended:
+      continue
+    move = opening_book.lookup(game_state)
+    assert move is not None
+    assert -solve_game(move.next_state, solved_results) == solve_game(game_state, solved_results)
+    checked += 1
+  assert checked >= 50
+
+def test_positions_after_the_book_are_not_found(opening_book):
+  game_state = GameState(BitboardGrid(3), Mark.CROSS, 3)
+  for position in (4, 0, 8):
+    game_state = game_state.make_move_to(position).next_state
+  assert opening_book.lookup(game_state) is None
+
+@pytest.mark.parametrize("data", [b"", b"TTTB", b"not a book, not a book"])
+def test_invalid_file_is_rejected(tmp_path, data):
+  path = tmp_path / "book.bin"
+  path.write_bytes(data)
+  with pytest.raises(ValueError, match="Error: Invalid opening book"):
+    OpeningBook(str(path))
@@ -0,0 +1,48 @@
+# tests/test_endgame.py
+
+import pytest
+
+from conftest import get_next_states, solve_game
+from tic_tac_toe.logic.endgame import EndgameTable, Outcome, write_endgame_table
+from tic_tac_toe.logic.entities import Mark
+from tic_tac_toe.logic.models import BitboardGrid, GameState
+
+OUTCOMES = {1: Outcome.WIN, -1: Outcome.LOSS, 0: Outcome.DRAW}
+
+@pytest.fixture(scope="module")
+def endgame_table(tmp_path_factory):
+  path = tmp_path_factory.mktemp("endgame") / "endgame_3x3_3.bin"
+  write_endgame_table(str(path), 3, 3)
+  table = EndgameTable(str(path))
+  yield table
+  table.close()
+
+@pytest.mark.parametrize("starting_mark", [Mark.CROSS, Mark.NAUGHT])
+def test_entries_match_solved_positions(endgame_table, solved_results, starting_mark):
+  frontier = [GameState(BitboardGrid(3), starting_mark, 3)]
+  seen = set()
+  while frontier:
+    game_state = frontier.pop()
+    if game_state.grid.cells in seen or game_state.has_game_ended:
+      continue
+    seen.add(game_state.grid.cells)
+    entry = endgame_table.lookup(game_state)
+    assert entry is not None
+    result = solve_game(game_state, solved_results)
+    assert entry.outcome is OUTCOMES[result]
+    # The best move, mapped back from the canonical form, keeps the outcome
+    next_state = game_state.make_move_to(entry.best_move).next_state
+    assert -solve_game(next_state, solved_results) == result
+    frontier += get_next_states(game_state)
+  assert len(seen) > 1000
+
+def test_lookup_ignores_other_configurations(endgame_table):
+  assert endgame_table.lookup(GameState(BitboardGrid(4), Mark.CROSS, 3)) is None
+  assert endgame_table.lookup(GameState(BitboardGrid(3), Mark.CROSS, 2)) is None
+
+@pytest.mark.parametrize("data", [b"", b"TTTE", b"not a table"])
+def test_invalid_file_is_rejected(tmp_path, data):
+  path = tmp_path / "endgame.bin"
+  path.write_bytes(data)
+  with pytest.raises(ValueError, match="Error: Invalid endgame table"):
+    EndgameTable(str(path))
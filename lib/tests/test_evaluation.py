@@ -0,0 +1,73 @@
+# tests/test_evaluation.py
+
+import random
+
+import pytest
+
+from tic_tac_toe.logic import algorithms
+from tic_tac_toe.logic.entities import Mark
+from tic_tac_toe.logic.evaluation import WIN_SCORE, WindowEvaluator, evaluate_score, heuristic_score
+from tic_tac_toe.logic.lines import get_line_table
+from tic_tac_toe.logic.models import BitboardGrid, GameState
+from tic_tac_toe.logic.symmetry import transform_cells
+
+def get_game_state(cells, required_marks_for_win, starting_mark=Mark.CROSS):
+  dimension = int(len(cells) ** 0.5)
+  return GameState(BitboardGrid(dimension, cells), starting_mark, required_marks_for_win)
+
+def test_open_windows_score_the_square_of_their_marks():
+  # Crosses: 4 for the top row, 1 for the right column and 1 for the diagonal. Naughts: 1 for the bottom row
+  game_state = get_game_state("X.X...O..", 3)
+  assert heuristic_score(game_state, Mark.CROSS) == 6 - 1
+  assert heuristic_score(game_state, Mark.NAUGHT) == 1 - 6
+
+def test_blocked_windows_are_worth_nothing():
+  # The top row holds both marks, so its two crosses count for nothing
+  assert heuristic_score(get_game_state("XXO......", 3), Mark.CROSS) == 3 - 2
+
+def test_heuristic_is_clamped_below_a_win():
+  evaluator = WindowEvaluator(get_line_table(15, 5))
+  for position in range(75):
+    evaluator.place(position, Mark.CROSS)
+  assert evaluator.balance > WIN_SCORE
+  assert evaluator.get_score(Mark.CROSS) == WIN_SCORE - 1
+  assert evaluator.get_score(Mark.NAUGHT) == -WIN_SCORE + 1
+
+@pytest.mark.parametrize("dimension, required_marks_for_win", [(3, 3), (6, 4), (9, 5)])
+def test_incremental_counters_match_a_full_evaluation(random_game, dimension, required_marks_for_win):
+  rng = random.Random(dimension)
+  for _ in range(10):
+    states = random_game(dimension, required_marks_for_win, rng)
+    evaluator = WindowEvaluator(get_line_table(dimension, required_marks_for_win))
+    placed = []
+    for game_state in states:
+      position = game_state.last_move_position
+      mark = Mark(game_state.grid.cells[position])
+      evaluator.place(position, mark)
+      placed.append((position, mark))
+      assert evaluator.balance == WindowEvaluator.from_game_state(game_state).balance
+    # Removing the marks in reverse order walks back through the same scores
+    for game_state, (position, mark) in zip(reversed(states), reversed(placed)):
+      assert evaluator.get_score(Mark.CROSS) == heuristic_score(game_state, Mark.CROSS)
+      evaluator.remove(position, mark)
+    assert evaluator.balance == 0
+    assert evaluator.cross_counts == evaluator.naught_counts == [0] * len(evaluator.line_table.windows)
+
+def test_symmetric_positions_have_the_same_score(random_game):
+  for game_state in random_game(7, 4, random.Random(12)):
+    for transform in range(8):
+      image = get_game_state(transform_cells(game_state.grid.cells, 7, transform), 4)
+      assert heuristic_score(image, Mark.CROSS) == heuristic_score(game_state, Mark.CROSS)
+
+def test_evaluate_score_of_finished_games():
+  won = get_game_state("XXXOO....", 3)
+  assert evaluate_score(won, Mark.CROSS, True) == WIN_SCORE
+  assert evaluate_score(won, Mark.NAUGHT, True) == -WIN_SCORE
+  drawn = get_game_state("XOXXOOOXX", 3)
+  assert evaluate_score(drawn, Mark.CROSS, True) == 0
+  assert evaluate_score(get_game_state("X...O....", 3), Mark.CROSS, False) == 0
+
+def test_scores_are_still_importable_from_the_algorithms():
+  assert algorithms.evaluate_score is evaluate_score
+  assert algorithms.heuristic_score is heuristic_score
+  assert algorithms.WIN_SCORE == WIN_SCORE
@@ -0,0 +1,34 @@
+# tests/test_lines.py
+
+import pytest
+
+from tic_tac_toe.logic.lines import get_line_table
+
+def get_all_windows(dimension, required_marks_for_win):
+  windows = set()
+  for row in range(dimension):
+    for column in range(dimension):
+      for row_step, column_step in ((0, 1), (1, 0), (1, 1), (1, -1)):
+        cells = [(row + row_step * offset, column + column_step * offset) for offset in range(required_marks_for_win)]
+        if all(0 <= cell_row < dimension and 0 <= cell_column < dimension for cell_row, cell_column in cells):
+          windows.add(frozenset(cell_row * dimension + cell_column for cell_row, cell_column in cells))
+  return windows
+
+@pytest.mark.parametrize("dimension, required_marks_for_win", [(3, 3), (4, 3), (5, 4), (9, 5), (10, 3)])
+def test_windows_are_every_run_of_the_board(dimension, required_marks_for_win):
+  line_table = get_line_table(dimension, required_marks_for_win)
+  windows = [frozenset(window) for window in line_table.windows]
+  assert len(windows) == len(set(windows))
+  assert set(windows) == get_all_windows(dimension, required_marks_for_win)
+  assert line_table.window_masks == tuple(sum(1 << position for position in window) for window in line_table.windows)
+
+@pytest.mark.parametrize("dimension, required_marks_for_win", [(3, 3), (6, 4)])
+def test_cell_indexes_match_the_lines_and_windows(dimension, required_marks_for_win):
+  line_table = get_line_table(dimension, required_marks_for_win)
+  assert line_table.row_count == line_table.column_count == dimension
+  for position in range(dimension ** 2):
+    assert line_table.cell_lines[position] == tuple(index for index, line in enumerate(line_table.lines) if position in line)
+    assert line_table.cell_windows[position] == tuple(index for index, window in enumerate(line_table.windows) if position in window)
+
+def test_tables_are_built_once():
+  assert get_line_table(7, 4) is get_line_table(7, 4)
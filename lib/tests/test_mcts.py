@@ -0,0 +1,30 @@
+# tests/test_mcts.py
+
+import pytest
+
+from tic_tac_toe.logic.entities import Mark
+from tic_tac_toe.logic.mcts import ROLLOUT_POLICIES, find_best_move_mcts
+from tic_tac_toe.logic.models import BitboardGrid, GameState
+
+def play(game_state, positions):
+  for position in positions:
+    game_state = game_state.make_move_to(position).next_state
+  return game_state
+
+@pytest.mark.parametrize("rollout_policy", ROLLOUT_POLICIES)
+def test_mcts_takes_an_immediate_win(rollout_policy):
+  # The crosses complete the top row at 2
+  game_state = play(GameState(BitboardGrid(4), Mark.CROSS, 3), [0, 4, 1, 5])
+  move = find_best_move_mcts(game_state, None, iterations=2000, rollout_policy=rollout_policy, seed=1)
+  assert move.position == 2
+
+def test_mcts_is_reproducible_with_a_seed():
+  game_state = play(GameState(BitboardGrid(7), Mark.CROSS, 4), [24, 25])
+  moves = {find_best_move_mcts(game_state, None, iterations=300, seed=5).position for _ in range(3)}
+  assert len(moves) == 1
+
+def test_mcts_needs_a_budget():
+  with pytest.raises(ValueError, match="Error: Missing budget"):
+    find_best_move_mcts(GameState(BitboardGrid(3), Mark.CROSS, 3), None)
+  with pytest.raises(ValueError, match="Error: Unknown rollout policy"):
+    find_best_move_mcts(GameState(BitboardGrid(3), Mark.CROSS, 3), iterations=10, rollout_policy="greedy")
@@ -0,0 +1,90 @@
+# tests/test_models.py
+
+import pickle
+import random
+
+import pytest
+
+from tic_tac_toe.logic.entities import Mark
+from tic_tac_toe.logic.models import BitboardGrid, GameState, Grid
+from tic_tac_toe.logic.transposition import compute_zobrist_key
+
+@pytest.mark.parametrize("dimension, required_marks_for_win", [(3, 3), (4, 3), (5, 4), (7, 5), (9, 5), (15, 5)])
+def test_bitboard_winner_matches_grid(dimension, required_marks_for_win):
+  rng = random.Random(dimension * 100 + required_marks_for_win)
+  for _ in range(300):
+    cells = "".join(rng.choice("XO" + "." * rng.randint(1, 4)) for _ in range(dimension ** 2))
+    expected = Grid(dimension, cells).find_winning_sequence(required_marks_for_win)
+    found = BitboardGrid(dimension, cells).find_winning_sequence(required_marks_for_win)
+    assert bool(found) == bool(expected)
+    # Both may report a different window when several are complete, but it must be a real one
+    if found:
+      assert len(found) == required_marks_for_win
+      assert len({cells[position] for position in found}) == 1
+      assert cells[found[0]] != Mark.EMPTY.value
+
+def test_bitboard_counts_match_grid():
+  rng = random.Random(1)
+  for _ in range(100):
+    cells = "".join(rng.choice("XO.") for _ in range(36))
+    grid, bitboard = Grid(6, cells), BitboardGrid(6, cells)
+    assert bitboard.cells == cells
+    assert (bitboard.cross_marks_count, bitboard.naught_marks_count, bitboard.empty_cells_count) == (grid.cross_marks_count, grid.naught_marks_count, grid.empty_cells_count)
+    assert bitboard.filled_positions == grid.filled_positions
+    assert sorted(bitboard.generate_possible_moves()) == sorted(set(grid.generate_possible_moves()))
+
+@pytest.mark.parametrize("dimension, required_marks_for_win", [(3, 3), (5, 4), (9, 5), (12, 5)])
+def test_incremental_winner_matches_full_check(random_game, dimension, required_marks_for_win):
+  rng = random.Random(dimension)
+  for _ in range(30):
+    for game_state in random_game(dimension, required_marks_for_win, rng):
+      assert game_state.incremental
+      for grid_class in (Grid, BitboardGrid):
+        scratch = GameState(grid_class(dimension, game_state.grid.cells), game_state.initial_player_mark, required_marks_for_win)
+        assert game_state.get_winner is scratch.get_winner
+        assert game_state.is_draw == scratch.is_draw
+
+def test_incremental_zobrist_key_matches_full_computation(random_game):
+  rng = random.Random(7)
+  for game_state in random_game(7, 4, rng):
+    assert game_state.zobrist_key == compute_zobrist_key(game_state.grid, game_state.get_current_player_mark)
+
+def test_grid_sequences_keep_the_bounding_box():
+  grid = Grid(5, "......X......O...........")
+  # Slices start at the first marked row or column and skip those without a mark
+  assert grid.generate_row_sequences(3) == [[6, 7, 8], [11, 12, 13]]
+  assert grid.generate_column_sequences(3) == [[6, 11, 16], [8, 13, 18]]
+  assert grid.generate_row_sequences(3, strict=True) == [[6, 7]]
+
+def test_valid_moves_build_their_state_on_access(random_game):
+  played = random_game(6, 4, random.Random(13))[4]
+  # The random game already played one of the moves of its states
+  game_state = GameState(BitboardGrid(6, played.grid.cells), played.initial_player_mark, 4)
+  moves = game_state.get_valid_moves
+  assert [move.position for move in game_state.generate_valid_moves()] == [move.position for move in moves]
+  assert not any(hasattr(move, "_next_state") for move in moves)
+  next_state = moves[0].next_state
+  assert moves[0].next_state is next_state
+  assert next_state.grid.cells[moves[0].position] == game_state.get_current_player_mark.value
+  assert next_state.last_move_position == moves[0].position
+
+def test_drop_caches_recomputes_the_same_values(random_game):
+  game_state = random_game(6, 4, random.Random(3))[-2]
+  positions = [move.position for move in game_state.get_valid_moves]
+  winning_sequence = game_state.get_winning_sequence
+  game_state.drop_caches()
+  assert [move.position for move in game_state.get_valid_moves] == positions
+  assert game_state.get_winning_sequence == winning_sequence
+
+def test_pickled_state_is_equal(random_game):
+  game_state = random_game(5, 4, random.Random(5))[-1]
+  game_state.get_valid_moves
+  copy = pickle.loads(pickle.dumps(game_state))
+  assert copy == game_state
+  assert copy.zobrist_keys == game_state.zobrist_keys
+  assert copy.get_winner is game_state.get_winner
+
+def test_models_have_no_instance_dictionary():
+  move = GameState(BitboardGrid(3), Mark.CROSS, 3).make_move_to(4)
+  for value in (move, move.next_state, move.next_state.grid, Grid(3)):
+    assert not hasattr(value, "__dict__")
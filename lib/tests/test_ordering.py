@@ -0,0 +1,33 @@
+# tests/test_ordering.py
+
+import random
+
+import pytest
+
+from tic_tac_toe.logic.board import SearchBoard
+from tic_tac_toe.logic.ordering import MOVE_ORDERINGS, KillerHistoryOrdering
+
+@pytest.mark.parametrize("name", sorted(MOVE_ORDERINGS))
+def test_ordering_puts_the_table_move_first(random_game, name):
+  ordering = MOVE_ORDERINGS[name]()
+  game_state = random_game(7, 4, random.Random(4))[5]
+  board = SearchBoard(game_state)
+  moves = board.generate_moves()
+  table_move = moves[len(moves) // 2]
+  ordered = ordering.order(board, moves, table_move, board.current_mark, True)
+  assert ordered[0] == table_move
+  assert sorted(ordered) == moves
+
+def test_killer_moves_come_before_history(random_game):
+  ordering = KillerHistoryOrdering()
+  board = SearchBoard(random_game(7, 4, random.Random(4))[5])
+  moves = board.generate_moves()
+  ordering.record_cutoff(board, moves[-1], 2)
+  board.make_move(moves[0])
+  ordering.record_cutoff(board, moves[1], 3)
+  board.unmake_move()
+  assert ordering.order(board, moves, None, board.current_mark, True)[0] == moves[-1]
+  # A new search forgets the killers, but the aged history of the mark still puts the move first
+  ordering.new_search()
+  assert ordering.killers == {}
+  assert ordering.order(board, moves, None, board.current_mark, True)[0] == moves[-1]
@@ -0,0 +1,38 @@
+# tests/test_parallel.py
+
+import random
+
+import pytest
+
+from tic_tac_toe.logic.algorithms import SearchContext, find_best_move_alpha_beta, find_best_move_minimax, minimax
+from tic_tac_toe.logic.board import SearchBoard
+from tic_tac_toe.logic.entities import Mark
+from tic_tac_toe.logic.models import BitboardGrid, GameState
+from tic_tac_toe.logic.parallel import ParallelSearch, decode_game_state, encode_game_state
+
+@pytest.fixture(scope="module")
+def pool():
+  with ParallelSearch(max_workers=2) as pool:
+    yield pool
+
+def test_encoding_keeps_the_position(random_game):
+  for game_state in random_game(6, 4, random.Random(6)):
+    decoded = decode_game_state(encode_game_state(game_state))
+    # The last move is not sent to the workers, which only need the position
+    assert decoded.grid.cells == game_state.grid.cells
+    assert decoded.get_current_player_mark is game_state.get_current_player_mark
+    assert decoded.zobrist_keys == game_state.zobrist_keys
+    assert decoded.get_winner is game_state.get_winner
+
+@pytest.mark.parametrize("find_best_move", [find_best_move_alpha_beta, find_best_move_minimax])
+def test_pool_move_has_the_minimax_root_value(pool, find_best_move):
+  game_state = GameState(BitboardGrid(4), Mark.CROSS, 3)
+  for position in (5, 6, 10):
+    game_state = game_state.make_move_to(position).next_state
+  maximizer = game_state.get_current_player_mark
+  expected = minimax(SearchContext(SearchBoard(game_state), maximizer), 3, True)
+  pool.new_search()
+  move = find_best_move(game_state, 2, pool=pool)
+  board = SearchBoard(game_state)
+  board.make_move(move.position)
+  assert minimax(SearchContext(board, maximizer), 2, False) == expected
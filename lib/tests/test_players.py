@@ -0,0 +1,85 @@
+# tests/test_players.py
+
+import pytest
+
+from tic_tac_toe.game import players
+from tic_tac_toe.game.players import AlphaBetaComputerPlayer
+from tic_tac_toe.logic.algorithms import find_best_move_alpha_beta, has_exact_root_score
+from tic_tac_toe.logic.entities import Mark
+from tic_tac_toe.logic.models import BitboardGrid, GameState
+from tic_tac_toe.logic.transposition import TranspositionTable
+
+def play(game_state, positions):
+  for position in positions:
+    game_state = game_state.make_move_to(position).next_state
+  return game_state
+
+@pytest.mark.parametrize("dimension, required_marks_for_win, threat_search, expected", [
+  (3, 3, None, False),
+  (9, 3, None, False),
+  (5, 4, None, True),
+  (9, 5, None, True),
+  (3, 3, True, True),
+  (9, 5, False, False),
+])
+def test_threat_search_defaults_to_large_win_lengths(dimension, required_marks_for_win, threat_search, expected):
+  player = AlphaBetaComputerPlayer(Mark.CROSS, threat_search=threat_search)
+  assert player.uses_threat_search(GameState(BitboardGrid(dimension), Mark.CROSS, required_marks_for_win)) is expected
+
+def test_exact_root_score():
+  table = TranspositionTable()
+  game_state = play(GameState(BitboardGrid(3), Mark.CROSS, 3), [4, 0])
+  # 7 empty cells: a search of 1 + 6 plies reaches the end of the game
+  move = find_best_move_alpha_beta(game_state, 6, table=table)
+  assert has_exact_root_score(game_state, move, table)
+  table = TranspositionTable()
+  game_state = play(GameState(BitboardGrid(9), Mark.CROSS, 5), [40, 41])
+  move = find_best_move_alpha_beta(game_state, 1, table=table)
+  assert not has_exact_root_score(game_state, move, table)
+
+def test_defense_check_is_skipped_for_exact_moves(monkeypatch):
+  def fail(game_state, move):
+    raise AssertionError("The defense check ran")
+  monkeypatch.setattr(players, "find_threat_defense", fail)
+  player = AlphaBetaComputerPlayer(Mark.NAUGHT, threat_search=True)
+  game_state = play(GameState(BitboardGrid(3), Mark.CROSS, 3), [4])
+  move = player.choose_move(game_state)
+  assert move is not None
+  # After a cross in the center, only a corner keeps the draw
+  assert move.position in (0, 2, 6, 8)
+
+def test_defense_check_runs_for_heuristic_moves(monkeypatch):
+  checked = []
+  def check(game_state, move):
+    checked.append(move)
+    return move
+  monkeypatch.setattr(players, "find_threat_defense", check)
+  player = AlphaBetaComputerPlayer(Mark.NAUGHT, time_budget=None)
+  move = player.choose_move(play(GameState(BitboardGrid(9), Mark.CROSS, 5), [40]))
+  assert checked == [move]
+
+def test_pondered_moves_skip_the_threat_search(monkeypatch):
+  calls = []
+  def find(game_state, threes=True):
+    calls.append(threes)
+    return None
+  monkeypatch.setattr(players, "find_threat_move", find)
+  monkeypatch.setattr(players, "find_threat_defense", lambda game_state, move: move)
+  player = AlphaBetaComputerPlayer(Mark.NAUGHT, threat_search=True)
+  game_state = play(GameState(BitboardGrid(6), Mark.CROSS, 4), [14])
+  pondered_move = game_state.make_move_to(21)
+  player.pondered_moves[game_state.grid.cells] = pondered_move
+  assert player.choose_move(game_state) is pondered_move
+  # Only the proven sequences of fours are looked for before the pondered move is played
+  assert calls == [False]
+
+def test_pondering_searches_the_threat_move_first(monkeypatch):
+  searched = []
+  def search(game_state, pool=None, stop=None, first_position=None):
+    searched.append(first_position)
+    return None
+  player = AlphaBetaComputerPlayer(Mark.NAUGHT, threat_search=True)
+  monkeypatch.setattr(player, "search", search)
+  monkeypatch.setattr(player, "get_threat_position", lambda game_state: 7)
+  player.ponder_replies(play(GameState(BitboardGrid(6), Mark.CROSS, 4), [14, 21]), players.threading.Event())
+  assert searched and set(searched) == {7}
@@ -0,0 +1,78 @@
+# tests/test_renderers.py
+
+import io
+import os
+import re
+
+import pytest
+
+from frontend.console import renderers
+from frontend.console.renderers import IncrementalConsoleRenderer, get_cell_row, get_status_lines, move_cursor
+from tic_tac_toe.logic.entities import Mark
+from tic_tac_toe.logic.models import BitboardGrid, GameState
+
+ESCAPE = re.compile(r"\033\[[0-9;]*[A-Za-z]")
+
+@pytest.fixture
+def terminal(monkeypatch):
+  size = [os.terminal_size((120, 60))]
+  monkeypatch.setattr(renderers.shutil, "get_terminal_size", lambda: size[0])
+  return size
+
+def play(game_state, positions):
+  states = [game_state]
+  for position in positions:
+    states.append(states[-1].make_move_to(position).next_state)
+  return states
+
+def render(renderer, game_state):
+  output = renderer.output
+  output.seek(0)
+  output.truncate()
+  renderer.render(game_state)
+  return output.getvalue()
+
+def test_full_frame_places_the_cells_where_updates_write_them(terminal):
+  game_state = play(GameState(BitboardGrid(12), Mark.CROSS, 5), [0, 13, 26, 14, 1])[-1]
+  frame = render(IncrementalConsoleRenderer(io.StringIO()), game_state)
+  lines = ESCAPE.sub("", frame).split("\n")
+  width = len(str(12))
+  for position, cell in enumerate(game_state.grid.cells):
+    row, column = divmod(position, 12)
+    assert lines[get_cell_row(row) - 1][width + 4 + 4 * column] == cell
+
+def test_updates_write_only_the_changed_cells(terminal):
+  states = play(GameState(BitboardGrid(20), Mark.CROSS, 5), [210, 211])
+  renderer = IncrementalConsoleRenderer(io.StringIO())
+  full_frame = render(renderer, states[0])
+  assert renderers.CLEAR_SCREEN in full_frame
+  render(renderer, states[1])
+  update = render(renderer, states[2])
+  assert renderers.CLEAR_SCREEN not in update
+  assert move_cursor(get_cell_row(10), len("20") + 5 + 4 * 11) in update
+  assert get_status_lines(states[2])[0] in update
+  assert len(update) < len(full_frame) / 10
+
+def test_winning_line_is_highlighted(terminal):
+  states = play(GameState(BitboardGrid(3), Mark.CROSS, 3), [0, 3, 1, 4, 2])
+  renderer = IncrementalConsoleRenderer(io.StringIO())
+  for game_state in states[:-1]:
+    render(renderer, game_state)
+  update = render(renderer, states[-1])
+  assert update.count(renderers.blink("X")) == 3
+  assert "X wins!" in update
+
+def test_board_is_drawn_again_after_a_resize(terminal):
+  states = play(GameState(BitboardGrid(9), Mark.CROSS, 5), [40, 41])
+  renderer = IncrementalConsoleRenderer(io.StringIO())
+  render(renderer, states[0])
+  render(renderer, states[1])
+  terminal[0] = os.terminal_size((100, 60))
+  assert renderers.CLEAR_SCREEN in render(renderer, states[2])
+
+def test_board_is_drawn_in_full_when_it_does_not_fit(terminal):
+  terminal[0] = os.terminal_size((40, 20))
+  states = play(GameState(BitboardGrid(15), Mark.CROSS, 5), [112])
+  renderer = IncrementalConsoleRenderer(io.StringIO())
+  render(renderer, states[0])
+  assert renderers.CLEAR_SCREEN in render(renderer, states[1])
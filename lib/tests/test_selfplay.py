@@ -0,0 +1,34 @@
+# tests/test_selfplay.py
+
+from tic_tac_toe.game.players import RandomComputerPlayer
+from tic_tac_toe.game.selfplay import PlayerSpec, SelfPlayConfig, play_game, run_self_play
+from tic_tac_toe.logic.entities import Mark
+
+def get_config(**options):
+  return SelfPlayConfig(PlayerSpec(RandomComputerPlayer), PlayerSpec(RandomComputerPlayer), **options)
+
+def test_players_are_built_without_a_delay():
+  player = PlayerSpec(RandomComputerPlayer).create(Mark.CROSS)
+  assert player.mark is Mark.CROSS
+  assert player.delay == 0
+
+def test_games_are_reproducible():
+  config = get_config(dimension=5, required_marks_for_win=4, seed=3)
+  first = play_game(config, 7)
+  second = play_game(config, 7)
+  assert first.moves == second.moves
+  assert first.winner == second.winner
+  assert len(first.times) == len(first.moves)
+  assert len(set(first.moves)) == len(first.moves)
+
+def test_starting_mark_alternates_unless_fixed():
+  records = list(run_self_play(get_config(), 4))
+  assert [record.starting_mark for record in records] == ["X", "O", "X", "O"]
+  records = list(run_self_play(get_config(starting_mark="O"), 2))
+  assert [record.starting_mark for record in records] == ["O", "O"]
+
+def test_workers_play_the_same_games():
+  config = get_config(seed=5)
+  serial = {record.game: record.moves for record in run_self_play(config, 6)}
+  parallel = {record.game: record.moves for record in run_self_play(config, 6, workers=2, chunk_size=2)}
+  assert parallel == serial
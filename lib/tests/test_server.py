@@ -0,0 +1,102 @@
+# tests/test_server.py
+
+import http.client
+import json
+import threading
+
+import pytest
+
+from frontend.server.server import GameHTTPServer, GameServer
+
+@pytest.fixture(scope="module")
+def server():
+  http_server = GameHTTPServer(("127.0.0.1", 0), GameServer(time_budget=0.05, max_dimension=10))
+  thread = threading.Thread(target=http_server.serve_forever, daemon=True)
+  thread.start()
+  yield http_server
+  http_server.shutdown()
+  http_server.server_close()
+
+@pytest.fixture
+def request_json(server):
+  def send(method, path, body=None):
+    connection = http.client.HTTPConnection(*server.server_address, timeout=10)
+    try:
+      connection.request(method, path, json.dumps(body) if body is not None else None, {"Content-Type": "application/json"})
+      response = connection.getresponse()
+      return response.status, json.loads(response.read())
+    finally:
+      connection.close()
+  return send
+
+@pytest.fixture
+def session(request_json):
+  status, body = request_json("POST", "/sessions", {"dimension": 3, "required_marks_for_win": 3, "starting_mark": "X", "computer_mark": "O"})
+  assert status == 201
+  return body
+
+def test_create_and_play(request_json, session):
+  assert session["cells"] == "." * 9
+  assert session["valid_moves"] == list(range(9))
+  status, body = request_json("POST", f"/sessions/{session['session']}/moves", {"position": 4})
+  assert status == 200
+  assert body["cells"][4] == "X"
+  assert body["cells"][body["computer_move"]] == "O"
+  assert request_json("GET", f"/sessions/{session['session']}")[1] == {**body, "computer_move": None}
+
+def test_computer_starts(request_json):
+  status, body = request_json("POST", "/sessions", {"starting_mark": "O", "computer_mark": "O"})
+  assert status == 201
+  assert body["cells"].count("O") == 1
+  assert body["current_mark"] == "X"
+
+@pytest.mark.parametrize("body", [
+  {"dimension": 11},
+  {"dimension": 2},
+  {"dimension": "three"},
+  {"dimension": 5, "required_marks_for_win": 6},
+  {"dimension": 5, "required_marks_for_win": 0},
+  {"starting_mark": "Z"},
+  {"computer_mark": ""},
+])
+def test_invalid_session_is_a_bad_request(request_json, body):
+  status, response = request_json("POST", "/sessions", body)
+  assert status == 400
+  assert response["error"].startswith("Error:")
+
+@pytest.mark.parametrize("body", [{}, {"position": None}, {"position": "four"}, {"position": [4]}, {"position": -1}, {"position": 9}])
+def test_invalid_move_is_a_bad_request(request_json, session, body):
+  status, response = request_json("POST", f"/sessions/{session['session']}/moves", body)
+  assert status == 400
+  assert response["error"].startswith("Error:")
+
+def test_occupied_cell_is_a_bad_request(request_json, session):
+  _, body = request_json("POST", f"/sessions/{session['session']}/moves", {"position": 4})
+  status, response = request_json("POST", f"/sessions/{session['session']}/moves", {"position": body["computer_move"]})
+  assert status == 400
+  assert response["error"].startswith("Error:")
+
+def test_unknown_session_is_not_found(request_json, session):
+  assert request_json("GET", "/sessions/unknown")[0] == 404
+  assert request_json("POST", "/sessions/unknown/moves", {"position": 4})[0] == 404
+  assert request_json("DELETE", f"/sessions/{session['session']}") == (200, {})
+  status, response = request_json("DELETE", f"/sessions/{session['session']}")
+  assert status == 404
+  assert response["error"] == f"Error: Unknown session ` {session['session']} `."
+
+@pytest.mark.parametrize("method, path", [("GET", "/"), ("GET", "/sessions"), ("POST", "/stats"), ("DELETE", "/stats")])
+def test_unknown_path_is_not_found(request_json, method, path):
+  assert request_json(method, path) == (404, {"error": "Error: Not found."})
+
+def test_stats(request_json, session):
+  status, body = request_json("GET", "/stats")
+  assert status == 200
+  assert body["sessions"] >= 1
+
+def test_engine_failure_is_a_server_error(server, request_json, session, monkeypatch):
+  def fail(session):
+    raise ValueError("The search failed.")
+  monkeypatch.setattr(server.game_server, "play_computer_move", fail)
+  status, response = request_json("POST", f"/sessions/{session['session']}/moves", {"position": 4})
+  assert status == 500
+  assert response == {"error": "Error: Internal server error."}
@@ -0,0 +1,19 @@
+# tests/test_stats.py
+
+from tic_tac_toe.logic.algorithms import find_best_move_alpha_beta
+from tic_tac_toe.logic.entities import Mark
+from tic_tac_toe.logic.models import BitboardGrid, GameState
+from tic_tac_toe.logic.stats import SearchStats
+
+def test_search_fills_in_the_counters():
+  stats = SearchStats()
+  game_state = GameState(BitboardGrid(4), Mark.CROSS, 3).make_move_to(5).next_state
+  move = find_best_move_alpha_beta(game_state, 3, stats=stats)
+  assert move is not None
+  assert stats.nodes > stats.leaf_evaluations > 0
+  assert stats.beta_cutoffs == sum(stats.cutoff_move_indexes.values()) > 0
+  # The indexes are positions in the move order of a node, which has at most 14 moves below the root
+  assert all(0 <= index < 14 for index in stats.cutoff_move_indexes)
+  # Symmetric root moves are searched once, through one of them
+  assert set(stats.root_move_times) <= {valid_move.position for valid_move in game_state.get_valid_moves}
+  assert stats.to_dict()["beta_cutoffs"] == stats.beta_cutoffs
@@ -0,0 +1,39 @@
+# tests/test_symmetry.py
+
+import random
+
+import pytest
+
+from tic_tac_toe.logic.algorithms import group_symmetric_moves
+from tic_tac_toe.logic.board import SearchBoard
+from tic_tac_toe.logic.entities import Mark
+from tic_tac_toe.logic.models import BitboardGrid, GameState
+from tic_tac_toe.logic.symmetry import canonicalize, get_transforms, restore_position, transform_cells, transform_position
+
+@pytest.mark.parametrize("dimension", [3, 4, 5])
+def test_transforms_are_distinct_permutations(dimension):
+  transforms = get_transforms(dimension)
+  assert len(set(transforms)) == 8
+  assert transforms[0] == tuple(range(dimension ** 2))
+  for transform in range(8):
+    assert sorted(transforms[transform]) == list(range(dimension ** 2))
+    for position in range(dimension ** 2):
+      assert restore_position(dimension, transform_position(dimension, position, transform), transform) == position
+
+def test_symmetric_positions_share_the_canonical_key(random_game):
+  rng = random.Random(9)
+  for game_state in random_game(5, 4, rng):
+    canonical_cells, _ = canonicalize(game_state.grid)
+    for transform in range(8):
+      cells = transform_cells(game_state.grid.cells, 5, transform)
+      image = GameState(BitboardGrid(5, cells), game_state.initial_player_mark, 4)
+      assert image.canonical_key == game_state.canonical_key
+      assert canonicalize(image.grid)[0] == canonical_cells
+
+def test_symmetric_root_moves_are_grouped():
+  # With only the center taken, the 8 other cells form a group of corners and a group of edges
+  game_state = GameState(BitboardGrid(3), Mark.CROSS, 3).make_move_to(4).next_state
+  moves = [0, 1, 2, 3, 5, 6, 7, 8]
+  unique_moves, representatives = group_symmetric_moves(SearchBoard(game_state), moves)
+  assert unique_moves == [0, 1]
+  assert representatives == [0, 1, 0, 1, 1, 0, 1, 0]
@@ -0,0 +1,49 @@
+# tests/test_telemetry.py
+
+import io
+import json
+import tracemalloc
+
+from tic_tac_toe.game.engine import TicTacToe
+from tic_tac_toe.game.players import RandomComputerPlayer
+from tic_tac_toe.game.renderer import NullRenderer
+from tic_tac_toe.game.telemetry import Telemetry
+from tic_tac_toe.logic.entities import Mark
+from tic_tac_toe.logic.models import BitboardGrid, GameState
+
+def test_think_time_leaves_out_the_delay():
+  telemetry = Telemetry()
+  player = RandomComputerPlayer(Mark.CROSS)
+  player.delay = 0.2
+  telemetry.start_game(GameState(BitboardGrid(3), Mark.CROSS, 3))
+  telemetry.measure_move(player, GameState(BitboardGrid(3), Mark.CROSS, 3))
+  assert telemetry.moves[0].think_time < 0.1
+  assert player.delay == 0.2
+
+def test_games_are_summarized():
+  output = io.StringIO()
+  telemetry = Telemetry(output, record_moves=True)
+  players = [RandomComputerPlayer(Mark.CROSS), RandomComputerPlayer(Mark.NAUGHT)]
+  for player in players:
+    player.delay = 0
+  TicTacToe(*players, NullRenderer(), telemetry=telemetry).play("X", 3, 3)
+  telemetry.close()
+  records = [json.loads(line) for line in output.getvalue().splitlines()]
+  moves = [record for record in records if record["type"] == "move"]
+  game, histogram = records[len(moves):]
+  assert game["type"] == "game" and game["moves"] == len(moves) >= 5
+  assert sum(game["latency_histogram"]) == len(moves)
+  assert histogram == {"type": "histogram", "games": 1, "latency_buckets": list(game["latency_buckets"]), "latency_histogram": game["latency_histogram"]}
+
+def test_tracing_stops_when_a_game_fails():
+  class FailingPlayer(RandomComputerPlayer):
+    def get_computer_move(self, game_state):
+      raise RuntimeError("Error: The search failed.")
+  errors = []
+  telemetry = Telemetry(trace_memory=True)
+  players = [FailingPlayer(Mark.CROSS), RandomComputerPlayer(Mark.NAUGHT)]
+  players[0].delay = 0
+  TicTacToe(*players, NullRenderer(), errors.append, telemetry=telemetry).play("X", 3, 3)
+  assert [str(error) for error in errors] == ["Error: The search failed."]
+  assert not tracemalloc.is_tracing()
+  assert telemetry.games == 0
@@ -0,0 +1,25 @@
+# tests/test_transposition.py
+
+import pytest
+
+from tic_tac_toe.logic.transposition import Bound, TranspositionTable
+
+def test_table_evicts_the_oldest_entry():
+  table = TranspositionTable(max_entries=2)
+  for key in range(3):
+    table.store(key, 1, key, Bound.EXACT, None)
+  assert len(table) == 2
+  assert table.get(0) is None
+  assert table.get(2).score == 2
+
+def test_table_keeps_the_deeper_entry():
+  table = TranspositionTable()
+  table.store(1, 4, 10, Bound.LOWER, 3)
+  table.store(1, 2, 20, Bound.EXACT, 5)
+  assert table.get(1) == (4, 10, Bound.LOWER, 3)
+  table.store(1, 4, 30, Bound.EXACT, 6)
+  assert table.get(1) == (4, 30, Bound.EXACT, 6)
+
+def test_table_must_hold_an_entry():
+  with pytest.raises(ValueError, match="Error: Invalid table size"):
+    TranspositionTable(max_entries=0)